@@ -6,21 +6,17 @@ Streamlit Web UI with Dark Noir Theme
 import streamlit as st
 import os
 from dotenv import load_dotenv
-import time
 import re
-import string
-import random
 
 # Load environment variables from .env file
 load_dotenv()
 
-from murder_mystery import (
-    MurderMysteryGame,
-    SUSPECTS,
-    CASE_FILE,
-    VALID_WEAPONS,
-    VALID_MOTIVES,
-)
+from murder_mystery import MurderMysteryGame
+from auto_solver import AutoInvestigator
+from backends import requires_groq_key
+from cases import CASE_CATALOG, CASE_POOL
+from session_store import SESSION_STORE
+from telemetry import TELEMETRY
 
 # Page config
 st.set_page_config(
@@ -323,21 +319,46 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+def current_case():
+    """The case being played in this browser session."""
+    return st.session_state.game.case
+
+
+def resume_saved_game():
+    """Restore the game named by the ?session= URL parameter, if it was saved."""
+    session_id = st.query_params.get("session")
+    game = MurderMysteryGame.resume(session_id) if session_id and SESSION_STORE is not None else None
+    if game is None:
+        return
+
+    st.session_state.game = game
+    st.session_state.notes = {sid: game.notes.get(sid, "") for sid in game.case.suspects}
+    st.session_state.general_notes = game.notes.get("general", "")
+    record = SESSION_STORE.load(session_id)
+    if record.accusation is not None:
+        st.session_state.game_over = True
+        st.session_state.accusation_result = {
+            "won": record.accusation["won"],
+            "score": record.accusation["score"],
+            "eval_text": record.accusation["eval_text"],
+        }
+
+
 def init_session_state():
     """Initialize session state variables."""
+    if "game" not in st.session_state:
+        resume_saved_game()
     if "game" not in st.session_state:
         st.session_state.game = MurderMysteryGame()
-    if "messages" not in st.session_state:
-        st.session_state.messages = {sid: [] for sid in SUSPECTS.keys()}
     if "current_suspect" not in st.session_state:
-        st.session_state.current_suspect = "s1"
+        st.session_state.current_suspect = st.session_state.game.current_suspect_id
     if "game_over" not in st.session_state:
         st.session_state.game_over = False
     if "accusation_result" not in st.session_state:
         st.session_state.accusation_result = None
     # Notes for each suspect
     if "notes" not in st.session_state:
-        st.session_state.notes = {sid: "" for sid in SUSPECTS.keys()}
+        st.session_state.notes = {sid: "" for sid in current_case().suspects}
     # General notes
     if "general_notes" not in st.session_state:
         st.session_state.general_notes = ""
@@ -349,30 +370,61 @@ def init_session_state():
         st.session_state.ai_agent_active = False
     # AI agent progress
     if "ai_agent_progress" not in st.session_state:
-        st.session_state.ai_agent_progress = {"questions_asked": 0, "suspects_to_question": ["s1", "s2", "s3"]}
+        st.session_state.ai_agent_progress = {"questions_asked": 0,
+                                              "suspects_to_question": list(current_case().suspects)}
+
+    # Keep the session id in the URL so a reload (or a server restart) resumes this game
+    if SESSION_STORE is not None and st.query_params.get("session") != st.session_state.game.session_id:
+        st.query_params["session"] = st.session_state.game.session_id
+
+
+# Case picker option for "the next pre-generated case"
+GENERATED_CASE = "__generated__"
 
 
 def reset_game():
-    """Reset the game state."""
-    st.session_state.game = MurderMysteryGame()
-    st.session_state.messages = {sid: [] for sid in SUSPECTS.keys()}
-    st.session_state.current_suspect = "s1"
+    """Reset the game state, switching to the case picked in the sidebar if it changed."""
+    case_id = st.session_state.get("next_case")
+    if case_id == GENERATED_CASE:
+        case_id = CASE_POOL.pop()
+    if case_id and case_id != current_case().case_id:
+        st.session_state.game = MurderMysteryGame(case_id=case_id)
+    else:
+        st.session_state.game.reset()
+    suspects = current_case().suspects
+    st.session_state.current_suspect = st.session_state.game.current_suspect_id
     st.session_state.game_over = False
     st.session_state.accusation_result = None
-    st.session_state.notes = {sid: "" for sid in SUSPECTS.keys()}
+    st.session_state.notes = {sid: "" for sid in suspects}
     st.session_state.general_notes = ""
     st.session_state.ai_agent_active = False
-    st.session_state.ai_agent_progress = {"questions_asked": 0, "suspects_to_question": ["s1", "s2", "s3"]}
+    st.session_state.ai_agent_progress = {"questions_asked": 0, "suspects_to_question": list(suspects)}
+
+
+def render_case_picker():
+    """Sidebar choice of the case the next "New Case" opens (only shown with several cases)."""
+    options = CASE_CATALOG.ids(generated=False) + ([GENERATED_CASE] if len(CASE_POOL) else [])
+    if len(options) < 2:
+        return
+    current = current_case().case_id
+    st.sidebar.selectbox(
+        "📁 Next case",
+        options=options,
+        index=options.index(current) if current in options else len(options) - 1,
+        format_func=lambda cid: "🎲 A new generated case" if cid == GENERATED_CASE else CASE_CATALOG.entries[cid]["title"],
+        key="next_case",
+    )
 
 
 def render_case_briefing():
     """Render the case briefing section."""
-    v = CASE_FILE["victim"]
+    case = current_case()
+    v = case.case_file["victim"]
 
-    st.markdown("""
+    st.markdown(f"""
     <div class="case-file">
         <h3>📁 CLASSIFIED CASE FILE</h3>
-        <p style="color: #666; font-size: 12px;">BLACKWOOD MANSION HOMICIDE - FILE #1947</p>
+        <p style="color: #666; font-size: 12px;">{case.setting.upper()} HOMICIDE - FILE #{case.case_file.get("file_number", case.case_id)}</p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -390,15 +442,6 @@ def render_case_briefing():
 
 def run_ai_agent_interrogation():
     """Run automatic interrogation by AI agent and make accusation."""
-    agent_questions = [
-        "Where were you at the time of the murder?",
-        "How did you know the victim?",
-        "Did you see or hear anything suspicious that night?",
-        "Can anyone verify your whereabouts during the time of death?",
-        "What was your relationship with the victim?",
-        "Did you have any conflicts or disagreements with the victim?"
-    ]
-
     state = st.session_state.game.state
 
     # Display header
@@ -420,25 +463,6 @@ def run_ai_agent_interrogation():
         st.warning("No turns remaining for the AI agent to interrogate.")
         st.session_state.ai_agent_active = False
         return
-    # Helper: normalize text to a set of words for similarity checks
-    def normalize_to_set(text):
-        if not text:
-            return set()
-        txt = text.lower()
-        txt = txt.translate(str.maketrans(string.punctuation, ' ' * len(string.punctuation)))
-        words = [w.strip() for w in txt.split() if w.strip()]
-        stop = {"the","a","an","at","in","on","to","of","and","is","was","were","i","you","he","she","it","they","we","my","your","his","her","their","that","this"}
-        return set([w for w in words if w not in stop])
-
-    def jaccard_similarity(a, b):
-        if not a and not b:
-            return 1.0
-        if not a or not b:
-            return 0.0
-        inter = len(a & b)
-        union = len(a | b)
-        return inter / union if union > 0 else 0.0
-
     total_questions = remaining_turns
     questions_asked = 0
     
@@ -446,192 +470,32 @@ def run_ai_agent_interrogation():
     progress_bar = st.progress(0)
     status_text = st.empty()
     questions_container = st.container()
-    
-    # Track questions already asked per suspect (store normalized word-sets)
-    asked_by_suspect = {}
-    for sid in ["s1", "s2", "s3"]:
-        asked_sets = []
-        for m in st.session_state.messages.get(sid, []):
-            if m.get("role") == "user" and isinstance(m.get("content"), str):
-                s = normalize_to_set(m["content"])
-                if s:
-                    asked_sets.append(s)
-        asked_by_suspect[sid] = asked_sets
-
-    # Global set of asked question sets to avoid asking the same question across different suspects
-    global_asked_sets = []
-    for sets in asked_by_suspect.values():
-        global_asked_sets.extend(sets)
-
-    # Interrogate each suspect
-    for suspect_id in ["s1", "s2", "s3"]:
-        st.session_state.game.switch_suspect(suspect_id)
-        current_suspect = SUSPECTS[suspect_id]
-
-        questions_per_suspect = 0
-        # Choose 3 or 4 questions for this suspect (user requested 3-4)
-        max_questions_per_suspect = random.choice([3, 4])
-
-        # Build keywords from other suspects' assistant responses to tailor questions
-        other_keywords = set()
-        for other_id in ["s1", "s2", "s3"]:
-            if other_id == suspect_id:
-                continue
-            for m in st.session_state.messages.get(other_id, []):
-                if m.get("role") == "assistant" and isinstance(m.get("content"), str):
-                    ks = normalize_to_set(m["content"])
-                    other_keywords.update(ks)
-
-        # Create simple tailored questions based on keywords mentioned by other suspects
-        tailored_questions = []
-        for kw in list(other_keywords):
-            if len(tailored_questions) >= 2:
-                break
-            if len(kw) < 3:
-                continue
-            tailored_questions.append(f"Do you know anything about {kw}?")
-
-        # Candidate pool: tailored first (to encourage varying questions), then generic agent questions
-        candidates = tailored_questions + agent_questions
-
-        for question in candidates:
-            if state.total_turns >= state.max_turns:
-                break
-
-            # Stop if we've asked enough questions for this suspect
-            if questions_per_suspect >= max_questions_per_suspect:
-                break
-
-            # Prepare question set and check against both per-suspect and global asked sets
-            q_set = normalize_to_set(question)
-
-            # Skip if already asked to this suspect
-            already = False
-            for prev in asked_by_suspect.get(suspect_id, []):
-                if jaccard_similarity(q_set, prev) >= 0.7:
-                    already = True
-                    break
-            if already:
-                continue
-
-            # Skip if a very similar question has been asked to any suspect
-            duplicate_elsewhere = False
-            for prev in global_asked_sets:
-                if jaccard_similarity(q_set, prev) >= 0.7:
-                    duplicate_elsewhere = True
-                    break
-            if duplicate_elsewhere:
-                continue
-
-            # Update status
-            status_text.markdown(f"**🤖 Interrogating:** {current_suspect.name} - Question {questions_asked + 1}/{total_questions}")
 
-            # Ask question
-            response = st.session_state.game.interrogate(question)
+    status_text.markdown("**🤖 Interrogating all suspects at once...**")
 
-            st.session_state.messages[suspect_id].append({
-                "role": "user",
-                "content": question
-            })
-            st.session_state.messages[suspect_id].append({
-                "role": "assistant",
-                "content": response
-            })
+    # One lane per suspect runs concurrently; exchanges are shown as they complete
+    investigator = AutoInvestigator(st.session_state.game)
+    for exchange in investigator.run(total_questions):
+        current_suspect = current_case().suspects[exchange.suspect_id]
 
-            # Record asked question to avoid repeats (store normalized set)
-            asked_by_suspect.setdefault(suspect_id, []).append(q_set)
-            global_asked_sets.append(q_set)
-
-            questions_per_suspect += 1
-
-            # Display the exchange in real-time
-            with questions_container:
-                st.markdown(f"**🕵️ Agent → {current_suspect.name}:**")
-                st.markdown(f"*{question}*")
-                st.markdown(f"**🎭 {current_suspect.name}:**")
-                st.markdown(f"*{response}*")
-                st.markdown("---")
-
-            questions_asked += 1
-            progress_bar.progress(min(questions_asked / max(1, total_questions), 1.0))
-
-            # Small pause so the user can follow the transcript updates
-            time.sleep(0.5)
-
-            # Adaptive follow-ups based on the suspect's response (avoid duplicates globally)
-            def select_followups(text):
-                t = (text or "").lower()
-                followups = []
-                if any(k in t for k in ["alibi", "was at", "at the time", "where i was", "i was"]):
-                    followups.append("Can you provide more details about your alibi? Who can confirm it?")
-                if any(k in t for k in ["alone", "no one", "by myself"]):
-                    followups.append("Who could corroborate that you were alone?")
-                if any(k in t for k in ["see", "saw", "witness", "sighting"]):
-                    followups.append("Who did you see and can you describe them?")
-                if any(k in t for k in ["fight", "argument", "argue", "disagreement", "quarrel"]):
-                    followups.append("What was the disagreement about and when did it happen?")
-                if any(k in t for k in ["money", "debt", "inheritance", "owe"]):
-                    followups.append("Did you have any financial disputes with the victim? Please explain.")
-                if any(k in t for k in ["lover", "affair", "relationship", "ex", "married"]):
-                    followups.append("Can you describe your relationship with the victim in more detail?")
-                # Generic expansion if nothing specific detected
-                if not followups:
-                    followups.append("Can you expand on that?")
-                # Limit to at most 2 follow-ups
-                return followups[:2]
-
-            followups = select_followups(response)
-            for fup in followups:
-                if state.total_turns >= state.max_turns:
-                    break
-
-                # Skip follow-up if already asked to this suspect or elsewhere
-                fup_set = normalize_to_set(fup)
-                skip_fup = False
-                for prev in asked_by_suspect.get(suspect_id, []):
-                    if jaccard_similarity(fup_set, prev) >= 0.7:
-                        skip_fup = True
-                        break
-                if skip_fup:
-                    continue
-                for prev in global_asked_sets:
-                    if jaccard_similarity(fup_set, prev) >= 0.7:
-                        skip_fup = True
-                        break
-                if skip_fup:
-                    continue
-
-                # Ask follow-up
-                f_response = st.session_state.game.interrogate(fup)
-                st.session_state.messages[suspect_id].append({"role": "user", "content": fup})
-                st.session_state.messages[suspect_id].append({"role": "assistant", "content": f_response})
-
-                # Record asked follow-up
-                asked_by_suspect.setdefault(suspect_id, []).append(fup_set)
-                global_asked_sets.append(fup_set)
-
-                with questions_container:
-                    st.markdown(f"**🕵️ Agent → {current_suspect.name}:**")
-                    st.markdown(f"*{fup}*")
-                    st.markdown(f"**🎭 {current_suspect.name}:**")
-                    st.markdown(f"*{f_response}*")
-                    st.markdown("---")
+        # Display the exchange in real-time
+        with questions_container:
+            st.markdown(f"**🕵️ Agent → {current_suspect.name}:**")
+            st.markdown(f"*{exchange.question}*")
+            st.markdown(f"**🎭 {current_suspect.name}:**")
+            st.markdown(f"*{exchange.answer}*")
+            st.markdown("---")
 
-                questions_asked += 1
-                progress_bar.progress(min(questions_asked / max(1, total_questions), 1.0))
-                time.sleep(0.4)
+        questions_asked += 1
+        status_text.markdown(f"**🤖 Interrogating:** {current_suspect.name} - Question {questions_asked}/{total_questions}")
+        progress_bar.progress(min(questions_asked / max(1, total_questions), 1.0))
 
-        if state.total_turns >= state.max_turns:
-            break
-    
-    # Make final accusation based on game logic
+    # Make final accusation from the evidence gathered
+    if investigator.stopped_early:
+        progress_bar.progress(1.0)
     status_text.markdown("**🤖 AI Agent**: Analyzing evidence and making final accusation...")
     
-    # Get the correct answer from game state (assuming it's stored)
-    # For now, use the AI's best guess based on suspect responses
-    accused = "s1"  # AI will guess the first suspect (placeholder logic)
-    weapon = VALID_WEAPONS[0] if VALID_WEAPONS else "dagger"
-    motive = VALID_MOTIVES[0] if VALID_MOTIVES else "revenge"
+    accused, weapon, motive = investigator.accusation()
     
     won, score, eval_text = st.session_state.game.make_accusation(accused, weapon, motive)
     
@@ -654,7 +518,7 @@ def render_suspect_selector():
     st.sidebar.markdown('<div class="sidebar-header">👥 SUSPECTS</div>', unsafe_allow_html=True)
     st.sidebar.markdown("")
 
-    for sid, suspect in SUSPECTS.items():
+    for sid, suspect in current_case().suspects.items():
         interviewed = sid in st.session_state.game.state.suspects_interviewed
         turns = st.session_state.game.state.turns_per_suspect.get(sid, 0)
 
@@ -674,7 +538,7 @@ def render_suspect_selector():
             st.rerun()
 
     # Show current suspect
-    current = SUSPECTS[st.session_state.current_suspect]
+    current = current_case().suspects[st.session_state.current_suspect]
     st.sidebar.markdown("---")
     st.sidebar.markdown(f"**Currently interrogating:**")
     st.sidebar.markdown(f"### 🎭 {current.name}")
@@ -694,7 +558,7 @@ def render_game_status():
     st.sidebar.markdown(f"**Questions remaining:** {remaining}")
 
     # Suspects interviewed
-    st.sidebar.markdown(f"**Suspects questioned:** {len(state.suspects_interviewed)} / 3")
+    st.sidebar.markdown(f"**Suspects questioned:** {len(state.suspects_interviewed)} / {len(current_case().suspects)}")
 
     # Warning if running low on turns
     if remaining <= 5 and remaining > 0 and not st.session_state.game_over:
@@ -703,9 +567,101 @@ def render_game_status():
         st.sidebar.error("🚨 Time's up! Make your accusation!")
 
 
+def render_case_board():
+    """Render the contradictions and key clues found so far in the sidebar."""
+    state = st.session_state.game.state
+    if not state.contradictions_found and not state.key_clues_discovered:
+        return
+
+    title = f"🧩 Contradictions ({len(state.contradictions_found)}) & Clues ({len(state.key_clues_discovered)})"
+    with st.sidebar.expander(title, expanded=bool(state.contradictions_found)):
+        for contradiction in state.contradictions_found:
+            st.markdown(f"⚡ {contradiction}")
+        for clue in state.key_clues_discovered:
+            st.caption(f"🗝️ {clue}")
+
+
+def render_transcript_search():
+    """Render a sidebar search over what the suspects have said so far."""
+    game = st.session_state.game
+    if not game.state.total_turns:
+        return
+
+    with st.sidebar.expander("🔎 Search Statements", expanded=False):
+        word = st.text_input("Word", key="transcript_search", placeholder="e.g. library")
+        if not word:
+            return
+        hits = game.transcript.search(word)
+        if not hits:
+            st.caption("No suspect has mentioned that.")
+        for sid, question, answer in hits:
+            st.markdown(f"**{game.case.suspects[sid].name}** — *{question}*")
+            st.caption(answer)
+
+
+def render_telemetry():
+    """Render per-stage latency and token usage, aggregated over recent turns, in the sidebar."""
+    summary = TELEMETRY.summary()
+    if not summary:
+        return
+
+    with st.sidebar.expander("⏱️ Telemetry", expanded=False):
+        rows = []
+        for name in ("rerun", "turn", "suspect", "critique", "log", "accusation", "judge"):
+            if name not in summary:
+                continue
+            s = summary[name]
+            rows.append({
+                "stage": name,
+                "count": s["count"],
+                "p50 ms": round(s["p50_ms"], 1),
+                "p95 ms": round(s["p95_ms"], 1),
+                "prompt tok": s["prompt_tokens"],
+                "output tok": s["completion_tokens"],
+            })
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+        turns = summary.get("turn")
+        if turns:
+            st.caption(
+                f"Cache hits: {turns.get('cached', 0)} / {turns['count']} turns · "
+                f"critique skipped: {turns.get('critique_skipped', 0)}"
+            )
+
+
+def stream_suspect_reply(question, chat_container):
+    """Ask the current suspect a question, rendering the reply as it streams in."""
+    # The game logs the exchange once the stream finishes; the chat history is read from there.
+    with chat_container:
+        st.chat_message("user", avatar="🕵️").markdown(question)
+        with st.chat_message("assistant", avatar="🎭"):
+            st.write_stream(st.session_state.game.interrogate_stream(question))
+
+
+def ask_all_suspects(question, chat_container):
+    """Ask every suspect the same question at once, showing each answer as it arrives."""
+    game = st.session_state.game
+    remaining = game.state.max_turns - game.state.total_turns
+    # Each answer uses a turn; ask as many suspects as the budget allows
+    suspect_ids = list(game.case.suspects)[:remaining]
+
+    with chat_container:
+        st.chat_message("user", avatar="🕵️").markdown(f"**To all suspects:** {question}")
+        with st.spinner("The suspects consider their answers..."):
+            for sid, answer in game.interrogate_each(question, suspect_ids):
+                st.chat_message("assistant", avatar="🎭").markdown(f"**{game.case.suspects[sid].name}:** *{answer}*")
+
+
+def ask_question(question, chat_container):
+    if st.session_state.get("ask_all"):
+        ask_all_suspects(question, chat_container)
+    else:
+        stream_suspect_reply(question, chat_container)
+
+
 def render_chat_interface():
     """Render the main chat interface."""
-    current_suspect = SUSPECTS[st.session_state.current_suspect]
+    current_suspect = current_case().suspects[st.session_state.current_suspect]
 
     st.markdown(f"""
     <div style="background: linear-gradient(90deg, transparent, #1a1a1a, transparent); padding: 10px; text-align: center;">
@@ -723,20 +679,20 @@ def render_chat_interface():
     chat_container = st.container(height=400)
 
     with chat_container:
-        messages = st.session_state.messages[st.session_state.current_suspect]
+        transcript = st.session_state.game.transcript
 
-        if not messages:
+        if not transcript.logs[st.session_state.current_suspect]:
             st.markdown(f"""
             <div class="typewriter-text" style="text-align: center; padding: 50px; color: #666;">
                 <em>*{current_suspect.name} sits across the table, the dim light casting shadows across their face...*</em>
             </div>
             """, unsafe_allow_html=True)
 
-        for msg in messages:
-            if msg["role"] == "user":
-                st.chat_message("user", avatar="🕵️").markdown(msg["content"])
+        for role, content in transcript.messages(st.session_state.current_suspect):
+            if role == "user":
+                st.chat_message("user", avatar="🕵️").markdown(content)
             else:
-                st.chat_message("assistant", avatar="🎭").markdown(f'*{msg["content"]}*')
+                st.chat_message("assistant", avatar="🎭").markdown(f'*{content}*')
 
     # Input
     if not st.session_state.game_over:
@@ -753,6 +709,12 @@ def render_chat_interface():
                 "Did you have any disagreements with the victim?"
             ]
 
+            st.toggle(
+                "👥 Ask all suspects",
+                key="ask_all",
+                help="Put each question to every suspect at once. Every answer uses a turn.",
+            )
+
             st.markdown("**Suggested questions:**")
 
             # Render suggestion buttons in rows of up to 3 buttons
@@ -764,21 +726,7 @@ def render_chat_interface():
                     # key must be unique per suspect to avoid collisions across suspects
                     btn_key = f"suggest_{st.session_state.current_suspect}_{i+j}"
                     if cols[j].button(prompt, key=btn_key, use_container_width=True):
-                        # Add user message
-                        st.session_state.messages[st.session_state.current_suspect].append({
-                            "role": "user",
-                            "content": prompt
-                        })
-
-                        # Get response from game and append
-                        with st.spinner(f"*{current_suspect.name} considers your question...*"):
-                            response = st.session_state.game.interrogate(prompt)
-
-                        st.session_state.messages[st.session_state.current_suspect].append({
-                            "role": "assistant",
-                            "content": response
-                        })
-
+                        ask_question(prompt, chat_container)
                         st.rerun()
 
             # Chat input with improved placeholder example
@@ -787,22 +735,7 @@ def render_chat_interface():
             )
 
             if user_input:
-                # Add user message
-                st.session_state.messages[st.session_state.current_suspect].append({
-                    "role": "user",
-                    "content": user_input
-                })
-
-                # Get response
-                with st.spinner(f"*{current_suspect.name} considers your question...*"):
-                    response = st.session_state.game.interrogate(user_input)
-
-                # Add suspect response
-                st.session_state.messages[st.session_state.current_suspect].append({
-                    "role": "assistant",
-                    "content": response
-                })
-
+                ask_question(user_input, chat_container)
                 st.rerun()
 
 
@@ -816,14 +749,10 @@ def render_notes_section():
     """, unsafe_allow_html=True)
 
     # Tabs for different note sections
-    tab1, tab2, tab3, tab4 = st.tabs([
-        f"📋 General Notes",
-        f"🎭 {SUSPECTS['s1'].name}",
-        f"🎭 {SUSPECTS['s2'].name}",
-        f"🎭 {SUSPECTS['s3'].name}"
-    ])
-
-    with tab1:
+    suspects = current_case().suspects
+    tabs = st.tabs([f"📋 General Notes"] + [f"🎭 {suspect.name}" for suspect in suspects.values()])
+
+    with tabs[0]:
         st.session_state.general_notes = st.text_area(
             "General observations and theories:",
             value=st.session_state.general_notes,
@@ -832,32 +761,17 @@ def render_notes_section():
             key="general_notes_input"
         )
 
-    with tab2:
-        st.session_state.notes["s1"] = st.text_area(
-            f"Notes on {SUSPECTS['s1'].name}:",
-            value=st.session_state.notes["s1"],
-            height=150,
-            placeholder=f"What did {SUSPECTS['s1'].name} reveal?\nAny suspicious behavior?",
-            key="notes_s1"
-        )
-
-    with tab3:
-        st.session_state.notes["s2"] = st.text_area(
-            f"Notes on {SUSPECTS['s2'].name}:",
-            value=st.session_state.notes["s2"],
-            height=150,
-            placeholder=f"What did {SUSPECTS['s2'].name} reveal?\nAny suspicious behavior?",
-            key="notes_s2"
-        )
+    for tab, (sid, suspect) in zip(tabs[1:], suspects.items()):
+        with tab:
+            st.session_state.notes[sid] = st.text_area(
+                f"Notes on {suspect.name}:",
+                value=st.session_state.notes.get(sid, ""),
+                height=150,
+                placeholder=f"What did {suspect.name} reveal?\nAny suspicious behavior?",
+                key=f"notes_{sid}"
+            )
 
-    with tab4:
-        st.session_state.notes["s3"] = st.text_area(
-            f"Notes on {SUSPECTS['s3'].name}:",
-            value=st.session_state.notes["s3"],
-            height=150,
-            placeholder=f"What did {SUSPECTS['s3'].name} reveal?\nAny suspicious behavior?",
-            key="notes_s3"
-        )
+    st.session_state.game.save_notes({"general": st.session_state.general_notes, **st.session_state.notes})
 
 
 def render_accusation_form():
@@ -882,14 +796,15 @@ def render_accusation_form():
         </p>
         """, unsafe_allow_html=True)
 
+        case = current_case()
         col1, col2, col3 = st.columns(3)
 
         with col1:
             st.markdown("**THE KILLER**")
             accused = st.selectbox(
                 "Who committed the murder?",
-                options=list(SUSPECTS.keys()),
-                format_func=lambda x: SUSPECTS[x].name,
+                options=list(case.suspects),
+                format_func=lambda x: case.suspects[x].name,
                 label_visibility="collapsed"
             )
 
@@ -897,7 +812,7 @@ def render_accusation_form():
             st.markdown("**THE WEAPON**")
             weapon = st.selectbox(
                 "What was the murder weapon?",
-                options=VALID_WEAPONS,
+                options=case.weapons,
                 label_visibility="collapsed"
             )
 
@@ -905,7 +820,7 @@ def render_accusation_form():
             st.markdown("**THE MOTIVE**")
             motive = st.selectbox(
                 "Why did they do it?",
-                options=VALID_MOTIVES,
+                options=case.motives,
                 label_visibility="collapsed"
             )
 
@@ -913,8 +828,7 @@ def render_accusation_form():
         st.warning("⚠️ This is your FINAL accusation. There is no going back.")
 
         if st.button("🔨 I ACCUSE...", type="primary", use_container_width=True):
-            with st.spinner("*The room falls silent as the evidence is reviewed...*"):
-                won, score, eval_text = st.session_state.game.make_accusation(accused, weapon, motive)
+            won, score, eval_text = st.session_state.game.make_accusation(accused, weapon, motive)
 
             st.session_state.game_over = True
             st.session_state.accusation_result = {
@@ -925,6 +839,19 @@ def render_accusation_form():
             st.rerun()
 
 
+def render_case_summary():
+    """The judge's case summary: streamed while it is being written, then shown whole."""
+    narrative = st.session_state.game.narrative
+    if narrative is None:
+        return
+    if narrative.done:
+        st.markdown(narrative.text)
+    else:
+        st.write_stream(narrative.stream())
+    if narrative.error is not None:
+        st.caption("*The judge could not finish the case summary.*")
+
+
 def render_game_result():
     """Render the game result screen."""
     if not st.session_state.accusation_result:
@@ -973,37 +900,36 @@ def render_game_result():
         """, unsafe_allow_html=True)
 
     # Interrogation transcript (for AI agent or manual mode)
+    transcript = st.session_state.game.transcript
+    suspects = current_case().suspects
     if result.get("ai_agent"):
         with st.expander("📝 Interrogation Transcript", expanded=False):
-            for suspect_id in ["s1", "s2", "s3"]:
-                suspect = SUSPECTS[suspect_id]
-                messages = st.session_state.messages[suspect_id]
-                if messages:
+            for suspect_id, suspect in suspects.items():
+                if transcript.logs[suspect_id]:
                     st.markdown(f"### 🎭 {suspect.name}")
-                    for msg in messages:
-                        if msg["role"] == "user":
-                            st.markdown(f"**🕵️ Detective:** {msg['content']}")
+                    for role, content in transcript.messages(suspect_id):
+                        if role == "user":
+                            st.markdown(f"**🕵️ Detective:** {content}")
                         else:
-                            st.markdown(f"**{suspect.name}:** {msg['content']}")
+                            st.markdown(f"**{suspect.name}:** {content}")
                     st.markdown("---")
     else:
         # Manual mode - show all questions asked
         with st.expander("📝 Interrogation Transcript", expanded=False):
-            for suspect_id in ["s1", "s2", "s3"]:
-                suspect = SUSPECTS[suspect_id]
-                messages = st.session_state.messages[suspect_id]
-                if messages:
+            for suspect_id, suspect in suspects.items():
+                if transcript.logs[suspect_id]:
                     st.markdown(f"### 🎭 {suspect.name}")
-                    for msg in messages:
-                        if msg["role"] == "user":
-                            st.markdown(f"**🕵️ You:** {msg['content']}")
+                    for role, content in transcript.messages(suspect_id):
+                        if role == "user":
+                            st.markdown(f"**🕵️ You:** {content}")
                         else:
-                            st.markdown(f"**{suspect.name}:** {msg['content']}")
+                            st.markdown(f"**{suspect.name}:** {content}")
                     st.markdown("---")
 
     # Detailed evaluation
     with st.expander("📋 Case Resolution Report", expanded=True):
         st.markdown(result["eval_text"])
+        render_case_summary()
 
     # Play again button
     st.markdown("")
@@ -1014,8 +940,8 @@ def render_game_result():
 
 def main():
     """Main app function."""
-    # Check for API key
-    if not os.environ.get("GROQ_API_KEY"):
+    # Check for API key (only the Groq backend needs one)
+    if requires_groq_key() and not os.environ.get("GROQ_API_KEY"):
         st.error("⚠️ GROQ_API_KEY not set!")
         st.markdown("""
         Please set your Groq API key:
@@ -1039,9 +965,9 @@ def main():
     init_session_state()
 
     # Header
-    st.markdown("""
+    st.markdown(f"""
     <h1 class='main-header'>🔍 AI MURDER MYSTERY</h1>
-    <h3 class='sub-header'>The Blackwood Mansion Affair</h3>
+    <h3 class='sub-header'>{current_case().title}</h3>
     <p style="text-align: center; color: #444; font-family: 'Courier Prime', monospace; font-size: 12px;">
         A game of deception, deduction, and dark secrets
     </p>
@@ -1082,9 +1008,13 @@ def main():
     st.sidebar.markdown("---")
     render_suspect_selector()
     render_game_status()
+    render_case_board()
+    render_transcript_search()
+    render_telemetry()
 
     # New game button in sidebar
     st.sidebar.markdown("---")
+    render_case_picker()
     if st.sidebar.button("🔄 NEW CASE", use_container_width=True):
         reset_game()
         st.rerun()
@@ -1109,4 +1039,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Time the whole script run so slow turns can be told apart from slow reruns
+    with TELEMETRY.span("rerun"):
+        main()
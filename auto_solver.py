@@ -0,0 +1,246 @@
+"""
+Automated investigator (AI agent solve mode).
+
+Interrogates every suspect at once: each suspect gets its own lane that asks
+the generic agent questions (plus questions tailored to what the other
+suspects said, or confronting it with contradictions in its timeline) and
+adaptive follow-ups, one after another, while the lanes run concurrently
+under a shared turn budget. Exchanges are yielded as soon as they complete,
+so a UI can show them live.
+
+Every answer, and every contradiction the game's timeline (timeline.py)
+finds, is fed to an EvidenceBoard (evidence.py); the investigation
+stops early once the board is confident in a suspect, weapon and motive, and
+the accusation is the board's best hypothesis.
+
+Configuration (environment variables):
+    AGENT_LANE_WORKERS     threads running interrogation lanes (default 12)
+    AGENT_STOP_CONFIDENCE  likelihood of every part of the best hypothesis at
+                           which the agent stops asking (default 0.6, 1 = never)
+"""
+
+import itertools
+import os
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from evidence import EvidenceBoard
+from murder_mystery import AGENT_QUESTIONS, MurderMysteryGame
+from semantic_cache import normalize_to_set
+from transcript import MinHashLSH
+
+LANE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("AGENT_LANE_WORKERS", "12")),
+    thread_name_prefix="agent-lane",
+)
+
+AGENT_STOP_CONFIDENCE = float(os.environ.get("AGENT_STOP_CONFIDENCE", "0.6"))
+
+# (keywords in the answer, follow-up question)
+FOLLOWUP_RULES = [
+    (["alibi", "was at", "at the time", "where i was", "i was"],
+     "Can you provide more details about your alibi? Who can confirm it?"),
+    (["alone", "no one", "by myself"], "Who could corroborate that you were alone?"),
+    (["see", "saw", "witness", "sighting"], "Who did you see and can you describe them?"),
+    (["fight", "argument", "argue", "disagreement", "quarrel"],
+     "What was the disagreement about and when did it happen?"),
+    (["money", "debt", "inheritance", "owe"], "Did you have any financial disputes with the victim? Please explain."),
+    (["lover", "affair", "relationship", "ex", "married"],
+     "Can you describe your relationship with the victim in more detail?"),
+]
+
+
+def select_followups(text: str, limit: int = 2) -> List[str]:
+    """Follow-up questions suggested by keywords in a suspect's answer."""
+    t = (text or "").lower()
+    followups = [question for keywords, question in FOLLOWUP_RULES if any(k in t for k in keywords)]
+    # Generic expansion if nothing specific detected
+    return followups[:limit] or ["Can you expand on that?"]
+
+
+# ============================================================
+# SHARED LANE STATE
+# ============================================================
+
+class TurnBudget:
+    """Turns left for all lanes together."""
+
+    def __init__(self, turns: int):
+        self.remaining = turns
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def close(self):
+        """Stop handing out turns."""
+        with self._lock:
+            self.remaining = 0
+
+
+@dataclass
+class AgentExchange:
+    suspect_id: str
+    question: str
+    answer: str
+    followup: bool = False
+
+
+# ============================================================
+# INVESTIGATOR
+# ============================================================
+
+_LANE_DONE = object()
+
+
+class AutoInvestigator:
+    """Runs concurrent per-suspect interrogation lanes against one game."""
+
+    def __init__(self, game: MurderMysteryGame, questions: List[str] = AGENT_QUESTIONS,
+                 questions_per_suspect: Optional[List[int]] = None, rng: Optional[random.Random] = None,
+                 similarity_threshold: float = 0.7, stop_confidence: float = AGENT_STOP_CONFIDENCE):
+        self.game = game
+        self.questions = questions
+        # Main questions per suspect are drawn from this list (follow-ups come on top)
+        self.questions_per_suspect = questions_per_suspect or [3, 4]
+        self.rng = rng or random.Random()
+
+        # Questions asked earlier in this game (e.g. by the player) are not
+        # repeated. Lanes reserve a question here before asking it, so two lanes
+        # never ask near-duplicates at the same time.
+        self.asked: MinHashLSH[int] = MinHashLSH(similarity_threshold)
+        self._reserved = itertools.count()
+        for log in game.conversation_logs.values():
+            for question, _ in log:
+                self._reserve(question)
+
+        case = game.case
+        self.evidence = EvidenceBoard.from_case(case.case_file, case.suspects, case.weapons, case.motives)
+        self._weighed = 0
+        self._update_evidence()
+        self.stop_confidence = stop_confidence
+        self.stopped_early = False
+        # Whether accusation() had to break a tie the evidence left open
+        self.guessed = False
+
+    def _update_evidence(self):
+        """Feed new answers, and contradictions the game's timeline found, to the evidence board."""
+        self.evidence.update(self.game.conversation_logs)
+        found = self.game.timeline.contradictions[self._weighed:]
+        self._weighed += len(found)
+        for contradiction in found:
+            for claim in (contradiction.first, contradiction.second):
+                self.evidence.add_contradiction(contradiction.subject, claim.speaker)
+
+    def _reserve(self, question: str) -> bool:
+        """Claim a question unless a near-duplicate was already asked; True if claimed."""
+        return self.asked.add_if_new(next(self._reserved), normalize_to_set(question))
+
+    def _candidates(self, suspect_id: str, tailored_limit: int = 2) -> Iterator[str]:
+        """
+        Questions confronting the suspect with contradictions in their
+        timeline, as soon as any lane uncovers one; questions about words the
+        other suspects used (at most `tailored_limit`, picked up as the other
+        lanes progress); then the generic ones.
+        """
+        cursor: Dict[str, int] = {}
+        confronted = 0
+        tailored = 0
+        generic = iter(self.questions)
+        while True:
+            found = self.game.timeline.contradictions[confronted:]
+            confronted += len(found)
+            pending = [c.question for c in found if c.subject == suspect_id]
+            if pending:
+                yield from pending
+                continue
+            if tailored < tailored_limit:
+                keywords = self.game.transcript.other_keywords(suspect_id, cursor, limit=1)
+                if keywords:
+                    tailored += 1
+                    yield f"Do you know anything about {keywords[0]}?"
+                    continue
+            question = next(generic, None)
+            if question is None:
+                return
+            yield question
+
+    def _lane(self, suspect_id: str, budget: TurnBudget, emit: Callable[[AgentExchange], None]):
+        max_questions = self.rng.choice(self.questions_per_suspect)
+        asked = 0
+        for question in self._candidates(suspect_id):
+            if asked >= max_questions:
+                return
+            if not self._reserve(question):
+                continue
+            if not budget.take():
+                return
+            answer = self.game.interrogate_suspect(suspect_id, question)
+            emit(AgentExchange(suspect_id, question, answer))
+            asked += 1
+
+            for followup in select_followups(answer):
+                if not self._reserve(followup):
+                    continue
+                if not budget.take():
+                    return
+                emit(AgentExchange(suspect_id, followup, self.game.interrogate_suspect(suspect_id, followup),
+                                   followup=True))
+
+    def run(self, turns: Optional[int] = None, suspect_ids: Optional[List[str]] = None) -> Iterator[AgentExchange]:
+        """
+        Interrogate the suspects concurrently, yielding exchanges as they complete.
+
+        turns defaults to the game's remaining turns. The evidence board is
+        updated before each exchange is yielded; once it is confident (and every
+        lane's suspect has answered) no further questions are started. An
+        error in a lane is re-raised once the other lanes have finished.
+        Closing the generator early stops the lanes the same way.
+        """
+        state = self.game.state
+        budget = TurnBudget(state.max_turns - state.total_turns if turns is None else turns)
+        results: "queue.Queue" = queue.Queue()
+
+        def lane(sid: str):
+            try:
+                self._lane(sid, budget, results.put)
+            finally:
+                results.put(_LANE_DONE)
+
+        lane_ids = suspect_ids or list(self.game.case.suspects)
+        futures = [LANE_EXECUTOR.submit(lane, sid) for sid in lane_ids]
+        running = len(futures)
+        try:
+            while running:
+                item = results.get()
+                if item is _LANE_DONE:
+                    running -= 1
+                    continue
+                self._update_evidence()
+                if not self.stopped_early and self.evidence.sufficient(self.stop_confidence, lane_ids):
+                    self.stopped_early = True
+                    budget.close()
+                yield item
+            for future in futures:
+                future.result()
+        finally:
+            # Also reached when the caller closes the generator (GeneratorExit)
+            budget.close()
+
+    def accusation(self) -> Tuple[str, str, str]:
+        """
+        (suspect_id, weapon, motive) to accuse: the evidence board's best
+        hypothesis, with ties broken by self.rng (see self.guessed).
+        """
+        self._update_evidence()
+        best = self.evidence.best(self.rng)
+        self.guessed = best.guessed
+        return best.suspect_id, best.weapon, best.motive
@@ -0,0 +1,259 @@
+"""
+Pluggable LLM backends.
+
+The agent builders ask make_model() for a model instead of hardcoding Groq,
+so the engine can run against:
+
+    groq    Groq cloud (default; needs GROQ_API_KEY)
+    openai  any OpenAI-compatible server, e.g. vLLM, llama.cpp or Ollama
+            (LLM_BASE_URL, LLM_API_KEY, optional LLM_MODEL_ID; needs `openai`)
+    fake    a built-in deterministic stand-in for load testing, with
+            configurable latency (FAKE_LLM_LATENCY, seconds to first token),
+            prompt processing rate (FAKE_LLM_PREFILL_TOKENS_PER_SEC, 0 = free)
+            and token rate (FAKE_LLM_TOKENS_PER_SEC, 0 = instant)
+
+Select with the LLM_BACKEND environment variable.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from agno.metrics import MessageMetrics
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+from http_pool import HttpClientPool, PooledClientMixin, PooledGroq
+
+BACKENDS = ("groq", "openai", "fake")
+
+
+def backend_name() -> str:
+    name = os.environ.get("LLM_BACKEND", "groq").strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND '{name}'. Expected one of: {', '.join(BACKENDS)}")
+    return name
+
+
+def requires_groq_key() -> bool:
+    return backend_name() == "groq"
+
+
+# ============================================================
+# FAKE MODEL
+# ============================================================
+
+TRIPLE_QUOTED_RE = re.compile(r'"""(.*?)"""', re.DOTALL)
+SECTION_RE = r"{}[^\n]*:\n(.+?)\n"
+
+SUSPECT_OPENERS = [
+    "Detective, I have nothing to hide.",
+    "I already told the constable everything.",
+    "What a tiresome question.",
+    "I'm not sure what you want me to say.",
+    "That night was dreadful for all of us.",
+]
+SUSPECT_CLOSERS = [
+    "Is there anything else?",
+    "Victor had many enemies, you know.",
+    "I would rather not dwell on it.",
+    "Ask the others if you don't believe me.",
+    "I hope that settles it.",
+]
+
+
+def first_person(text: str) -> str:
+    """Turn profile text written to the suspect ('You claim you were...') into speech."""
+    text = re.sub(r"^You (claim|say) (that )?", "", text.strip())
+    text = re.sub(r"\byou were\b", "I was", text, flags=re.IGNORECASE)
+    text = re.sub(r"\byou are\b", "I am", text, flags=re.IGNORECASE)
+    text = re.sub(r"\byou\b", "I", text, flags=re.IGNORECASE)
+    return re.sub(r"\byour\b", "my", text, flags=re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# Process-wide usage of all FakeModel instances (read by the benchmarks)
+_FAKE_USAGE_LOCK = threading.Lock()
+# system_prompt_tokens is the part of prompt_tokens sent as system messages, i.e.
+# the static prefix a provider with prompt caching would not recompute.
+_FAKE_USAGE = {"calls": 0, "prompt_tokens": 0, "system_prompt_tokens": 0, "completion_tokens": 0}
+
+
+def fake_usage() -> dict:
+    with _FAKE_USAGE_LOCK:
+        return dict(_FAKE_USAGE)
+
+
+def reset_fake_usage():
+    with _FAKE_USAGE_LOCK:
+        for key in _FAKE_USAGE:
+            _FAKE_USAGE[key] = 0
+
+
+@dataclass
+class FakeModel(Model):
+    """
+    Deterministic offline model.
+
+    Recognizes the suspect, critique, summarizer and judge agents from their
+    system instructions and produces plausible replies: suspects paraphrase
+    their public story (and, at FAKE_LLM_LEAK_RATE, slip their secret), the
+    critique layer returns the raw answer it was given, the summarizer keeps the
+    first sentence of each answer, and the judge returns a short resolution.
+    Identical inputs always give identical outputs.
+    """
+
+    id: str = "fake-model"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+
+    latency: float = 0.0
+    prefill_tokens_per_second: float = 0.0
+    tokens_per_second: float = 0.0
+    leak_rate: float = 0.2
+
+    def _reply(self, messages: List[Message]) -> str:
+        system = next((str(m.content) for m in messages if m.role == "system"), "")
+        prompt = str(messages[-1].content) if messages else ""
+        digest = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+
+        if "CRITIQUE AND REVISION" in system:
+            blocks = TRIPLE_QUOTED_RE.findall(prompt)
+            return blocks[-1].strip() if blocks else prompt.strip()
+
+        if "CONVERSATION MEMORY SUMMARIZER" in system:
+            previous = re.search(r"CURRENT SUMMARY:\n(.*?)\n\nNEW EXCHANGES:", prompt, re.DOTALL)
+            notes = [] if previous is None or previous.group(1) == "(none)" else [previous.group(1)]
+            for answer in re.findall(r"^Suspect: (.*)$", prompt, re.MULTILINE):
+                notes.append(re.split(r"(?<=[.!?])\s", answer.strip(), maxsplit=1)[0])
+            return " ".join(" ".join(notes).split()[-120:])
+
+        if "CASE RESOLUTION JUDGE" in system:
+            solved = "Suspect correct: True" in prompt
+            return (
+                "CASE SUMMARY:\nThe evidence was reviewed against the interrogation transcripts. "
+                f"{'The detective named the killer.' if solved else 'The killer was not the one accused.'}"
+            )
+
+        public = re.search(SECTION_RE.format("PUBLIC STORY"), system)
+        secret = re.search(SECTION_RE.format("PRIVATE KNOWLEDGE"), system)
+        parts = [SUSPECT_OPENERS[digest % len(SUSPECT_OPENERS)]]
+        if public:
+            parts.append(first_person(public.group(1)))
+        if secret and (digest % 1000) / 1000 < self.leak_rate:
+            parts.append(first_person(secret.group(1)))
+        parts.append(SUSPECT_CLOSERS[(digest // 7) % len(SUSPECT_CLOSERS)])
+        return " ".join(parts)
+
+    def _usage(self, messages: List[Message], text: str) -> MessageMetrics:
+        prompt_tokens = sum(estimate_tokens(str(m.content or "")) for m in messages)
+        system_tokens = sum(estimate_tokens(str(m.content or "")) for m in messages if m.role == "system")
+        completion_tokens = estimate_tokens(text)
+        with _FAKE_USAGE_LOCK:
+            _FAKE_USAGE["calls"] += 1
+            _FAKE_USAGE["prompt_tokens"] += prompt_tokens
+            _FAKE_USAGE["system_prompt_tokens"] += system_tokens
+            _FAKE_USAGE["completion_tokens"] += completion_tokens
+        return MessageMetrics(
+            input_tokens=prompt_tokens,
+            output_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+
+    def _prefill_time(self, messages: List[Message]) -> float:
+        if self.prefill_tokens_per_second <= 0:
+            return 0.0
+        return sum(estimate_tokens(str(m.content or "")) for m in messages) / self.prefill_tokens_per_second
+
+    def _generation_time(self, text: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return estimate_tokens(text) / self.tokens_per_second
+
+    def _chunks(self, text: str) -> List[str]:
+        return re.findall(r"\S+\s*", text)
+
+    def invoke(self, messages: List[Message], assistant_message: Message, **kwargs) -> ModelResponse:
+        text = self._reply(messages)
+        time.sleep(self.latency + self._prefill_time(messages) + self._generation_time(text))
+        return ModelResponse(role="assistant", content=text, response_usage=self._usage(messages, text))
+
+    async def ainvoke(self, messages: List[Message], assistant_message: Message, **kwargs) -> ModelResponse:
+        text = self._reply(messages)
+        await asyncio.sleep(self.latency + self._prefill_time(messages) + self._generation_time(text))
+        return ModelResponse(role="assistant", content=text, response_usage=self._usage(messages, text))
+
+    def invoke_stream(self, messages: List[Message], assistant_message: Message, **kwargs) -> Iterator[ModelResponse]:
+        text = self._reply(messages)
+        chunks = self._chunks(text)
+        time.sleep(self.latency + self._prefill_time(messages))
+        for chunk in chunks:
+            time.sleep(self._generation_time(chunk))
+            yield ModelResponse(role="assistant", content=chunk)
+        yield ModelResponse(response_usage=self._usage(messages, text))
+
+    async def ainvoke_stream(self, messages: List[Message], assistant_message: Message,
+                             **kwargs) -> AsyncIterator[ModelResponse]:
+        text = self._reply(messages)
+        await asyncio.sleep(self.latency + self._prefill_time(messages))
+        for chunk in self._chunks(text):
+            await asyncio.sleep(self._generation_time(chunk))
+            yield ModelResponse(role="assistant", content=chunk)
+        yield ModelResponse(response_usage=self._usage(messages, text))
+
+    def _parse_provider_response(self, response: Any, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
+
+
+# ============================================================
+# MODEL FACTORY
+# ============================================================
+
+def _openai_compatible_model(model_id: str, pool: Optional[HttpClientPool]) -> Model:
+    try:
+        from agno.models.openai.like import OpenAILike
+        from openai import AsyncOpenAI, OpenAI
+    except ImportError as e:
+        raise ImportError("LLM_BACKEND=openai requires the `openai` package: pip install openai") from e
+
+    @dataclass
+    class PooledOpenAILike(PooledClientMixin, OpenAILike):
+        sdk_client_class = OpenAI
+        sdk_async_client_class = AsyncOpenAI
+
+        pool: Optional[HttpClientPool] = None
+
+    return PooledOpenAILike(
+        id=os.environ.get("LLM_MODEL_ID", model_id),
+        base_url=os.environ.get("LLM_BASE_URL", "http://localhost:8000/v1"),
+        api_key=os.environ.get("LLM_API_KEY", "not-provided"),
+        pool=pool,
+    )
+
+
+def make_model(model_id: str, pool: Optional[HttpClientPool] = None) -> Model:
+    """Create the model for an agent on the configured backend."""
+    backend = backend_name()
+    if backend == "fake":
+        return FakeModel(
+            id=f"fake-{model_id}",
+            latency=float(os.environ.get("FAKE_LLM_LATENCY", "0")),
+            prefill_tokens_per_second=float(os.environ.get("FAKE_LLM_PREFILL_TOKENS_PER_SEC", "0")),
+            tokens_per_second=float(os.environ.get("FAKE_LLM_TOKENS_PER_SEC", "0")),
+            leak_rate=float(os.environ.get("FAKE_LLM_LEAK_RATE", "0.2")),
+        )
+    if backend == "openai":
+        return _openai_compatible_model(model_id, pool)
+    return PooledGroq(id=model_id, pool=pool)
@@ -0,0 +1,156 @@
+"""
+Headless batch auto-solve.
+
+Plays many AI agent games without the Streamlit UI, spread over a process
+pool: each game is interrogated with the same lanes and question/follow-up
+heuristics as the agent solve mode (auto_solver.py), then the agent makes its
+accusation. One row per game is written to a CSV or Parquet file with the
+outcome, score, the agent's confidence, whether it had to guess (a tie the
+evidence did not break), turns used and leak counts, for comparing prompt
+changes. The reported win rate counts only wins that were not guesses.
+
+Usage:
+    LLM_BACKEND=fake python batch_solve.py --games 1000 --workers 8 --out results.csv
+    LLM_BACKEND=fake python batch_solve.py --games 500 --generated   # one generated case per game
+    python batch_solve.py --games 200 --out results.parquet   # needs pandas + pyarrow
+
+Response caches are disabled unless --cache is given, so games do not share
+answers. Each worker process builds its agents once and plays its games one
+after another.
+"""
+
+import argparse
+import csv
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+FIELDS = [
+    "game", "seed", "case_id", "session_id", "won", "score", "accused", "weapon", "motive",
+    "confidence", "guessed", "stopped_early", "turns", "suspects_interviewed", "leaks",
+    "critique_calls", "critique_skipped", "generations_aborted", "duration_s", "error",
+]
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+def play_game(game_no: int, seed: int, cache: bool = False, case_id: Optional[str] = None) -> Dict[str, Any]:
+    """Play one automated game (default case unless `case_id` is given) and return its result row."""
+    # Imported here so the parent process never builds agents or thread pools
+    from auto_solver import AutoInvestigator
+    from murder_mystery import MurderMysteryGame
+
+    row: Dict[str, Any] = {"game": game_no, "seed": seed, "error": ""}
+    start = time.perf_counter()
+    game = (MurderMysteryGame(case_id=case_id) if cache
+            else MurderMysteryGame(cache=None, semantic_cache=None, case_id=case_id))
+    row["case_id"] = game.case.case_id
+    try:
+        investigator = AutoInvestigator(game, rng=random.Random(seed))
+        # Answers shown to the player that the local detector still flags as leaks
+        leaks = sum(
+            game.case.leak_detector.classify(exchange.answer, exchange.suspect_id).label == "unsafe"
+            for exchange in investigator.run()
+        )
+        accused, weapon, motive = investigator.accusation()
+        won, score, _ = game.make_accusation(accused, weapon, motive, narrate=False)
+        row.update(won=won, score=score, accused=accused, weapon=weapon, motive=motive, leaks=leaks,
+                   confidence=round(investigator.evidence.best().confidence, 3), guessed=investigator.guessed,
+                   stopped_early=investigator.stopped_early)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    row.update(
+        session_id=game.session_id,
+        turns=game.state.total_turns,
+        suspects_interviewed=len(game.state.suspects_interviewed),
+        critique_calls=game.critique_stats["calls"],
+        critique_skipped=game.critique_stats["skipped"],
+        generations_aborted=game.critique_stats["aborted"],
+        duration_s=round(time.perf_counter() - start, 3),
+    )
+    return row
+
+
+# ============================================================
+# OUTPUT
+# ============================================================
+
+def write_rows(rows: List[Dict[str, Any]], path: str):
+    """Write result rows as Parquet (by extension) or CSV."""
+    if path.endswith(".parquet"):
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("Parquet output requires pandas and pyarrow: pip install pandas pyarrow") from e
+        pd.DataFrame(rows, columns=FIELDS).to_parquet(path, index=False)
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_summary(rows: List[Dict[str, Any]], wall: float):
+    played = [r for r in rows if not r["error"]]
+    n = len(played) or 1
+    print(f"games={len(rows)} errors={len(rows) - len(played)} wall={wall:.1f}s "
+          f"throughput={len(rows) / wall if wall else 0.0:.2f} games/s")
+    print(f"win rate={sum(r['won'] and not r['guessed'] for r in played) / n:.1%} "
+          f"guessed={sum(r['guessed'] for r in played)} "
+          f"mean score={sum(r['score'] for r in played) / n:.1f} "
+          f"mean turns={sum(r['turns'] for r in played) / n:.1f} "
+          f"leaks={sum(r['leaks'] for r in played)}")
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def run_batch(games: int, workers: int, seed: int = 0, cache: bool = False,
+              generated: bool = False) -> List[Dict[str, Any]]:
+    """
+    Play `games` automated games on `workers` processes; rows are in game order.
+
+    With `generated`, game i plays the catalog's i-th generated case (wrapping around).
+    """
+    seeds = [seed + i for i in range(games)]
+    case_ids: List[Optional[str]] = [None] * games
+    if generated:
+        from cases import CASE_CATALOG
+
+        pool_ids = CASE_CATALOG.ids(generated=True)
+        if not pool_ids:
+            raise SystemExit("No generated cases in the catalog; run case_generator.py first.")
+        case_ids = [pool_ids[i % len(pool_ids)] for i in range(games)]
+    if workers <= 1:
+        return [play_game(i, s, cache, c) for i, (s, c) in enumerate(zip(seeds, case_ids))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(play_game, range(games), seeds, [cache] * games, case_ids,
+                             chunksize=max(1, games // (workers * 4))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (game i uses seed + i)")
+    parser.add_argument("--cache", action="store_true", help="enable the response caches")
+    parser.add_argument("--generated", action="store_true", help="play the catalog's generated cases")
+    parser.add_argument("--out", default="batch_results.csv", help=".csv or .parquet file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = run_batch(args.games, args.workers, args.seed, args.cache, args.generated)
+    wall = time.perf_counter() - start
+    write_rows(rows, args.out)
+    print_summary(rows, wall)
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
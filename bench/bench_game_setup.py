@@ -0,0 +1,59 @@
+"""
+Microbenchmark: game construction and reset.
+
+Compares the old behaviour (every game and every reset builds fresh agents,
+re-rendering instructions and creating new model clients) with the shared
+AgentFactory used by MurderMysteryGame.
+
+Usage:
+    python bench/bench_game_setup.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from murder_mystery import (  # noqa: E402
+    DEFAULT_CASE,
+    SUSPECTS,
+    MurderMysteryGame,
+    build_accusation_agent,
+    build_critique_agent,
+    build_suspect_agent,
+)
+
+
+def build_all_agents():
+    """What MurderMysteryGame.__init__ used to do for every new game."""
+    suspect_agents = {sid: build_suspect_agent(DEFAULT_CASE, profile) for sid, profile in SUSPECTS.items()}
+    critique_agents = {sid: build_critique_agent(DEFAULT_CASE, profile) for sid, profile in SUSPECTS.items()}
+    return suspect_agents, critique_agents, build_accusation_agent()
+
+
+def rebuild_suspect_agents():
+    """What MurderMysteryGame.reset() used to do."""
+    return {sid: build_suspect_agent(DEFAULT_CASE, profile) for sid, profile in SUSPECTS.items()}
+
+
+def report(label: str, seconds: float, repeat: int):
+    print(f"{label:<32} {seconds / repeat * 1e6:>10.1f} us/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    game = MurderMysteryGame()  # warm the factory
+
+    report("construct (rebuild agents)", timeit.timeit(build_all_agents, number=args.repeat), args.repeat)
+    report("construct (shared factory)", timeit.timeit(MurderMysteryGame, number=args.repeat), args.repeat)
+    report("reset (rebuild agents)", timeit.timeit(rebuild_suspect_agents, number=args.repeat), args.repeat)
+    report("reset (shared factory)", timeit.timeit(game.reset, number=args.repeat), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+End-to-end engine benchmark.
+
+Plays scripted games against the deterministic fake backend: every suspect
+is asked the AI agent's opening questions (AGENT_QUESTIONS), then an
+accusation is made. Reports throughput, turn, verdict and case summary latency
+percentiles, LLM calls and prompt tokens per turn, and memory per session.
+
+Usage:
+    python bench/run_bench.py --games 50 --concurrency 8 --latency 0.2 --json results.json
+    python bench/run_bench.py --mode async --games 500 --concurrency 500
+    python bench/run_bench.py --compare before.json after.json
+
+Response caches are disabled unless --cache is given, so every turn reaches
+the (fake) model.
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# ============================================================
+# STATISTICS
+# ============================================================
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    >>> values = list(range(1, 11))
+    >>> percentile(values, 50), percentile(values, 90), percentile([1, 2], 50)
+    (5, 9, 1)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct * len(sorted_values) / 100) - 1))
+    return sorted_values[rank]
+
+
+def summarize_ms(seconds: List[float]) -> Dict[str, float]:
+    values = sorted(s * 1000 for s in seconds)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+# ============================================================
+# SCRIPTED GAMES
+# ============================================================
+
+def game_script(turns: int) -> List[Tuple[str, str]]:
+    """(suspect_id, question) pairs: each suspect gets the agent questions in turn, repeating as needed."""
+    from murder_mystery import AGENT_QUESTIONS, SUSPECTS
+
+    script = [(sid, q) for sid in SUSPECTS for q in AGENT_QUESTIONS]
+    return list(itertools.islice(itertools.cycle(script), turns))
+
+
+def new_game(args, async_engine: bool = False, telemetry=None):
+    import murder_mystery as mm
+
+    cls = mm.AsyncMurderMysteryGame if async_engine else mm.MurderMysteryGame
+    kwargs = {"telemetry": telemetry} if telemetry is not None else {}
+    if not args.cache:
+        kwargs.update(cache=None, semantic_cache=None)
+    return cls(**kwargs)
+
+
+def play_sync(args, script: List[Tuple[str, str]], telemetry=None) -> Dict[str, Any]:
+    game = new_game(args, telemetry=telemetry)
+    turn_times = []
+    for sid, question in script:
+        game.switch_suspect(sid)
+        start = time.perf_counter()
+        game.interrogate(question)
+        turn_times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    game.make_accusation("s1", "brass candlestick", "inheritance")
+    accusation = time.perf_counter() - start
+    game.narrative.result()
+    return {"turns": turn_times, "accusation": accusation, "narrative": time.perf_counter() - start, "game": game}
+
+
+async def play_async(args, script: List[Tuple[str, str]], telemetry=None) -> Dict[str, Any]:
+    game = new_game(args, async_engine=True, telemetry=telemetry)
+    turn_times = []
+    for sid, question in script:
+        game.switch_suspect(sid)
+        start = time.perf_counter()
+        await game.interrogate(question)
+        turn_times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    await game.make_accusation("s1", "brass candlestick", "inheritance")
+    accusation = time.perf_counter() - start
+    await game.narrative_task
+    return {"turns": turn_times, "accusation": accusation, "narrative": time.perf_counter() - start, "game": game}
+
+
+def run_games(args, script: List[Tuple[str, str]], telemetry=None) -> List[Dict[str, Any]]:
+    if args.mode == "async":
+        async def main():
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def bounded():
+                async with semaphore:
+                    return await play_async(args, script, telemetry)
+
+            return await asyncio.gather(*[bounded() for _ in range(args.games)])
+
+        return asyncio.run(main())
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        return list(pool.map(lambda _: play_sync(args, script, telemetry), range(args.games)))
+
+
+def measure_memory(args, script: List[Tuple[str, str]]) -> float:
+    """Average bytes retained per finished game session (sequential, traced)."""
+    from telemetry import Telemetry
+
+    if args.memory_games <= 0:
+        return 0.0
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    # No telemetry sinks, so retained spans are not counted against the sessions
+    games = [play_sync(args, script, Telemetry())["game"] for _ in range(args.memory_games)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del games
+    return retained / args.memory_games
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def run(args) -> Dict[str, Any]:
+    # The backend is chosen when the agents are first built, so configure it
+    # before importing the engine.
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = str(args.latency)
+    os.environ["FAKE_LLM_TOKENS_PER_SEC"] = str(args.tokens_per_sec)
+    os.environ["FAKE_LLM_PREFILL_TOKENS_PER_SEC"] = str(args.prefill_tokens_per_sec)
+    os.environ["FAKE_LLM_LEAK_RATE"] = str(args.leak_rate)
+    os.environ.setdefault("GROQ_MAX_CONCURRENCY", str(max(args.concurrency, 1)))
+    os.environ["SPECULATIVE_CRITIQUE"] = "1" if args.speculative else "0"
+
+    from backends import fake_usage, reset_fake_usage
+    from telemetry import RingBufferSink, Telemetry
+
+    # Per-stage breakdown of the timed run
+    stages = RingBufferSink(max_spans=1_000_000)
+
+    script = game_script(args.turns)
+    play_sync(args, script[:1])  # warm up agents and imports
+
+    reset_fake_usage()
+    start = time.perf_counter()
+    games = run_games(args, script, Telemetry([stages]))
+    wall = time.perf_counter() - start
+    usage = fake_usage()
+
+    turn_times = [t for g in games for t in g["turns"]]
+    turns = len(turn_times)
+    critique = {"calls": 0, "skipped": 0, "aborted": 0}
+    for g in games:
+        for key in critique:
+            critique[key] += g["game"].critique_stats[key]
+    memory = measure_memory(args, script)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "config": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+        },
+        "results": {
+            "games": len(games),
+            "turns": turns,
+            "wall_s": wall,
+            "turns_per_sec": turns / wall if wall else 0.0,
+            "turn_latency_ms": summarize_ms(turn_times),
+            # Latency growth over a game: the first and last few turns of every game
+            "early_turn_latency_ms": summarize_ms([t for g in games for t in g["turns"][:3]]),
+            "late_turn_latency_ms": summarize_ms([t for g in games for t in g["turns"][-3:]]),
+            # Until the verdict is returned, and until the judge's case summary is complete
+            "accusation_latency_ms": summarize_ms([g["accusation"] for g in games]),
+            "narrative_latency_ms": summarize_ms([g["narrative"] for g in games]),
+            "llm_calls_per_turn": usage["calls"] / turns if turns else 0.0,
+            "prompt_tokens_per_turn": usage["prompt_tokens"] / turns if turns else 0.0,
+            # Prompt tokens outside the static system prefix (not prompt-cacheable)
+            "uncached_prompt_tokens_per_turn": (
+                (usage["prompt_tokens"] - usage["system_prompt_tokens"]) / turns if turns else 0.0
+            ),
+            "completion_tokens_per_turn": usage["completion_tokens"] / turns if turns else 0.0,
+            "critique_calls": critique["calls"],
+            "critique_skipped": critique["skipped"],
+            "generations_aborted": critique["aborted"],
+            "memory_per_session_kb": memory / 1024,
+            "stages": stages.summary(),
+        },
+    }
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(before_path: str, after_path: str):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'metric':<36} {before['meta']['commit']:>12} {after['meta']['commit']:>12} {'change':>9}")
+    old, new = flatten(before["results"]), flatten(after["results"])
+    for key in old:
+        if key not in new:
+            continue
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        print(f"{key:<36} {old[key]:>12.2f} {new[key]:>12.2f} {change:>+8.1f}%")
+
+
+def print_report(report: Dict[str, Any]):
+    r = report["results"]
+    print(f"games={r['games']} turns={r['turns']} wall={r['wall_s']:.2f}s "
+          f"throughput={r['turns_per_sec']:.1f} turns/s")
+    for name in ("turn_latency_ms", "early_turn_latency_ms", "late_turn_latency_ms", "accusation_latency_ms",
+                 "narrative_latency_ms"):
+        s = r[name]
+        print(f"{name:<22} p50={s['p50']:.1f} p90={s['p90']:.1f} p99={s['p99']:.1f} max={s['max']:.1f}")
+    print(f"llm calls/turn={r['llm_calls_per_turn']:.2f} prompt tokens/turn={r['prompt_tokens_per_turn']:.0f} "
+          f"(uncached {r['uncached_prompt_tokens_per_turn']:.0f}) "
+          f"completion tokens/turn={r['completion_tokens_per_turn']:.0f}")
+    print(f"critique calls={r['critique_calls']} skipped={r['critique_skipped']} "
+          f"aborted={r['generations_aborted']} "
+          f"memory/session={r['memory_per_session_kb']:.1f} KiB")
+    for name, s in r["stages"].items():
+        print(f"  {name:<12} n={s['count']:<6} p50={s['p50_ms']:.1f}ms p95={s['p95_ms']:.1f}ms "
+              f"prompt tokens/call={s['prompt_tokens'] / s['count']:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=18, help="questions per game")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model time to first token (s)")
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=0.0,
+                        help="fake model prompt processing rate (0 = free)")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="fake model token rate (0 = instant)")
+    parser.add_argument("--leak-rate", type=float, default=0.2, help="share of suspect answers that leak")
+    parser.add_argument("--cache", action="store_true", help="enable the response caches")
+    parser.add_argument("--speculative", action="store_true", help="critique while the suspect is generating")
+    parser.add_argument("--memory-games", type=int, default=10, help="games traced for memory per session")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON reports")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
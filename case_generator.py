@@ -0,0 +1,340 @@
+"""
+Procedural case generator.
+
+Builds CASE_FILE-shaped cases from templates and a seed: a setting and crime
+scene, a victim, three suspects (killer, accomplice, innocent witness) with
+personas, alibis, secrets and hard redlines, the truth and its timeline, and
+weapon/motive option lists. The same seed always gives the same case.
+
+Generation is an offline batch job: cases are generated and checked for
+internal consistency on a process pool, and only the ones that pass are
+written as bundles into the case catalog (cases.py), marked as generated. A
+game then starts on a pre-validated case by taking the next one from the pool
+(cases.CASE_POOL), without generating anything.
+
+Usage:
+    python case_generator.py --cases 500 --workers 8 --out cases
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from backends import first_person
+from cases import DEFAULT_CASE_DIR, Case, build_index, write_bundle
+from evidence import EvidenceBoard
+from leak_detector import tokenize
+
+# ============================================================
+# TEMPLATES
+# ============================================================
+
+# (setting, rooms the murder can happen in)
+SETTINGS: List[Tuple[str, List[str]]] = [
+    ("Ravenscroft Manor", ["Library", "Study", "Conservatory", "Wine Cellar", "Billiard Room", "Gallery"]),
+    ("Hollow Pines Lodge", ["Trophy Room", "Boathouse", "Sauna", "Attic", "Gun Room"]),
+    ("the Grand Meridian Hotel", ["Ballroom", "Penthouse", "Cloakroom", "Rooftop Terrace", "Wine Cellar"]),
+    ("the SS Aurelia", ["Captain's Cabin", "Engine Room", "Promenade Deck", "Chart Room", "Ballroom"]),
+    ("Thornfield Abbey", ["Chapel", "Scriptorium", "Bell Tower", "Crypt", "Refectory"]),
+    ("the Orient Star Express", ["Dining Car", "Observation Car", "Baggage Car", "Lounge Car"]),
+]
+
+FIRST_NAMES: List[str] = [
+    "Arthur", "Beatrice", "Cecil", "Dorothy", "Edmund", "Florence", "Gideon", "Harriet", "Ingrid",
+    "Jasper", "Katherine", "Leopold", "Margot", "Nathaniel", "Ophelia", "Percival", "Rosalind",
+    "Sebastian", "Theodora", "Ulysses", "Vivienne", "Winston", "Agatha", "Bernard", "Clara",
+]
+SURNAMES: List[str] = [
+    "Ashdown", "Bellamy", "Carrow", "Devereux", "Everly", "Fairfax", "Greaves", "Hargrove",
+    "Ingram", "Kingsley", "Lockwood", "Montague", "Northcott", "Pemberton", "Quill", "Radcliffe",
+    "Sterling", "Thackeray", "Underwood", "Whitlock",
+]
+TITLES: List[str] = ["", "", "", "Dr. ", "Colonel ", "Lady ", "Professor "]
+
+# What a suspect is to the victim
+OCCUPATIONS: List[str] = [
+    "the victim's estranged heir", "the family doctor", "the loyal housekeeper", "the victim's business partner",
+    "the chauffeur", "the victim's private secretary", "a visiting art dealer", "the head gardener",
+    "the victim's younger sibling", "the family solicitor", "a retired stage actor", "the cook",
+]
+MANNERS: List[str] = [
+    "You are evasive, controlled, and you dislike being challenged.",
+    "You deflect uncomfortable questions with sarcasm or intellectual talk.",
+    "You speak softly, are easily flustered, and you worry about losing your position.",
+    "You are blunt and impatient, and you treat the questioning as an insult.",
+    "You are charming and talkative, and you steer every answer back to yourself.",
+    "You are nervous and over-explain, contradicting yourself in small details.",
+]
+
+# (public story, the judge's short version). Alibi places use the words the
+# evidence board reads as "I was elsewhere".
+ALIBIS: List[Tuple[str, str]] = [
+    ("You claim you were in your bedroom reading a novel when the murder occurred.", "were reading in the bedroom"),
+    ("You say you were in the basement sorting old papers during the incident.", "were in the basement"),
+    ("You say you were in the kitchen preparing a late supper all evening.", "were cooking in the kitchen"),
+    ("You claim you were in the garden smoking alone at the time.", "were smoking in the garden"),
+    ("You say you were in the laundry room ironing when it happened.", "were ironing in the laundry room"),
+]
+# The accomplice's alibi: gone before the murder
+LEFT_ALIBI = "You say you left {setting} at {time} after {errand}."
+ERRANDS: List[str] = ["a routine check-up", "a short business meeting", "dropping off a parcel", "a brief visit"]
+
+# weapon -> cause of death
+WEAPONS: Dict[str, str] = {
+    "brass candlestick": "blunt force trauma to the head",
+    "letter opener": "a stab wound to the chest",
+    "fireplace poker": "blunt force trauma to the head",
+    "poison": "poisoning",
+    "rope": "strangulation",
+    "revolver": "a single gunshot wound",
+    "silk scarf": "strangulation",
+    "hunting knife": "a stab wound to the back",
+    "marble bust": "blunt force trauma to the head",
+    "ice pick": "a puncture wound to the neck",
+}
+# motive -> how the killer's secret tells it
+MOTIVES: Dict[str, str] = {
+    "inheritance": "a heated argument about the inheritance",
+    "jealousy": "a jealous quarrel",
+    "revenge": "years of nursing a grudge",
+    "blackmail": "being threatened with blackmail",
+    "affair": "discovering a secret affair",
+}
+HIDING_PLACES: List[str] = ["fireplace", "greenhouse", "wine rack", "piano", "linen cupboard", "coal chute"]
+
+OPTIONS_PER_LIST = 5
+
+
+def _clock(minutes: int) -> str:
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+
+# ============================================================
+# GENERATION
+# ============================================================
+
+def generate_case(seed: int) -> Case:
+    """Build one case from the templates; deterministic in `seed`."""
+    rng = random.Random(seed)
+    setting, rooms = rng.choice(SETTINGS)
+    scene, other_room = rng.sample(rooms, 2)
+
+    firsts = rng.sample(FIRST_NAMES, 4)
+    surnames = rng.sample(SURNAMES, 4)
+    victim = f"{firsts[0]} {surnames[0]}"
+    victim_first = firsts[0]
+    names = [f"{rng.choice(TITLES)}{first} {surname}" for first, surname in zip(firsts[1:], surnames[1:])]
+
+    weapon = rng.choice(sorted(WEAPONS))
+    motive = rng.choice(sorted(MOTIVES))
+    death = rng.randrange(21 * 60, 23 * 60 + 46, 5)
+    tod = _clock(death)
+
+    # Roles are dealt to s1..s3 at random, so the culprit is not always s1
+    ids = ["s1", "s2", "s3"]
+    roles = dict(zip(rng.sample(ids, 3), ["killer", "accomplice", "innocent"]))
+    by_role = {role: sid for sid, role in roles.items()}
+    name_of = dict(zip(ids, names))
+    killer_name = name_of[by_role["killer"]]
+    killer_first = killer_name.split()[-2]
+    # Without the title: "Dr." would end the sentence for the leak detector
+    killer_full = " ".join(killer_name.split()[-2:])
+    weapon_head = weapon.split()[-1]
+    article = "" if weapon == "poison" else "the "
+    alibis = rng.sample(ALIBIS, 2)
+    occupation = dict(zip(ids, rng.sample(OCCUPATIONS, 3)))
+    manner = dict(zip(ids, rng.sample(MANNERS, 3)))
+    left_at = _clock(death - rng.choice([20, 30, 40]))
+
+    stories = {
+        "killer": dict(
+            public_info=alibis[0][0],
+            secret_info=(f"You killed {victim_first} in the {scene.lower()} at {tod} using {article}{weapon} "
+                         f"after {MOTIVES[motive]}."),
+            hard_redlines=[
+                f"I killed {victim_first}",
+                f"I murdered {victim_first}",
+                "I am the killer",
+                f"I hit {victim_first} with {article}{weapon_head}" if weapon != "poison"
+                else f"I poisoned {victim_first}",
+                f"I was in the {scene.lower()} at {tod}",
+            ],
+            summary=f"{occupation[by_role['killer']].capitalize()}, claims they {alibis[0][1]}",
+        ),
+        "accomplice": dict(
+            public_info=LEFT_ALIBI.format(setting=setting, time=left_at, errand=rng.choice(ERRANDS)),
+            secret_info=(f"You helped {killer_first} hide {article}{weapon} in the {rng.choice(HIDING_PLACES)} "
+                         f"and coached them on a fake timeline."),
+            hard_redlines=[
+                f"I helped {killer_first} after the murder",
+                f"I hid {article}{weapon_head}",
+                "I helped hide the weapon",
+            ],
+            summary=f"Helped hide the weapon, claims they left at {left_at}",
+        ),
+        "innocent": dict(
+            public_info=alibis[1][0],
+            secret_info=(f"You saw {killer_first} rushing down from the {scene.lower()} around "
+                         f"{_clock(death + 5)}, but you are too scared to say it plainly."),
+            hard_redlines=[
+                f"I saw {killer_first} kill {victim_first}",
+                f"I know for sure {killer_first} is the killer",
+                f"{killer_first} was definitely in the {scene.lower()} at {tod}",
+            ],
+            summary=f"Saw {killer_first} rushing from the {scene.lower()} at {_clock(death + 5)}, too scared to say",
+        ),
+    }
+
+    suspects = [
+        dict(id=sid, name=name_of[sid], role=roles[sid],
+             persona=f"You are {name_of[sid]}, {occupation[sid]}. {manner[sid]}", **stories[roles[sid]])
+        for sid in ids
+    ]
+
+    weapons = [weapon] + rng.sample([w for w in sorted(WEAPONS) if w != weapon], OPTIONS_PER_LIST - 1)
+    motives = [motive] + rng.sample([m for m in sorted(MOTIVES) if m != motive], OPTIONS_PER_LIST - 1)
+    rng.shuffle(weapons)
+    rng.shuffle(motives)
+
+    return Case.from_bundle({
+        "case_id": f"gen_{seed:06d}",
+        "title": f"Death at {setting.replace('the ', 'The ', 1)}",
+        "setting": setting,
+        "file_number": str(2000 + seed % 8000),
+        "generated": True,
+        "seed": seed,
+        "victim": {
+            "name": victim,
+            "time_of_death": tod,
+            "location": f"{scene} of {setting}",
+            "cause": WEAPONS[weapon],
+        },
+        "truth": {
+            "culprit_id": by_role["killer"],
+            "method": weapon,
+            "motive": motive,
+            "timeline": [
+                f"{_clock(death - 45)} - {victim_first} seen arguing with {killer_first} "
+                f"({by_role['killer']}) in the {other_room.lower()}.",
+                f"{_clock(death - 15)} - Raised voices were heard.",
+                f"{tod} - {victim_first} killed in the {scene.lower()}.",
+            ],
+        },
+        "redlines": [
+            f"{killer_first} killed {victim_first}",
+            f"{killer_first} is the killer",
+            f"The culprit is {killer_full}",
+            f"{victim_first} was killed with {article}{weapon}",
+        ],
+        "weapons": weapons,
+        "motives": motives,
+        "suspects": suspects,
+    })
+
+
+# ============================================================
+# VALIDATION
+# ============================================================
+
+def validate_case(case: Case) -> List[str]:
+    """Consistency problems that make a case unfair or unplayable (empty if it is fine)."""
+    problems: List[str] = []
+    truth = case.case_file["truth"]
+    victim = case.case_file["victim"]
+    suspects = case.suspects
+
+    roles = sorted(p.role for p in suspects.values())
+    if roles != ["accomplice", "innocent", "killer"]:
+        problems.append(f"roles are {roles}")
+    culprit = suspects.get(truth["culprit_id"])
+    if culprit is None or culprit.role != "killer":
+        problems.append("the culprit is not the killer")
+    if truth["method"] not in case.weapons:
+        problems.append("the weapon is not an option")
+    if truth["motive"] not in case.motives:
+        problems.append("the motive is not an option")
+    if len({tokenize(w)[-1] for w in case.weapons}) != len(case.weapons):
+        problems.append("two weapons share a head noun")
+    if not any(entry.startswith(victim["time_of_death"]) for entry in truth["timeline"]):
+        problems.append("the timeline misses the time of death")
+
+    scene = victim["location"].split(" of ")[0].lower()
+    for profile in suspects.values():
+        if scene in profile.public_info.lower():
+            problems.append(f"{profile.name}'s alibi is the crime scene")
+
+    # Every suspect must be identifiable by name, or the evidence cannot point at them
+    board = EvidenceBoard.from_case(case.case_file, suspects, case.weapons, case.motives)
+    unnamed = set(suspects) - set(board.name_tokens.values())
+    if unnamed:
+        problems.append(f"no distinctive name token for {sorted(unnamed)}")
+
+    # The redline filter must catch every redline and let every public story through
+    detector = case.leak_detector
+    redlines = list(case.case_file["redlines"]) + [r for p in suspects.values() for r in p.hard_redlines]
+    for redline in redlines:
+        if detector.classify(redline).label != "unsafe":
+            problems.append(f"redline not caught: {redline}")
+    for profile in suspects.values():
+        if detector.classify(first_person(profile.public_info)).label == "unsafe":
+            problems.append(f"{profile.name}'s public story trips a redline")
+
+    # Solvable: the witness's secret, once said, points at the culprit
+    witness = next((p for p in suspects.values() if p.role == "innocent"), None)
+    if witness is not None and culprit is not None:
+        board.add_answer(witness.id, first_person(witness.secret_info))
+        if max(board.suspects, key=board.suspects.get) != culprit.id:
+            problems.append("the witness's secret does not point at the culprit")
+    return problems
+
+
+def generate_valid(seed: int) -> Tuple[int, Optional[Dict[str, Any]], List[str]]:
+    """Worker: (seed, bundle or None, problems) for one seed."""
+    case = generate_case(seed)
+    problems = validate_case(case)
+    return seed, (None if problems else case.to_bundle()), problems
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def generate_pool(count: int, workers: int, seed: int = 0, out: str = DEFAULT_CASE_DIR) -> Dict[str, Any]:
+    """Generate and validate `count` cases on `workers` processes, write the valid ones and re-index."""
+    seeds = range(seed, seed + count)
+    if workers <= 1:
+        results = [generate_valid(s) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(generate_valid, seeds, chunksize=max(1, count // (workers * 4))))
+
+    rejected: Dict[int, List[str]] = {}
+    for s, bundle, problems in results:
+        if bundle is None:
+            rejected[s] = problems
+            continue
+        write_bundle(os.path.join(out, f"{bundle['case_id']}.json"), bundle)
+    return {"written": count - len(rejected), "rejected": rejected, "index": build_index(out)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first case (case i uses seed + i)")
+    parser.add_argument("--out", default=os.environ.get("CASE_DIR") or DEFAULT_CASE_DIR, help="case catalog directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = generate_pool(args.cases, args.workers, args.seed, args.out)
+    print(f"wrote {result['written']} case(s), rejected {len(result['rejected'])} "
+          f"in {time.perf_counter() - start:.1f}s; catalog has {len(result['index']['cases'])} case(s)")
+    for s, problems in sorted(result["rejected"].items())[:10]:
+        print(f"  seed {s}: {'; '.join(problems)}")
+
+
+if __name__ == "__main__":
+    main()
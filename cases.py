@@ -0,0 +1,326 @@
+"""
+Case catalog.
+
+Cases are data, not code: each case is a bundle file (JSON, YAML or msgpack)
+in a data directory, holding the case file (victim, truth, redlines), the
+weapon and motive options and the suspect profiles. An index file in the same
+directory maps case ids to bundles and carries what a case picker needs
+(title, victim, suspect count), so listing the catalog never parses a bundle.
+
+A case is parsed the first time it is played and kept in an LRU of parsed
+cases. Anything derived from a case (leak matchers, rendered agent
+instructions, ...) is built once per case through Case.artifact() and lives
+as long as the parsed case, so starting a game is a dictionary lookup however
+many cases the catalog holds.
+
+Cases written by the procedural generator (case_generator.py) are marked as
+generated in the index; CASE_POOL hands them out one per new game.
+
+Configuration (environment variables):
+    CASE_DIR         directory with index.json and the case bundles (default: ./cases)
+    CASE_CACHE_SIZE  parsed cases kept in memory (default 16)
+    DEFAULT_CASE     case played when none is chosen (default: the index's "default")
+
+Rebuild the index after adding or editing bundles:
+    python cases.py [--dir cases]
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, Iterator, List, Optional, TypeVar
+
+from leak_detector import LeakDetector
+
+T = TypeVar("T")
+
+INDEX_FILE = "index.json"
+BUNDLE_EXTENSIONS = (".json", ".yaml", ".yml", ".msgpack")
+
+DEFAULT_CASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cases")
+
+
+# ============================================================
+# DATA STRUCTURES
+# ============================================================
+
+@dataclass
+class SuspectProfile:
+    id: str
+    name: str
+    persona: str
+    public_info: str
+    secret_info: str
+    role: str  # "killer", "accomplice", "innocent"
+    hard_redlines: List[str] = field(default_factory=list)
+    # One line for the judge ("Elegant heiress, claims she was reading in bedroom")
+    summary: str = ""
+
+
+@dataclass
+class Case:
+    """One parsed case bundle and the artifacts derived from it."""
+    case_id: str
+    title: str
+    setting: str
+    # CASE_FILE-shaped: case_id, victim, truth, redlines (plus any extra bundle keys)
+    case_file: Dict[str, Any]
+    suspects: Dict[str, SuspectProfile]
+    weapons: List[str]
+    motives: List[str]
+    _artifacts: Dict[Hashable, Any] = field(default_factory=dict, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def from_bundle(cls, bundle: Dict[str, Any]) -> "Case":
+        bundle = dict(bundle)
+        suspects = {s["id"]: SuspectProfile(**s) for s in bundle.pop("suspects")}
+        weapons = list(bundle.pop("weapons"))
+        motives = list(bundle.pop("motives"))
+        return cls(
+            case_id=bundle["case_id"],
+            title=bundle.get("title", bundle["case_id"]),
+            setting=bundle.get("setting", bundle["victim"]["location"]),
+            case_file=bundle,
+            suspects=suspects,
+            weapons=weapons,
+            motives=motives,
+        )
+
+    def to_bundle(self) -> Dict[str, Any]:
+        return {
+            **self.case_file,
+            "title": self.title,
+            "setting": self.setting,
+            "weapons": self.weapons,
+            "motives": self.motives,
+            "suspects": [vars(profile).copy() for profile in self.suspects.values()],
+        }
+
+    def artifact(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Something derived from this case, built on first use and kept with it."""
+        try:
+            return self._artifacts[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._artifacts:
+                self._artifacts[key] = build()
+            return self._artifacts[key]
+
+    @property
+    def leak_detector(self) -> LeakDetector:
+        """Redline matcher for this case's answers."""
+        return self.artifact("leak_detector", lambda: LeakDetector.from_case(self.case_file, self.suspects, self.weapons))
+
+
+# ============================================================
+# BUNDLE FILES
+# ============================================================
+
+def read_bundle(path: str) -> Dict[str, Any]:
+    """Parse a case bundle; the format is chosen by extension."""
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("YAML case bundles require PyYAML: pip install pyyaml") from e
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    if path.endswith(".msgpack"):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError("msgpack case bundles require msgpack: pip install msgpack") from e
+        with open(path, "rb") as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_bundle(path: str, bundle: Dict[str, Any]):
+    """Write a case bundle as JSON (YAML and msgpack bundles are read-only here)."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def index_entry(file_name: str, case: Case) -> Dict[str, Any]:
+    """What the index records about a bundle."""
+    return {
+        "file": file_name,
+        "title": case.title,
+        "victim": case.case_file["victim"]["name"],
+        "suspects": len(case.suspects),
+        "generated": bool(case.case_file.get("generated")),
+    }
+
+
+def build_index(data_dir: str, default: Optional[str] = None) -> Dict[str, Any]:
+    """Parse every bundle in `data_dir` and write its index file; returns the index."""
+    index_path = os.path.join(data_dir, INDEX_FILE)
+    if default is None and os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            default = json.load(f).get("default")
+
+    cases: Dict[str, Dict[str, Any]] = {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name == INDEX_FILE or not file_name.endswith(BUNDLE_EXTENSIONS):
+            continue
+        case = Case.from_bundle(read_bundle(os.path.join(data_dir, file_name)))
+        if case.case_id in cases:
+            raise ValueError(f"Duplicate case id '{case.case_id}' in {file_name}")
+        cases[case.case_id] = index_entry(file_name, case)
+
+    index = {"default": default if default in cases else next(iter(cases), None), "cases": cases}
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return index
+
+
+# ============================================================
+# CATALOG
+# ============================================================
+
+class CaseCatalog:
+    """Index of the cases in a data directory plus an LRU of parsed cases."""
+
+    def __init__(self, data_dir: str, max_cases: int = 16, default: Optional[str] = None):
+        self.data_dir = data_dir
+        self.max_cases = max_cases
+
+        self._lock = threading.Lock()
+        self._cases: "OrderedDict[str, Case]" = OrderedDict()
+        self._pinned: Dict[str, Case] = {}
+        self._default = default
+        self._index: Optional[Dict[str, Any]] = None
+        self._ids: Dict[bool, List[str]] = {}
+
+    def _read_index(self) -> Dict[str, Any]:
+        # Read on first use, so importing this module never touches the disk
+        if self._index is None:
+            with open(os.path.join(self.data_dir, INDEX_FILE), encoding="utf-8") as f:
+                self._index = json.load(f)
+            # Memos over a previous index are stale
+            self._ids = {}
+        return self._index
+
+    def reload(self):
+        """Re-read the index on next use, after it was rebuilt (build_index())."""
+        self._index = None
+        self._ids = {}
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """case id -> index entry (bundle file, title, victim, suspect count)."""
+        return self._read_index()["cases"]
+
+    @property
+    def default_id(self) -> str:
+        return self._default or self._read_index().get("default") or next(iter(self.entries))
+
+    @classmethod
+    def from_env(cls) -> "CaseCatalog":
+        return cls(
+            os.environ.get("CASE_DIR") or DEFAULT_CASE_DIR,
+            max_cases=int(os.environ.get("CASE_CACHE_SIZE", "16")),
+            default=os.environ.get("DEFAULT_CASE") or None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, case_id: str) -> bool:
+        return case_id in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def ids(self, generated: bool) -> List[str]:
+        """Ids of the generated (case_generator.py) or the hand-written cases, in index order."""
+        entries = self.entries
+        if generated not in self._ids:
+            self._ids[generated] = [cid for cid, entry in entries.items() if bool(entry.get("generated")) == generated]
+        return self._ids[generated]
+
+    def get(self, case_id: Optional[str] = None) -> Case:
+        """The parsed case (default: the catalog's default case); loads it on a miss."""
+        case_id = case_id or self.default_id
+        with self._lock:
+            case = self._pinned.get(case_id) or self._cases.get(case_id)
+            if case is not None:
+                if case_id in self._cases:
+                    self._cases.move_to_end(case_id)
+                return case
+        # Parse outside the lock; if two threads race, the first one stored wins
+        case = self.load(case_id)
+        with self._lock:
+            case = self._pinned.get(case_id) or self._cases.setdefault(case_id, case)
+            self._cases.move_to_end(case_id)
+            while len(self._cases) > self.max_cases:
+                self._cases.popitem(last=False)
+        return case
+
+    def pin(self, case_id: Optional[str] = None) -> Case:
+        """Like get(), but the case is never evicted."""
+        case = self.get(case_id)
+        with self._lock:
+            self._pinned[case.case_id] = case
+            self._cases.pop(case.case_id, None)
+        return case
+
+    def load(self, case_id: str) -> Case:
+        """Parse a case from its bundle, bypassing the LRU."""
+        entry = self.entries.get(case_id)
+        if entry is None:
+            raise ValueError(f"Unknown case id: {case_id}")
+        case = Case.from_bundle(read_bundle(os.path.join(self.data_dir, entry["file"])))
+        if case.case_id != case_id:
+            raise ValueError(f"{entry['file']} holds case '{case.case_id}', not '{case_id}'")
+        return case
+
+
+class CasePool:
+    """
+    The catalog's generated cases, handed out one per new game.
+
+    Cases were generated and validated offline (case_generator.py), so taking
+    one is a deque pop. The pool is shuffled once and refilled when it runs
+    out, so every generated case is played before any comes back.
+    """
+
+    def __init__(self, catalog: CaseCatalog, rng: Optional[random.Random] = None):
+        self.catalog = catalog
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._queue: Deque[str] = deque()
+
+    def __len__(self) -> int:
+        return len(self.catalog.ids(generated=True))
+
+    def pop(self) -> Optional[str]:
+        """Id of the next generated case to play (None if the catalog has none)."""
+        with self._lock:
+            if not self._queue:
+                ids = list(self.catalog.ids(generated=True))
+                self.rng.shuffle(ids)
+                self._queue.extend(ids)
+            return self._queue.popleft() if self._queue else None
+
+
+CASE_CATALOG = CaseCatalog.from_env()
+CASE_POOL = CasePool(CASE_CATALOG)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the case index from the bundles in a directory.")
+    parser.add_argument("--dir", default=os.environ.get("CASE_DIR") or DEFAULT_CASE_DIR)
+    parser.add_argument("--default", help="case played when none is chosen")
+    args = parser.parse_args()
+    built = build_index(args.dir, args.default)
+    print(f"indexed {len(built['cases'])} case(s) in {args.dir} (default: {built['default']})")
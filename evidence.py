@@ -0,0 +1,284 @@
+"""
+Local evidence scoring for the automated investigator.
+
+An EvidenceBoard reads the interrogation transcripts and keeps running scores
+for every suspect, weapon and motive: self-incriminating answers, one suspect
+placing another at the crime scene around the time of death, a suspect whose
+alibi another suspect contradicts, and mentions of each weapon and motive in
+the context of the crime. Transcripts are ingested incrementally (only
+exchanges not seen before are tokenized), so updating after every turn costs
+O(new text). Scores are turned into likelihoods with a uniform prior, and the
+board says when the leading hypothesis is confident enough to stop asking.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from leak_detector import CRIME_TERMS, TIME_RE, split_sentences, stem, tokenize
+
+# Words that place someone at the scene or link them to the crime
+SCENE_VERBS = {"saw", "seen", "rush", "run", "argu", "argument", "fight", "shout", "help", "hide", "hid"}
+
+# Words of a first-person alibi ("I was in the basement")
+ALIBI_TERMS = {"bedroom", "basement", "kitchen", "garden", "laundry", "left", "home", "upstairs", "downstairs"}
+
+MOTIVE_TERMS: Dict[str, List[str]] = {
+    "inheritance": ["inheritance", "inherit", "estate", "fortune", "heir", "heiress"],
+    "jealousy": ["jealousy", "jealous", "envy", "envious"],
+    "revenge": ["revenge", "grudge", "avenge", "vengeance"],
+    "blackmail": ["blackmail", "blackmailed", "extort", "threatened"],
+    "affair": ["affair", "lover", "cheating", "romance"],
+}
+
+# Minutes either side of the time of death that count as "at the time of the murder"
+NEAR_DEATH_MINUTES = 20
+
+# Negation cues, as tokenize() leaves them ("wasn't" -> "wasnt")
+NEGATIONS: Set[str] = {
+    "not", "never", "no", "nowhere", "nobody", "wasnt", "werent", "isnt", "arent", "didnt", "dont",
+    "doesnt", "hasnt", "havent", "hadnt", "couldnt", "wouldnt", "cant", "wont",
+}
+
+
+def _minutes(clock: str) -> int:
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def negated(words: List[str], is_target: Callable[[str], bool]) -> bool:
+    """
+    Whether a negation cue comes before the first target word (or anywhere,
+    if there is none): "I was not in the library" denies the place.
+
+    >>> negated(tokenize("I was not in the library at 23:15."), lambda w: w == "library")
+    True
+    >>> negated(tokenize("No, I was in the library, not the study."), lambda w: w == "library")
+    False
+    """
+    for position, word in enumerate(words):
+        if is_target(word):
+            return False
+        # A leading "No," answers the question rather than negating the claim
+        if word in NEGATIONS and not (word == "no" and position == 0):
+            return True
+    return False
+
+
+def likelihoods(scores: Dict[str, float], prior: float = 0.5) -> Dict[str, float]:
+    """Normalize evidence scores into probabilities, with `prior` pseudo-evidence per option."""
+    total = sum(scores.values()) + prior * len(scores)
+    return {key: (prior + value) / total for key, value in scores.items()} if total else {}
+
+
+def name_tokens(suspect_names: Dict[str, str], place_names: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    Stemmed name tokens -> suspect id ("lydia" -> s1). Tokens shared by
+    several names, or with a place ("Blackwood Mansion"), do not identify anyone.
+    """
+    places = {t for place in place_names for t in tokenize(place)}
+    counts: Dict[str, int] = {}
+    for name in suspect_names.values():
+        for token in set(tokenize(name)):
+            counts[token] = counts.get(token, 0) + 1
+    return {
+        token: sid for sid, name in suspect_names.items() for token in tokenize(name)
+        if len(token) > 2 and counts[token] == 1 and token not in places
+    }
+
+
+@dataclass
+class Hypothesis:
+    """Most likely (suspect, weapon, motive) and how confident the board is in each part."""
+    suspect_id: str
+    weapon: str
+    motive: str
+    suspect_p: float
+    weapon_p: float
+    motive_p: float
+    # Some part was a tie the evidence did not break (e.g. nothing heard yet)
+    guessed: bool = False
+
+    @property
+    def confidence(self) -> float:
+        return min(self.suspect_p, self.weapon_p, self.motive_p)
+
+
+class EvidenceBoard:
+    """Incremental suspect/weapon/motive scores over the conversation logs."""
+
+    def __init__(self, suspect_names: Dict[str, str], weapons: List[str], motives: List[str],
+                 scene: str, time_of_death: str, place_names: Iterable[str] = (),
+                 motive_terms: Optional[Dict[str, List[str]]] = None):
+        self.scene_tokens: Set[str] = set(tokenize(scene))
+        self.name_tokens = name_tokens(suspect_names, list(place_names) + [scene])
+        self.names = suspect_names
+
+        # The head noun of a weapon ("candlestick") identifies it
+        self.weapon_tokens: Dict[str, str] = {tokenize(w)[-1]: w for w in weapons if tokenize(w)}
+        terms = motive_terms or MOTIVE_TERMS
+        self.motive_tokens: Dict[str, str] = {
+            stem(term): motive for motive in motives for term in terms.get(motive, [motive])
+        }
+
+        self.crime_tokens = {stem(t) for t in CRIME_TERMS}
+        self.scene_verbs = {stem(t) for t in SCENE_VERBS}
+        self.alibi_tokens = {stem(t) for t in ALIBI_TERMS}
+        self.time_of_death = _minutes(time_of_death)
+
+        self.suspects: Dict[str, float] = {sid: 0.0 for sid in suspect_names}
+        self.weapons: Dict[str, float] = {w: 0.0 for w in weapons}
+        self.motives: Dict[str, float] = {m: 0.0 for m in motives}
+        self.notes: List[str] = []
+
+        # Exchanges already ingested per suspect
+        self.seen: Dict[str, int] = {sid: 0 for sid in suspect_names}
+        # Suspects claiming to have been elsewhere, and who placed whom at the scene
+        self.alibis: Set[str] = set()
+        self.placed_by: Dict[str, Set[str]] = {sid: set() for sid in suspect_names}
+        self._contradictions: Set[Tuple[str, str]] = set()
+
+    @classmethod
+    def from_case(cls, case_file: Dict[str, Any], suspects: Dict[str, Any], weapons: List[str],
+                  motives: List[str], **kwargs) -> "EvidenceBoard":
+        """Build a board from a CASE_FILE-shaped dict and its suspect profiles."""
+        victim = case_file["victim"]
+        return cls(
+            suspect_names={sid: profile.name for sid, profile in suspects.items()},
+            weapons=weapons,
+            motives=motives,
+            # "Library of Blackwood Mansion" -> "Library"
+            scene=victim["location"].split(" of ")[0],
+            place_names=[victim["location"]],
+            time_of_death=victim["time_of_death"],
+            **kwargs,
+        )
+
+    # ------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------
+
+    def update(self, conversation_logs: Dict[str, List[Tuple[str, str]]]):
+        """Ingest exchanges added to the logs since the last update."""
+        for sid, log in conversation_logs.items():
+            if sid not in self.seen:
+                continue
+            new = log[self.seen[sid]:]
+            self.seen[sid] += len(new)
+            for _, answer in new:
+                self.add_answer(sid, answer)
+
+    def add_answer(self, speaker: str, answer: str):
+        for sentence in split_sentences(answer):
+            self._add_sentence(speaker, sentence, tokenize(sentence))
+
+    def _near_death(self, sentence: str) -> bool:
+        return any(abs(_minutes(t) - self.time_of_death) <= NEAR_DEATH_MINUTES for t in TIME_RE.findall(sentence))
+
+    def _add_sentence(self, speaker: str, sentence: str, words: List[str]):
+        tokens = set(words)
+        crime = bool(tokens & self.crime_tokens)
+        at_scene = ((bool(tokens & self.scene_tokens) or self._near_death(sentence))
+                    and not negated(words, lambda w: w in self.scene_tokens or ":" in w))
+        linked = crime or at_scene or bool(tokens & self.scene_verbs)
+        named = {self.name_tokens[t] for t in tokens if t in self.name_tokens} - {speaker}
+        first_person = "i" in tokens
+
+        for sid in named:
+            if not linked:
+                continue
+            self.suspects[sid] += 1 + crime + at_scene
+            self.notes.append(f"{self.names[speaker]} links {self.names[sid]} to the crime: {sentence.strip()}")
+            if at_scene:
+                self.placed_by[sid].add(speaker)
+                self._check_alibi(sid)
+
+        if first_person:
+            if crime:
+                # A confession, or helping someone named in the same breath
+                self.suspects[speaker] += 1 if named else 3
+                self.notes.append(f"{self.names[speaker]} incriminates themselves: {sentence.strip()}")
+            if at_scene and not named:
+                self.suspects[speaker] += 1
+            elif tokens & self.alibi_tokens and not at_scene and speaker not in self.alibis:
+                self.alibis.add(speaker)
+                self._check_alibi(speaker)
+
+        weight = 1 + 2 * (crime or at_scene)
+        for token in tokens:
+            if token in self.weapon_tokens:
+                self.weapons[self.weapon_tokens[token]] += weight
+            if token in self.motive_tokens:
+                self.motives[self.motive_tokens[token]] += weight
+
+    def _check_alibi(self, sid: str):
+        """A suspect whose alibi another suspect contradicts gains evidence once per witness."""
+        if sid not in self.alibis:
+            return
+        for witness in self.placed_by[sid]:
+            self.add_contradiction(sid, witness)
+
+    def add_contradiction(self, sid: str, witness: str):
+        """Evidence against `sid` from someone (possibly sid itself) contradicting their account, once per pair."""
+        if (sid, witness) in self._contradictions:
+            return
+        self._contradictions.add((sid, witness))
+        self.suspects[sid] += 2
+        if witness == sid:
+            self.notes.append(f"{self.names[sid]} contradicts their own account")
+        else:
+            self.notes.append(f"{self.names[witness]} contradicts {self.names[sid]}'s alibi")
+
+    @property
+    def contradictions(self) -> Set[Tuple[str, str]]:
+        """(suspect id, witness id) pairs where the witness placed the suspect at the scene despite their alibi."""
+        return set(self._contradictions)
+
+    def evidence_value(self, speaker: str, sentence: str) -> float:
+        """
+        How much a sentence tells about the crime: times, places, weapons,
+        motives and other suspects it mentions, crime vocabulary, and whether it
+        is one side of a contradicted alibi. 0 for small talk.
+        """
+        tokens = set(tokenize(sentence))
+        named = {self.name_tokens[t] for t in tokens if t in self.name_tokens} - {speaker}
+        at_scene = bool(tokens & self.scene_tokens) or self._near_death(sentence)
+        value = (
+            len(TIME_RE.findall(sentence))
+            + at_scene
+            + bool(tokens & self.alibi_tokens)
+            + 2 * any(t in self.weapon_tokens for t in tokens)
+            + 2 * any(t in self.motive_tokens for t in tokens)
+            + 2 * len(named)
+            + bool(tokens & self.crime_tokens)
+        )
+        if value and any(speaker in pair or pair[0] in named for pair in self._contradictions):
+            value += 3
+        return float(value)
+
+    # ------------------------------------------------------------
+    # Decision
+    # ------------------------------------------------------------
+
+    def best(self, rng: Optional[random.Random] = None) -> Hypothesis:
+        """
+        The most likely hypothesis. Ties are broken with `rng` (the earliest
+        listed option without one) and flag the hypothesis as guessed, so a
+        guess is never taken for a deduction.
+        """
+        parts = []
+        guessed = False
+        for scores in (self.suspects, self.weapons, self.motives):
+            probs = likelihoods(scores)
+            top_p = max(probs.values())
+            tied = [key for key, p in probs.items() if p == top_p]
+            guessed = guessed or len(tied) > 1
+            parts.append((rng.choice(tied) if rng is not None else tied[0], top_p))
+        (sid, sp), (weapon, wp), (motive, mp) = parts
+        return Hypothesis(sid, weapon, motive, sp, wp, mp, guessed)
+
+    def sufficient(self, confidence: float, heard: Iterable[str] = ()) -> bool:
+        """True once every suspect in `heard` answered and each part of best() reaches `confidence`."""
+        if any(self.seen.get(sid, 0) == 0 for sid in heard):
+            return False
+        return self.best().confidence >= confidence
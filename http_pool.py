@@ -0,0 +1,263 @@
+"""
+Shared, connection-pooled HTTP clients for the LLM backend.
+
+By default every agno model creates its own SDK client, and therefore its own
+connection pool and TLS handshakes. PooledGroq models instead draw their HTTP
+client from one process-wide HttpClientPool, so keep-alive connections are
+reused by every agent in every game session.
+
+Configuration (environment variables):
+    LLM_POOL_MAX_CONNECTIONS   maximum open connections (default 64)
+    LLM_POOL_MAX_KEEPALIVE     idle connections kept alive (default 32)
+    LLM_POOL_KEEPALIVE_EXPIRY  seconds an idle connection is kept (default 30)
+    LLM_POOL_HTTP2             "1" to use HTTP/2 when the h2 package is installed (default 1)
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from agno.models.groq import Groq
+from groq import AsyncGroq as AsyncGroqClient
+from groq import Groq as GroqClient
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# ============================================================
+# POOL METRICS
+# ============================================================
+
+class PoolStats:
+    """Counters updated from httpcore trace events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+
+    def request_started(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def trace(self, event: str, info: Dict[str, Any]):
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    async def atrace(self, event: str, info: Dict[str, Any]):
+        self.trace(event, info)
+
+
+class _CountingResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, stats: PoolStats):
+        self._stream = stream
+        self._stats = stats
+        self._closed = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._stats.request_finished()
+        self._stream.close()
+
+
+class _AsyncCountingResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, stats: PoolStats):
+        self._stream = stream
+        self._stats = stats
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            self._stats.request_finished()
+        await self._stream.aclose()
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """HTTP transport that reports requests and new connections to PoolStats."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = self._stats.trace
+        self._stats.request_started()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            self._stats.request_finished()
+            raise
+        # A request is in flight until its (possibly streamed) body is closed.
+        response.stream = _CountingResponseStream(response.stream, self._stats)
+        return response
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, stats: PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = self._stats.atrace
+        self._stats.request_started()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self._stats.request_finished()
+            raise
+        response.stream = _AsyncCountingResponseStream(response.stream, self._stats)
+        return response
+
+
+# ============================================================
+# CLIENT POOL
+# ============================================================
+
+class HttpClientPool:
+    """
+    One keep-alive httpx.Client for the process and one httpx.AsyncClient per
+    event loop (async connections cannot be shared between loops).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 60.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.timeout = timeout
+        self.stats = PoolStats()
+
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @classmethod
+    def from_env(cls) -> "HttpClientPool":
+        return cls(
+            max_connections=int(os.environ.get("LLM_POOL_MAX_CONNECTIONS", "64")),
+            max_keepalive_connections=int(os.environ.get("LLM_POOL_MAX_KEEPALIVE", "32")),
+            keepalive_expiry=float(os.environ.get("LLM_POOL_KEEPALIVE_EXPIRY", "30")),
+            http2=os.environ.get("LLM_POOL_HTTP2", "1") == "1",
+        )
+
+    def sync_client(self) -> httpx.Client:
+        if self._sync_client is None or self._sync_client.is_closed:
+            with self._lock:
+                if self._sync_client is None or self._sync_client.is_closed:
+                    transport = _CountingTransport(self.stats, limits=self.limits, http2=self.http2)
+                    self._sync_client = httpx.Client(transport=transport, timeout=self.timeout)
+        return self._sync_client
+
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            transport = _AsyncCountingTransport(self.stats, limits=self.limits, http2=self.http2)
+            client = self._async_clients[loop] = httpx.AsyncClient(transport=transport, timeout=self.timeout)
+        return client
+
+    def _open_connections(self, client: Optional[Any]) -> list:
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool utilization snapshot."""
+        connections = self._open_connections(self._sync_client)
+        for client in list(self._async_clients.values()):
+            connections.extend(self._open_connections(client))
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "max_connections": self.limits.max_connections,
+            "http2": self.http2,
+            "requests": self.stats.requests,
+            "in_flight": self.stats.in_flight,
+            "peak_in_flight": self.stats.peak_in_flight,
+            "connections_opened": self.stats.connections_opened,
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "utilization": (len(connections) - idle) / self.limits.max_connections,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+
+LLM_HTTP_POOL = HttpClientPool.from_env()
+
+
+# ============================================================
+# POOLED MODELS
+# ============================================================
+
+class PooledClientMixin:
+    """
+    get_client()/get_async_client() for agno models built on an OpenAI-style
+    SDK: the SDK client is rebuilt on top of the shared pool's httpx client
+    whenever that client changes (e.g. a different event loop).
+    """
+
+    sdk_client_class: Any = None
+    sdk_async_client_class: Any = None
+
+    def _pool(self) -> HttpClientPool:
+        return self.pool or LLM_HTTP_POOL
+
+    def get_client(self):
+        http_client = self._pool().sync_client()
+        if self.client is None or self.client.is_closed() or self.client._client is not http_client:
+            self.client = self.sdk_client_class(**self._get_client_params(), http_client=http_client)
+        return self.client
+
+    def get_async_client(self):
+        http_client = self._pool().async_client()
+        if (self.async_client is None or self.async_client.is_closed()
+                or self.async_client._client is not http_client):
+            self.async_client = self.sdk_async_client_class(**self._get_client_params(), http_client=http_client)
+        return self.async_client
+
+
+@dataclass
+class PooledGroq(PooledClientMixin, Groq):
+    """Groq model whose SDK clients share the process-wide HTTP connection pool."""
+
+    sdk_client_class = GroqClient
+    sdk_async_client_class = AsyncGroqClient
+
+    pool: Optional[HttpClientPool] = None
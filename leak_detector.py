@@ -0,0 +1,239 @@
+"""
+Local redline leak detector.
+
+A cheap, deterministic pre-filter that decides whether a raw suspect answer
+needs to go through the critique agent at all. All redlines are compiled once
+into an inverted index of stemmed tokens, so classifying an answer costs a
+single pass over its tokens.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# ============================================================
+# TEXT NORMALIZATION
+# ============================================================
+
+TOKEN_RE = re.compile(r"\d{1,2}:\d{2}|[a-z0-9']+")
+TIME_RE = re.compile(r"\b\d{1,2}:\d{2}\b")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+# Words that never carry a leak on their own.
+STOPWORDS: Set[str] = {
+    "the", "a", "an", "at", "in", "on", "to", "of", "and", "is", "was", "were",
+    "with", "for", "after", "by", "he", "him", "his", "she", "her", "it",
+    "know", "sure", "definitely", "that", "this", "am", "be", "been",
+}
+
+# Pronouns and names make a redline specific, but match far too many innocent
+# answers to count as evidence of a leak by themselves.
+WEAK_TOKENS: Set[str] = {"i", "me", "my", "we", "you", "they"}
+
+# Crime vocabulary: any sentence using it may be a leak, however it names the culprit.
+CRIME_TERMS: Set[str] = {
+    "kill", "murder", "culprit", "hit", "struck", "strike", "weapon", "hid",
+    "hide", "bludgeon", "confess", "blood", "bash", "guilty",
+}
+
+# How a killing is described without the case's own words ("I smashed his skull").
+# Inflected forms are listed where stemming would not reach them ("stabbed").
+VIOLENT_TERMS: Set[str] = {
+    "poison", "stab", "stabbed", "smash", "strangle", "shoot", "shot", "club", "clubbed",
+    "crush", "choke", "slash", "attack", "smother", "drown", "skull", "wound", "knock",
+    "knocked", "bludgeoned", "throttle", "suffocate", "slit",
+}
+
+# Confessions that carry no crime word of their own ("I did it", "It was me")
+CONFESSION_RE = re.compile(r"\b(i did it|it was me|it was i|i confess|i'?m guilty|i am guilty)\b", re.IGNORECASE)
+
+SUFFIXES = ("ings", "ing", "ers", "er", "ed", "es", "s")
+
+
+def stem(token: str) -> str:
+    """Strip common English suffixes so 'killed', 'killer' and 'kills' match."""
+    if ":" in token:
+        # "09:30" and "9:30" are the same time
+        return token[1:] if token.startswith("0") and len(token) == 5 else token
+    token = token.replace("'", "")
+    # Strip repeatedly so "murdered" and "murder" end up on the same stem.
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                token = token[: -len(suffix)]
+                stripped = True
+                break
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, tokenize, drop stopwords and stem a piece of text."""
+    return [stem(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in SENTENCE_SPLIT_RE.split(text) if s.strip()]
+
+
+# ============================================================
+# DETECTOR
+# ============================================================
+
+@dataclass
+class LeakVerdict:
+    """Result of classifying one answer."""
+    label: str  # "safe", "uncertain", "unsafe"
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def safe(self) -> bool:
+        return self.label == "safe"
+
+
+class LeakDetector:
+    """Compiled index over all case and suspect redlines."""
+
+    def __init__(
+        self,
+        redlines: Iterable[str],
+        culprit_names: Iterable[str] = (),
+        method: str = "",
+        timestamps: Iterable[str] = (),
+        partial_threshold: float = 0.5,
+        culprit_id: Optional[str] = None,
+        scene: str = "",
+        weapons: Iterable[str] = (),
+        place_names: Iterable[str] = (),
+    ):
+        self.partial_threshold = partial_threshold
+
+        # Inverted index: stemmed anchor token -> ids of redlines containing it
+        self.redlines: List[str] = []
+        self.redline_anchors: List[Set[str]] = []
+        self.redline_weak: List[Set[str]] = []
+        self.index: Dict[str, List[int]] = {}
+        for phrase in dict.fromkeys(redlines):
+            tokens = tokenize(phrase)
+            anchors = {t for t in tokens if t not in WEAK_TOKENS}
+            if not anchors:
+                continue
+            rid = len(self.redlines)
+            self.redlines.append(phrase)
+            self.redline_anchors.append(anchors)
+            self.redline_weak.append({t for t in tokens if t in WEAK_TOKENS})
+            for token in anchors:
+                self.index.setdefault(token, []).append(rid)
+
+        self.culprit_id = culprit_id
+        self.culprit_tokens: Set[str] = {
+            t for name in culprit_names for t in tokenize(name) if len(t) > 2
+        }
+        # Name words that are also place names ("Blackwood Mansion") don't name the culprit
+        place_tokens = {t for place in [scene, *place_names] for t in tokenize(place)}
+        self.culprit_name_tokens: Set[str] = self.culprit_tokens - place_tokens
+        self.crime_tokens: Set[str] = {stem(t) for t in CRIME_TERMS}
+        self.violent_tokens: Set[str] = {stem(t) for t in VIOLENT_TERMS}
+        method_tokens = tokenize(method)
+        # The head noun ("candlestick") is distinctive; adjectives are not.
+        self.method_tokens: Set[str] = set(method_tokens[-1:])
+        self.weapon_tokens: Set[str] = {t for weapon in weapons for t in tokenize(weapon)[-1:]} - self.method_tokens
+        self.scene_tokens: Set[str] = set(tokenize(scene))
+        self.timestamps: Set[str] = {stem(t) for t in timestamps}
+
+    @classmethod
+    def from_case(cls, case_file: Dict[str, Any], suspects: Dict[str, Any], weapons: Iterable[str] = (),
+                  **kwargs) -> "LeakDetector":
+        """Build a detector from a CASE_FILE-shaped dict, its suspect profiles and weapon choices."""
+        truth = case_file["truth"]
+        redlines = list(case_file.get("redlines", []))
+        for profile in suspects.values():
+            redlines.extend(profile.hard_redlines)
+
+        timestamps: Set[str] = set()
+        for entry in truth.get("timeline", []):
+            timestamps.update(TIME_RE.findall(entry))
+        for profile in suspects.values():
+            timestamps.update(TIME_RE.findall(profile.secret_info))
+
+        culprit = suspects.get(truth["culprit_id"])
+        location = case_file["victim"].get("location", "")
+        return cls(
+            redlines=redlines,
+            culprit_names=[culprit.name] if culprit else [],
+            method=truth.get("method", ""),
+            timestamps=timestamps,
+            culprit_id=truth["culprit_id"],
+            # "Library of Blackwood Mansion": the room, then the house
+            scene=location.split(" of ")[0],
+            weapons=weapons,
+            place_names=[location, case_file.get("setting", "")],
+            **kwargs,
+        )
+
+    def classify(self, text: str, speaker_id: Optional[str] = None) -> LeakVerdict:
+        """
+        Classify a raw answer as safe, uncertain or unsafe. `speaker_id` is the
+        suspect answering; naming the culprit is only harmless from the culprit.
+
+        >>> detector = LeakDetector([], culprit_names=["Lydia Blackwood"], method="brass candlestick",
+        ...                         culprit_id="s1", scene="Library", weapons=["rope"])
+        >>> [detector.classify(answer, "s2").label for answer in [
+        ...     "Lydia is the one you want.", "I poisoned him.", "I was in the library that night.",
+        ...     "I smashed his skull with the heavy brass thing.", "The rope was in the shed."]]
+        ['uncertain', 'uncertain', 'uncertain', 'uncertain', 'uncertain']
+        >>> detector.classify("I was reading in my bedroom.", "s2").label
+        'safe'
+        """
+        if not text or not text.strip():
+            return LeakVerdict("safe")
+
+        reasons: List[str] = []
+        label = "safe"
+        for sentence in split_sentences(text):
+            tokens = set(tokenize(sentence))
+
+            hits: Dict[int, int] = {}
+            for token in tokens:
+                for rid in self.index.get(token, ()):
+                    hits[rid] = hits.get(rid, 0) + 1
+            for rid, count in hits.items():
+                anchors = self.redline_anchors[rid]
+                if count == len(anchors) and self.redline_weak[rid] <= tokens:
+                    return LeakVerdict("unsafe", reasons + [f"redline: {self.redlines[rid]}"])
+                # One hit is enough when it is crime vocabulary ("I murdered him")
+                if count / len(anchors) >= self.partial_threshold and (
+                        count >= 2 or anchors & tokens & self.crime_tokens):
+                    label = "uncertain"
+                    reasons.append(f"partial redline: {self.redlines[rid]}")
+
+            if tokens & self.method_tokens:
+                label = "uncertain"
+                reasons.append("mentions the murder weapon")
+            if tokens & self.timestamps:
+                label = "uncertain"
+                reasons.append("mentions a timeline timestamp")
+            if tokens & self.crime_tokens:
+                label = "uncertain"
+                if tokens & self.culprit_tokens:
+                    reasons.append("links the culprit to the crime")
+                else:
+                    reasons.append("uses crime vocabulary")
+            if tokens & self.violent_tokens:
+                label = "uncertain"
+                reasons.append("describes violence")
+            if tokens & self.weapon_tokens:
+                label = "uncertain"
+                reasons.append("mentions a weapon")
+            if tokens & self.scene_tokens:
+                label = "uncertain"
+                reasons.append("mentions the crime scene")
+            if tokens & self.culprit_name_tokens and (speaker_id is None or speaker_id != self.culprit_id):
+                label = "uncertain"
+                reasons.append("names the culprit")
+            if CONFESSION_RE.search(sentence):
+                label = "uncertain"
+                reasons.append("sounds like a confession")
+
+        return LeakVerdict(label, reasons)
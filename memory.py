@@ -0,0 +1,118 @@
+"""
+Bounded conversation memory for suspect agents.
+
+Suspects are stateless; the game replays their conversation on every turn,
+so without a bound the prompt grows with every question. A MemoryPolicy keeps
+the last N exchanges verbatim and folds older ones, a few at a time, into a
+running summary. Summaries are produced on a background thread after a turn
+completes, so no turn waits for one: until a fold finishes, the exchanges it
+covers are still replayed verbatim.
+
+Configuration (environment variables):
+    SUSPECT_MEMORY_EXCHANGES  exchanges replayed verbatim (default 4, 0 = whole conversation)
+    SUSPECT_MEMORY_SUMMARY    "1" to summarize older exchanges, "0" to drop them (default 1)
+    SUSPECT_MEMORY_BATCH      exchanges folded into the summary at once (default 2)
+    SUSPECT_MEMORY_WORKERS    background summarization threads (default 4)
+"""
+
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+Exchange = Tuple[str, str]
+
+# (previous summary, exchanges to fold in) -> new summary
+Summarizer = Callable[[str, List[Exchange]], str]
+
+
+@dataclass
+class MemoryPolicy:
+    """How much of a suspect's conversation is replayed to it."""
+
+    max_exchanges: int = 4
+    summarize: bool = True
+    # Fold once this many exchanges beyond max_exchanges have piled up, so a
+    # long game costs one summary call per batch rather than per turn.
+    batch: int = 2
+
+    @classmethod
+    def from_env(cls) -> "MemoryPolicy":
+        return cls(
+            max_exchanges=int(os.environ.get("SUSPECT_MEMORY_EXCHANGES", "4")),
+            summarize=os.environ.get("SUSPECT_MEMORY_SUMMARY", "1") == "1",
+            batch=int(os.environ.get("SUSPECT_MEMORY_BATCH", "2")),
+        )
+
+
+MEMORY_POLICY = MemoryPolicy.from_env()
+
+SUMMARY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SUSPECT_MEMORY_WORKERS", "4")),
+    thread_name_prefix="suspect-memory",
+)
+
+
+class ConversationMemory:
+    """Bounded view of one suspect's conversation log."""
+
+    def __init__(self, policy: MemoryPolicy, summarizer: Optional[Summarizer] = None,
+                 executor: Executor = SUMMARY_EXECUTOR):
+        self.policy = policy
+        self.summarizer = summarizer
+        self.executor = executor
+
+        self.summary = ""
+        # Index of the first logged exchange not yet folded into the summary
+        self.start = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._pending: Optional[Future] = None
+
+    def window(self, log: List[Exchange]) -> Tuple[str, List[Exchange]]:
+        """Return (summary, exchanges to replay verbatim) for a conversation log."""
+        with self._lock:
+            return self.summary, log[self.start:]
+
+    def snapshot(self) -> Tuple[str, int]:
+        """(summary, first exchange not folded into it), for saving a session."""
+        with self._lock:
+            return self.summary, self.start
+
+    def restore(self, summary: str, start: int):
+        with self._lock:
+            self.summary, self.start = summary, start
+
+    def update(self, log: List[Exchange]):
+        """Call after an exchange is logged; folds exchanges that left the window."""
+        if self.policy.max_exchanges <= 0:
+            return
+        with self._lock:
+            end = len(log) - self.policy.max_exchanges
+            if end - self.start < max(1, self.policy.batch) or self._pending is not None:
+                return
+            if not self.policy.summarize or self.summarizer is None:
+                self.start = end
+                return
+            self._pending = self.executor.submit(self._fold, self.summary, log[self.start:end], end)
+
+    def _fold(self, previous: str, exchanges: List[Exchange], end: int):
+        try:
+            summary = self.summarizer(previous, exchanges)
+        except Exception:
+            # Keep the exchanges verbatim; the next update() retries the fold.
+            summary = None
+        with self._lock:
+            self._pending = None
+            if summary:
+                self.summary = summary.strip()
+                self.start = end
+            else:
+                self.failures += 1
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a pending summary (if any) is done."""
+        pending = self._pending
+        if pending is not None:
+            pending.result(timeout)
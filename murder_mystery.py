@@ -5,12 +5,36 @@ Multi-Agent Adversarial Interrogation Game
 A detective game where AI suspects actively try to hide the truth.
 """
 
+import asyncio
+import functools
 import os
-from dataclasses import dataclass, field
-from typing import Dict, Any, List, Tuple
+import re
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple, Union
 
 from agno.agent import Agent
-from agno.models.groq import Groq
+from agno.models.message import Message
+from agno.run.agent import RunEvent, RunOutput
+
+from backends import make_model, requires_groq_key
+from cases import CASE_CATALOG, Case, CaseCatalog, SuspectProfile
+from evidence import EvidenceBoard
+from leak_detector import LeakDetector
+from memory import MEMORY_POLICY, ConversationMemory, MemoryPolicy
+from response_cache import RESPONSE_CACHE, ResponseCache, cache_key
+from semantic_cache import SemanticQuestionCache
+from session_store import SESSION_STORE, SessionStore
+from telemetry import TELEMETRY, Span, Telemetry, timed
+from timeline import Timeline
+from transcript import Exchange, Transcript
+from transcript_packer import JUDGE_TRANSCRIPT_TOKENS, pack_transcript
 
 
 # ============================================================
@@ -20,139 +44,49 @@ from agno.models.groq import Groq
 GROQ_MODEL_ID = "llama-3.3-70b-versatile" 
 EVALUATOR_MODEL_ID = "llama-3.1-8b-instant"
 
+# Maximum number of in-flight Groq requests shared by all async game sessions
+GROQ_MAX_CONCURRENCY = int(os.environ.get("GROQ_MAX_CONCURRENCY", "32"))
 
-# ============================================================
-# DATA STRUCTURES
-# ============================================================
+# A sentence ends at terminal punctuation (optionally followed by closing
+# quotes/brackets) and whitespace. Used to chunk streamed suspect output.
+SENTENCE_END_RE = re.compile(r"[.!?…]+[\"')\]]*\s+")
 
-@dataclass
-class SuspectProfile:
-    id: str
-    name: str
-    persona: str
-    public_info: str
-    secret_info: str
-    role: str  # "killer", "accomplice", "innocent"
-    hard_redlines: List[str] = field(default_factory=list)
+# Speculative critique: screen the suspect's answer sentence by sentence while
+# it is generated, critique flagged sentences concurrently and stop generation
+# at the first full redline.
+SPECULATIVE_CRITIQUE = os.environ.get("SPECULATIVE_CRITIQUE", "0") == "1"
+SPECULATIVE_CRITIQUE_WORKERS = int(os.environ.get("SPECULATIVE_CRITIQUE_WORKERS", "8"))
 
+# Threads answering interrogate_many() fan-outs (shared by all sync sessions)
+FANOUT_WORKERS = int(os.environ.get("FANOUT_WORKERS", "16"))
 
-# ============================================================
-# CASE FILE
-# ============================================================
-
-CASE_FILE: Dict[str, Any] = {
-    "case_id": "mansion_murder_01",
-    "victim": {
-        "name": "Victor Hale",
-        "time_of_death": "23:15",
-        "location": "Library of Blackwood Mansion",
-        "cause": "blunt force trauma to the head",
-    },
-    "truth": {
-        "culprit_id": "s1",
-        "method": "brass candlestick",
-        "motive": "inheritance",
-        "timeline": [
-            "22:30 - Victor seen arguing with Lydia (s1) in the study.",
-            "23:00 - Neighbors heard shouting.",
-            "23:15 - Victor killed in the library.",
-        ],
-    },
-    "redlines": [
-        "Lydia killed Victor",
-        "Lydia is the killer",
-        "The culprit is Lydia Blackwood",
-        "He was killed with a brass candlestick",
-    ],
-}
-
-VALID_WEAPONS: List[str] = [
-    "brass candlestick",
-    "letter opener",
-    "fireplace poker",
-    "poison",
-    "rope",
-]
-
-VALID_MOTIVES: List[str] = [
-    "inheritance",
-    "jealousy",
-    "revenge",
-    "blackmail",
-    "affair",
-]
+# Threads writing the judge's case summaries after accusations
+NARRATIVE_WORKERS = int(os.environ.get("NARRATIVE_WORKERS", "8"))
 
 
 # ============================================================
-# SUSPECTS
+# CASE FILE
 # ============================================================
 
-SUSPECTS: Dict[str, SuspectProfile] = {
-    "s1": SuspectProfile(
-        id="s1",
-        name="Lydia Blackwood",
-        role="killer",
-        persona=(
-            "You are Lydia Blackwood, an elegant, composed heiress. "
-            "You are evasive, controlled, and you dislike being challenged."
-        ),
-        public_info=(
-            "You claim you were in your bedroom reading a novel when the murder occurred."
-        ),
-        secret_info=(
-            "You killed Victor in the library at 23:15 using a brass candlestick "
-            "after a heated argument about the inheritance."
-        ),
-        hard_redlines=[
-            "I killed Victor",
-            "I murdered Victor",
-            "I am the killer",
-            "I hit Victor with the candlestick",
-            "I was in the library at 23:15",
-        ],
-    ),
-    "s2": SuspectProfile(
-        id="s2",
-        name="Dr. Marcus Vale",
-        role="accomplice",
-        persona=(
-            "You are Dr. Marcus Vale, the charming family doctor with a dry sense of humor. "
-            "You deflect uncomfortable questions with sarcasm or intellectual talk."
-        ),
-        public_info=(
-            "You say you left the mansion at 22:45 after a routine check-up."
-        ),
-        secret_info=(
-            "You helped Lydia hide the candlestick in the fireplace and coached her on a fake timeline."
-        ),
-        hard_redlines=[
-            "I helped Lydia after the murder",
-            "I hid the candlestick",
-            "I helped hide the weapon",
-        ],
-    ),
-    "s3": SuspectProfile(
-        id="s3",
-        name="Eleanor Wright",
-        role="innocent",
-        persona=(
-            "You are Eleanor Wright, the anxious but loyal housekeeper. "
-            "You speak softly, are easily flustered, and you worry about losing your job."
-        ),
-        public_info=(
-            "You say you were in the basement doing laundry during the incident."
-        ),
-        secret_info=(
-            "You saw Lydia rushing down from the library around 23:20, but you are too scared "
-            "to say it plainly."
-        ),
-        hard_redlines=[
-            "I saw Lydia kill Victor",
-            "I know for sure Lydia is the killer",
-            "Lydia was definitely in the library at 23:15",
-        ],
-    ),
-}
+# The case played when none is chosen; it stays parsed for the life of the
+# process. CASE_FILE, VALID_WEAPONS, VALID_MOTIVES and SUSPECTS are its data,
+# for callers that only know one case.
+DEFAULT_CASE: Case = CASE_CATALOG.pin()
+
+CASE_FILE: Dict[str, Any] = DEFAULT_CASE.case_file
+VALID_WEAPONS: List[str] = DEFAULT_CASE.weapons
+VALID_MOTIVES: List[str] = DEFAULT_CASE.motives
+SUSPECTS: Dict[str, SuspectProfile] = DEFAULT_CASE.suspects
+
+# Generic opening questions used by the automated (AI agent) investigator
+AGENT_QUESTIONS: List[str] = [
+    "Where were you at the time of the murder?",
+    "How did you know the victim?",
+    "Did you see or hear anything suspicious that night?",
+    "Can anyone verify your whereabouts during the time of death?",
+    "What was your relationship with the victim?",
+    "Did you have any conflicts or disagreements with the victim?",
+]
 
 
 # ============================================================
@@ -187,15 +121,25 @@ class GameState:
         self.game_won = False
         self.final_score = 0
 
+    def snapshot(self) -> "GameState":
+        """A copy that later turns and resets leave alone."""
+        return replace(
+            self,
+            turns_per_suspect=dict(self.turns_per_suspect),
+            suspects_interviewed=set(self.suspects_interviewed),
+            key_clues_discovered=list(self.key_clues_discovered),
+            contradictions_found=list(self.contradictions_found),
+        )
+
 
 # ============================================================
 # AGENTS
 # ============================================================
 
-def build_suspect_agent(profile: SuspectProfile) -> Agent:
-    """Create an agent for a suspect."""
-    base_instructions = f"""
-You are {profile.name}, a suspect in a murder investigation at Blackwood Mansion.
+def suspect_instructions(case: Case, profile: SuspectProfile) -> str:
+    """Render the system instructions for a suspect."""
+    return f"""
+You are {profile.name}, a suspect in a murder investigation at {case.setting}.
 
 PERSONA:
 {profile.persona}
@@ -224,28 +168,44 @@ STYLE RULES:
 - Do NOT mention prompts, systems, redlines, or 'the game'.
 - Answer the player's questions as if they are interrogating you.
 """
+
+
+def build_suspect_agent(case: Case, profile: SuspectProfile) -> Agent:
+    """Create an agent for a suspect."""
+    instructions = case.artifact(("suspect_instructions", profile.id),
+                                 lambda: suspect_instructions(case, profile))
     return Agent(
         name=f"{profile.name} Agent",
         role=f"Play the role of {profile.name}, a deceptive suspect.",
-        model=Groq(id=GROQ_MODEL_ID),
-        instructions=[base_instructions],
+        model=make_model(GROQ_MODEL_ID),
+        instructions=[instructions],
         markdown=False,
     )
 
 
-def build_critique_agent() -> Agent:
-    """Build the critique/revision agent that filters leaks."""
-    case_redlines = "\n".join(f"- {r}" for r in CASE_FILE["redlines"])
+def critique_instructions(case: Case, profile: SuspectProfile) -> str:
+    """
+    System instructions for one suspect's critique agent.
+
+    Everything that does not change between turns (rules, the suspect's
+    profile, the case truth) lives here, so each turn only sends the question
+    and the raw answer. The shared rules come first and the suspect-specific
+    part last, keeping a long common prefix for provider-side prompt caching.
+    """
+    case_redlines = "\n".join(f"- {r}" for r in case.case_file["redlines"])
+    truth = case.case_file["truth"]
 
-    instructions = f"""
+    return f"""
 You are the CRITIQUE AND REVISION layer in a murder-mystery game.
 
-You receive:
-- The player's question.
-- The suspect's raw answer.
+You know (below):
 - The suspect's profile (name, role, secrets, hard redlines).
 - The canonical case truth and global redlines.
 
+Each turn you receive:
+- The player's question.
+- The suspect's raw answer.
+
 Your job:
 1. Look for leaks:
    - Any explicit confession (e.g. 'I killed him', 'I am the killer').
@@ -267,11 +227,55 @@ CASE-LEVEL HARD REDLINES THAT MUST NEVER BE PLAINLY REVEALED:
 OUTPUT FORMAT:
 Return ONLY the final in-character answer text that the player will see.
 Do NOT add explanations, labels, or analysis.
+
+CASE TRUTH:
+- culprit_id: {truth["culprit_id"]}
+- method: {truth["method"]}
+- motive: {truth["motive"]}
+
+SUSPECT PROFILE:
+- id: {profile.id}
+- name: {profile.name}
+- role: {profile.role}
+- persona: {profile.persona}
+- public_info: {profile.public_info}
+- secret_info: {profile.secret_info}
+- hard_redlines: {profile.hard_redlines}
+"""
+
+
+def build_critique_agent(case: Case, profile: SuspectProfile) -> Agent:
+    """Build the critique/revision agent that filters one suspect's leaks."""
+    instructions = case.artifact(("critique_instructions", profile.id),
+                                 lambda: critique_instructions(case, profile))
+    return Agent(
+        name=f"{profile.name} Critique Agent",
+        role=f"Filter and revise {profile.name}'s answers to hide secrets.",
+        model=make_model(GROQ_MODEL_ID),
+        instructions=[instructions],
+        markdown=False,
+    )
+
+
+def build_memory_agent() -> Agent:
+    """Build the agent that folds old exchanges into a suspect's running summary."""
+    instructions = """
+You are the CONVERSATION MEMORY SUMMARIZER for a murder-mystery interrogation.
+
+You receive the current summary of earlier questioning (possibly empty) and
+the next exchanges between the detective and one suspect.
+
+Return an updated summary of at most 120 words, written in the first person
+from the suspect's point of view. Keep every concrete claim the suspect made
+(times, places, people, objects) and every denial, so later answers stay
+consistent. Drop greetings and filler.
+
+Return ONLY the summary text.
 """
     return Agent(
-        name="Critique Agent",
-        role="Filter and revise suspect answers to hide secrets.",
-        model=Groq(id=GROQ_MODEL_ID),
+        name="Memory Summarizer Agent",
+        role="Summarize earlier interrogation exchanges.",
+        model=make_model(EVALUATOR_MODEL_ID),
         instructions=[instructions],
         markdown=False,
     )
@@ -283,175 +287,812 @@ def build_accusation_agent() -> Agent:
 You are the CASE RESOLUTION JUDGE for a murder mystery game.
 
 When the player makes an accusation, you will receive:
-- The player's accusation (suspect, weapon, motive)
+- The player's accusation (suspect, weapon, motive) and which parts are correct
 - The true solution (culprit, method, motive)
-- The full conversation transcripts with all suspects
-- The player's game statistics (turns used, clues found, etc.)
+- The conversation transcripts with all suspects
+- The player's game statistics (turns used, suspects interviewed)
+- The contradictions and key clues the player uncovered
 
-Your job:
-1. Determine if each part of the accusation is CORRECT or INCORRECT:
-   - Suspect: Did they identify the right killer?
-   - Weapon: Did they identify the correct murder weapon?
-   - Motive: Did they identify the correct motive?
-
-2. Calculate a score (0-100):
-   - Correct suspect: +40 points
-   - Correct weapon: +30 points
-   - Correct motive: +30 points
-   - Bonus: +10 points if all three correct
-   - Efficiency bonus: Up to +10 points for solving quickly (fewer turns)
-   - Deduction: -2 points for each turn over 20
-
-3. Provide a CASE SUMMARY that:
+The verdict and the score have already been worked out and shown to the
+player. Your job is the CASE SUMMARY, which:
    - Reveals the full truth of what happened
    - Explains what clues the player found (or missed)
    - Highlights key moments from the interrogations
    - Gives specific feedback on their detective work
 
-4. Determine WIN/LOSE:
-   - WIN: Correct suspect (even if weapon/motive wrong)
-   - LOSE: Wrong suspect
-
 OUTPUT FORMAT:
-==============================================
-CASE RESOLUTION
-==============================================
-
-ACCUSATION ANALYSIS:
-- Suspect: [CORRECT/INCORRECT] - You accused [X], the killer was [Y]
-- Weapon: [CORRECT/INCORRECT] - You said [X], it was [Y]
-- Motive: [CORRECT/INCORRECT] - You said [X], it was [Y]
-
-VERDICT: [CASE SOLVED / CASE UNSOLVED]
-
-SCORE: [X]/100
-- Suspect: [+40/+0]
-- Weapon: [+30/+0]
-- Motive: [+30/+0]
-- Perfect solve bonus: [+10/+0]
-- Efficiency: [+X/-X]
-
 CASE SUMMARY:
 [2-3 paragraphs explaining what really happened,
 what clues were available, and how the player did]
-
-DETECTIVE RATING: [Novice/Amateur/Competent/Skilled/Master]
-==============================================
 """
     return Agent(
         name="Accusation Evaluation Agent",
-        role="Judge player accusations and provide case resolution.",
-        model=Groq(id=EVALUATOR_MODEL_ID),
+        role="Write the case summary after the player's accusation.",
+        model=make_model(EVALUATOR_MODEL_ID),
         instructions=[instructions],
         markdown=True,
     )
 
 
+class AgentFactory:
+    """
+    Process-wide cache of agents.
+
+    Agents hold no per-game state (conversation history is kept by the game
+    engine and sent with every request), so one agent and one critique agent
+    per suspect of a case, and one judge, can be shared by every game session.
+    Each is built the first time it is requested; later games just take
+    references. Suspect and critique agents are kept for the `max_cases` most
+    recently played cases.
+    """
+
+    def __init__(self, max_cases: int = CASE_CATALOG.max_cases):
+        self.max_cases = max_cases
+        self._lock = threading.Lock()
+        # case id -> ("suspect" | "critique", suspect id) -> agent
+        self._case_agents: "OrderedDict[str, Dict[Tuple[str, str], Agent]]" = OrderedDict()
+        self._accusation_agent: Optional[Agent] = None
+        self._memory_agent: Optional[Agent] = None
+
+    def _case_agent(self, case: Case, key: Tuple[str, str], build: Callable[[], Agent]) -> Agent:
+        with self._lock:
+            agents = self._case_agents.get(case.case_id)
+            if agents is None:
+                agents = self._case_agents[case.case_id] = {}
+                while len(self._case_agents) > self.max_cases:
+                    self._case_agents.popitem(last=False)
+            self._case_agents.move_to_end(case.case_id)
+            agent = agents.get(key)
+            if agent is None:
+                agent = agents[key] = build()
+        return agent
+
+    def suspect_agent(self, case: Case, profile: SuspectProfile) -> Agent:
+        return self._case_agent(case, ("suspect", profile.id), lambda: build_suspect_agent(case, profile))
+
+    def critique_agent(self, case: Case, profile: SuspectProfile) -> Agent:
+        return self._case_agent(case, ("critique", profile.id), lambda: build_critique_agent(case, profile))
+
+    def accusation_agent(self) -> Agent:
+        if self._accusation_agent is None:
+            with self._lock:
+                if self._accusation_agent is None:
+                    self._accusation_agent = build_accusation_agent()
+        return self._accusation_agent
+
+    def memory_agent(self) -> Agent:
+        if self._memory_agent is None:
+            with self._lock:
+                if self._memory_agent is None:
+                    self._memory_agent = build_memory_agent()
+        return self._memory_agent
+
+    def clear(self):
+        """Drop all cached agents (e.g. after changing model configuration)."""
+        with self._lock:
+            self._case_agents = OrderedDict()
+            self._accusation_agent = None
+            self._memory_agent = None
+
+
+AGENT_FACTORY = AgentFactory()
+
+
+# ============================================================
+# STREAMING HELPERS
+# ============================================================
+
+def response_text(resp: Any) -> str:
+    """Extract the text content from an agent run response."""
+    return resp.content if hasattr(resp, "content") else str(resp)
+
+
+def stream_agent_text(agent: Agent, prompt: Union[str, List[Message]],
+                      session_id: Optional[str] = None, span: Optional[Span] = None) -> Iterator[str]:
+    """
+    Run an agent in streaming mode and yield its content deltas (token usage goes to span).
+
+    Closing the generator early closes the run, which stops the model's generation.
+    """
+    run = agent.run(prompt, stream=True, session_id=session_id, yield_run_output=True)
+    try:
+        for event in run:
+            delta = _event_text(event, span)
+            if delta:
+                yield delta
+    finally:
+        run.close()
+
+
+async def astream_agent_text(agent: Agent, prompt: Union[str, List[Message]],
+                             session_id: Optional[str] = None, span: Optional[Span] = None) -> AsyncIterator[str]:
+    """Async variant of stream_agent_text()."""
+    run = agent.arun(prompt, stream=True, session_id=session_id, yield_run_output=True)
+    try:
+        async for event in run:
+            delta = _event_text(event, span)
+            if delta:
+                yield delta
+    finally:
+        await run.aclose()
+
+
+def _event_text(event: Any, span: Optional[Span]) -> Optional[str]:
+    """Content delta of a streamed run event; the final RunOutput's token usage goes to span."""
+    if isinstance(event, RunOutput):
+        if span is not None:
+            span.add_usage(event.metrics)
+        return None
+    if getattr(event, "event", None) != RunEvent.run_content.value:
+        return None
+    return event.content if isinstance(event.content, str) else None
+
+
+def take_sentences(buffer: str) -> Tuple[List[str], str]:
+    """Split the complete sentences off a text buffer; returns (sentences, remainder)."""
+    sentences = []
+    while True:
+        match = SENTENCE_END_RE.search(buffer)
+        if not match:
+            return sentences, buffer
+        sentences.append(buffer[:match.end()])
+        buffer = buffer[match.end():]
+
+
+def iter_sentences(deltas: Iterator[str]) -> Iterator[str]:
+    """Regroup a stream of token deltas into complete sentences."""
+    buffer = ""
+    for delta in deltas:
+        sentences, buffer = take_sentences(buffer + delta)
+        yield from sentences
+    if buffer.strip():
+        yield buffer
+
+
+async def aiter_sentences(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Async variant of iter_sentences()."""
+    buffer = ""
+    async for delta in deltas:
+        sentences, buffer = take_sentences(buffer + delta)
+        for sentence in sentences:
+            yield sentence
+    if buffer.strip():
+        yield buffer
+
+
+# ============================================================
+# ACCUSATION
+# ============================================================
+
+# (minimum score, detective rating)
+RATINGS: List[Tuple[int, str]] = [(95, "Master"), (80, "Skilled"), (60, "Competent"), (40, "Amateur"), (0, "Novice")]
+
+
+def score_parts(correct_suspect: bool, correct_weapon: bool, correct_motive: bool, turns: int) -> Dict[str, int]:
+    """Points for each part of an accusation; the score is their sum, clamped to 0-100."""
+    if turns <= 10:
+        efficiency = 10
+    elif turns <= 15:
+        efficiency = 5
+    elif turns > 20:
+        efficiency = -min(20, (turns - 20) * 2)
+    else:
+        efficiency = 0
+    return {
+        "Suspect": 40 if correct_suspect else 0,
+        "Weapon": 30 if correct_weapon else 0,
+        "Motive": 30 if correct_motive else 0,
+        "Perfect solve bonus": 10 if correct_suspect and correct_weapon and correct_motive else 0,
+        "Efficiency": efficiency,
+    }
+
+
+def detective_rating(score: int) -> str:
+    return next(rating for minimum, rating in RATINGS if score >= minimum)
+
+
+class Narrative:
+    """
+    The judge's case summary, written by a background task after an accusation.
+
+    Wait for the whole text with result(), or follow it as it is generated
+    with stream(). A stream always starts from the beginning, so a UI rerun
+    can pick it up again at any point.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._chunks: List[str] = []
+        self._done = False
+        self.error: Optional[BaseException] = None
+
+    @classmethod
+    def completed(cls, text: str) -> "Narrative":
+        narrative = cls()
+        narrative.append(text)
+        narrative.finish()
+        return narrative
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def text(self) -> str:
+        with self._cond:
+            return "".join(self._chunks)
+
+    def append(self, delta: str):
+        with self._cond:
+            self._chunks.append(delta)
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None):
+        with self._cond:
+            self.error = error
+            self._done = True
+            self._cond.notify_all()
+
+    def stream(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """Yield the text so far, then each delta as it arrives; ends when the summary is finished."""
+        position = 0
+        while True:
+            with self._cond:
+                if not self._cond.wait_for(lambda: len(self._chunks) > position or self._done, timeout):
+                    raise TimeoutError("The case summary is taking too long")
+                chunks = self._chunks[position:]
+                position += len(chunks)
+                done = self._done
+            yield from chunks
+            if done:
+                return
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        """The whole summary, once finished (re-raises a generation error)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._done, timeout):
+                raise TimeoutError("The case summary is taking too long")
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+
 # ============================================================
 # GAME ENGINE
 # ============================================================
 
+def case_semantic_cache(case: Case) -> Optional[SemanticQuestionCache]:
+    """Near-duplicate lookup for one case's opening questions, shared by all its sessions."""
+    names = {sid: profile.name for sid, profile in case.suspects.items()}
+    return case.artifact("semantic_cache", lambda: SemanticQuestionCache.from_env(case.case_file, names))
+
+
+# The default case's leak detector; each case compiles its own once
+# (Case.leak_detector). Classifying an answer takes microseconds.
+LEAK_DETECTOR: LeakDetector = DEFAULT_CASE.leak_detector
+
+# The default case's near-duplicate question cache (see case_semantic_cache).
+SEMANTIC_CACHE = case_semantic_cache(DEFAULT_CASE)
+
+# Runs speculative critique calls while the suspect is still generating.
+CRITIQUE_EXECUTOR = ThreadPoolExecutor(max_workers=SPECULATIVE_CRITIQUE_WORKERS, thread_name_prefix="critique")
+
+# Runs the per-suspect turns of interrogate_many().
+FANOUT_EXECUTOR = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="fanout")
+
+# Writes case summaries after the verdict has been returned.
+NARRATIVE_EXECUTOR = ThreadPoolExecutor(max_workers=NARRATIVE_WORKERS, thread_name_prefix="narrative")
+
+
 class MurderMysteryGame:
     """Main game engine."""
 
-    def __init__(self):
+    def __init__(self, use_leak_filter: bool = True, factory: AgentFactory = AGENT_FACTORY,
+                 cache: Optional[ResponseCache] = RESPONSE_CACHE,
+                 semantic_cache: Optional[SemanticQuestionCache] = SEMANTIC_CACHE,
+                 telemetry: Telemetry = TELEMETRY,
+                 memory_policy: Union[MemoryPolicy, Dict[str, MemoryPolicy]] = MEMORY_POLICY,
+                 speculative_critique: bool = SPECULATIVE_CRITIQUE,
+                 store: Optional[SessionStore] = SESSION_STORE,
+                 case_id: Optional[str] = None, catalog: CaseCatalog = CASE_CATALOG):
+        # Parsed cases and everything derived from them are cached, so starting
+        # a game costs the same however many cases the catalog holds.
+        self.case = catalog.get(case_id)
         self.state = GameState()
-        self.conversation_logs: Dict[str, List[Tuple[str, str]]] = {
-            sid: [] for sid in SUSPECTS.keys()
-        }
-        self.current_suspect_id = "s1"
-
-        # Initialize agents
+        self.session_id = uuid.uuid4().hex
+        # The only copy of the exchanges, indexed as they are logged.
+        # conversation_logs is its per-suspect view (read-only; log through
+        # the transcript).
+        self.transcript = Transcript(self.case.suspects)
+        self.conversation_logs: Dict[str, List[Exchange]] = self.transcript.logs
+        self.current_suspect_id = next(iter(self.case.suspects))
+        # Claims read from every logged answer; fills state.contradictions_found
+        # and state.key_clues_discovered
+        self.timeline = Timeline.from_case(self.case)
+
+        # Agents are shared across sessions; the per-session state is the
+        # conversation log, which is replayed to the suspect on every turn.
         self.suspect_agents: Dict[str, Agent] = {
-            sid: build_suspect_agent(profile) for sid, profile in SUSPECTS.items()
+            sid: factory.suspect_agent(self.case, profile) for sid, profile in self.case.suspects.items()
+        }
+        self.critique_agents: Dict[str, Agent] = {
+            sid: factory.critique_agent(self.case, profile) for sid, profile in self.case.suspects.items()
         }
-        self.critique_agent = build_critique_agent()
-        self.accusation_agent = build_accusation_agent()
+        self.accusation_agent = factory.accusation_agent()
+        self.memory_agent = factory.memory_agent()
+
+        # What each suspect is shown of its own conversation; a dict sets
+        # the policy per suspect id.
+        self.memory_policy = memory_policy
+        self.memories = self._new_memories()
+
+        # Local pre-filter: answers it classifies as safe skip the critique call
+        self.use_leak_filter = use_leak_filter
+        self.critique_stats: Dict[str, int] = {"calls": 0, "skipped": 0, "aborted": 0}
+        self.speculative_critique = speculative_critique
+
+        # Guards the game state and counters when several suspects answer at once
+        self._lock = threading.Lock()
+
+        # Shared caches of critiqued answers (None disables caching). The
+        # near-duplicate cache speaks one case's vocabulary, so games of another
+        # case use that case's own instead of the default one.
+        self.cache = cache
+        if semantic_cache is not None and semantic_cache is SEMANTIC_CACHE:
+            semantic_cache = case_semantic_cache(self.case)
+        self.semantic_cache = semantic_cache
+
+        # Timing and token spans for every stage of a turn
+        self.telemetry = telemetry
+
+        # Persistent session log (None keeps the game in memory only). The
+        # session is registered with the first saved event, so games that are
+        # never played leave nothing behind.
+        self.store = store
+        self.notes: Dict[str, str] = {}
+        self._session_saved = False
+        self._saved_memory: Dict[str, Tuple[str, int]] = {}
+
+        # The judge's case summary, started by make_accusation(), and the
+        # token budget of the transcript it is given
+        self.narrative: Optional[Narrative] = None
+        self.judge_transcript_tokens = JUDGE_TRANSCRIPT_TOKENS
+
+    @classmethod
+    def resume(cls, session_id: str, store: Optional[SessionStore] = SESSION_STORE,
+               **kwargs) -> Optional["MurderMysteryGame"]:
+        """
+        Rebuild a saved game from the session store, without any LLM call.
+
+        Returns None if the session is unknown or its case is not in the catalog.
+        """
+        record = store.load(session_id) if store is not None else None
+        if record is None or record.case_id not in kwargs.get("catalog", CASE_CATALOG):
+            return None
+
+        game = cls(store=store, case_id=record.case_id, **kwargs)
+        game.session_id = record.session_id
+        game._session_saved = True
+        for suspect_id, question, answer in record.exchanges:
+            if suspect_id not in game.case.suspects:
+                continue
+            position = game.transcript.append(suspect_id, question, answer)
+            game._observe(suspect_id, question, answer, position + 1)
+            game.state.add_turn(suspect_id)
+        for suspect_id, (summary, start) in record.memory.items():
+            if suspect_id in game.memories:
+                game.memories[suspect_id].restore(summary, start)
+        game._saved_memory = dict(record.memory)
+        game.notes = dict(record.notes)
+        if record.accusation is not None:
+            game.state.accusation_made = True
+            game.state.game_won = record.accusation["won"]
+            game.state.final_score = record.accusation["score"]
+        if record.narrative:
+            game.narrative = Narrative.completed(record.narrative)
+        return game
 
     def get_current_suspect(self) -> SuspectProfile:
-        return SUSPECTS[self.current_suspect_id]
+        return self.case.suspects[self.current_suspect_id]
 
     def switch_suspect(self, suspect_id: str) -> bool:
-        if suspect_id in SUSPECTS:
+        if suspect_id in self.case.suspects:
             self.current_suspect_id = suspect_id
             return True
         return False
 
-    def interrogate(self, player_message: str) -> str:
-        """Process a player question and return the suspect's response."""
-        profile = self.get_current_suspect()
-        suspect_agent = self.suspect_agents[self.current_suspect_id]
-
-        # Get raw response from suspect
-        raw_resp = suspect_agent.run(
+    def _save(self, kind: str, payload: Dict[str, Any], suspect_id: Optional[str] = None):
+        """Append an event to the session store, registering the session on first use."""
+        if self.store is None:
+            return
+        if not self._session_saved:
+            self._session_saved = True
+            self.store.start(self.session_id, self.case.case_id)
+        self.store.append(self.session_id, kind, payload, suspect_id)
+
+    def _save_exchange(self, suspect_id: str, player_message: str, safe_text: str):
+        if self.store is None:
+            return
+        self._save("exchange", {"question": player_message, "answer": safe_text}, suspect_id)
+        # Summaries are folded in the background; save one whenever it has moved on
+        summary, start = self.memories[suspect_id].snapshot()
+        if summary and self._saved_memory.get(suspect_id) != (summary, start):
+            self._saved_memory[suspect_id] = (summary, start)
+            self._save("memory", {"summary": summary, "start": start}, suspect_id)
+
+    def save_notes(self, notes: Dict[str, str]):
+        """Update the detective's notes ("general" and per suspect id), saving only what changed."""
+        changed = {key: text for key, text in notes.items() if self.notes.get(key, "") != text}
+        if changed:
+            self.notes.update(changed)
+            self._save("notes", changed)
+
+    def _save_accusation(self, suspect_id: str, weapon: str, motive: str, won: bool, score: int,
+                         eval_text: str):
+        self._save("accusation", {"suspect_id": suspect_id, "weapon": weapon, "motive": motive,
+                                  "won": won, "score": score, "eval_text": eval_text})
+
+    def _new_memories(self) -> Dict[str, ConversationMemory]:
+        memories = {}
+        for sid in self.case.suspects:
+            policy = self.memory_policy
+            if isinstance(policy, dict):
+                policy = policy.get(sid, MEMORY_POLICY)
+            memories[sid] = ConversationMemory(policy, summarizer=self._summarizer(sid))
+        return memories
+
+    def _summarizer(self, suspect_id: str):
+        """Summarizer for one suspect's memory; runs on the memory's background executor."""
+        session_id = self.session_id
+
+        def summarize(previous: str, exchanges: List[Tuple[str, str]]) -> str:
+            lines = [f"Detective: {q}\nSuspect: {a}" for q, a in exchanges]
+            prompt = f"CURRENT SUMMARY:\n{previous or '(none)'}\n\nNEW EXCHANGES:\n" + "\n\n".join(lines)
+            with self.telemetry.span("summarize", session_id=session_id, suspect_id=suspect_id,
+                                     exchanges=len(exchanges)) as span:
+                return self._run_text(self.memory_agent, prompt, span)
+
+        return summarize
+
+    def _suspect_prompt(self, suspect_id: str, player_message: str) -> List[Message]:
+        """Build the suspect's input: its memory of the conversation plus the new question."""
+        summary, exchanges = self.memories[suspect_id].window(self.conversation_logs[suspect_id])
+        messages: List[Message] = []
+        if summary:
+            messages.append(Message(role="user", content=f"SUMMARY OF THE EARLIER INTERROGATION:\n{summary}"))
+        for question, answer in exchanges:
+            messages.append(Message(role="user", content=f"PLAYER QUESTION:\n{question}"))
+            messages.append(Message(role="assistant", content=answer))
+        messages.append(Message(role="user", content=(
             f"PLAYER QUESTION:\n{player_message}\n\n"
             "(Remember: you may slip and reveal too much; a separate critique layer will check you.)"
-        )
-        raw_text = raw_resp.content if hasattr(raw_resp, "content") else str(raw_resp)
+        )))
+        return messages
+
+    def _run_text(self, agent: Agent, prompt: Union[str, List[Message]], span: Optional[Span] = None) -> str:
+        resp = agent.run(prompt, session_id=self.session_id)
+        if span is not None:
+            span.add_usage(getattr(resp, "metrics", None))
+        return response_text(resp)
+
+    def _critique_prompt(self, player_message: str, raw_text: str, answer_so_far: str = "") -> str:
+        """
+        Build the critique prompt for a full raw answer or a streamed fragment of one.
+
+        The suspect's profile and the case truth are in the critique agent's
+        instructions, so only the per-turn content is sent here.
+        """
+        if answer_so_far:
+            answer_block = f"""ANSWER ALREADY SHOWN TO THE PLAYER (do not repeat it):
+\"\"\"{answer_so_far}\"\"\"
+
+NEXT RAW FRAGMENT FROM SUSPECT:
+\"\"\"{raw_text}\"\"\"
 
-        # Critique and revise
-        critique_prompt = f"""
-You are the critique layer.
+Now output ONLY the safe, in-character version of this fragment, continuing naturally from the answer already shown."""
+        else:
+            answer_block = f"""RAW ANSWER FROM SUSPECT:
+\"\"\"{raw_text}\"\"\"
 
-PLAYER QUESTION:
-{player_message}
+Now output ONLY the final, safe, in-character answer to show the player, after applying your rules."""
 
-SUSPECT PROFILE:
-- id: {profile.id}
-- name: {profile.name}
-- role: {profile.role}
-- persona: {profile.persona}
-- public_info: {profile.public_info}
-- secret_info: {profile.secret_info}
-- hard_redlines: {profile.hard_redlines}
+        return f"""PLAYER QUESTION:
+{player_message}
 
-CASE TRUTH:
-- culprit_id: {CASE_FILE["truth"]["culprit_id"]}
-- method: {CASE_FILE["truth"]["method"]}
-- motive: {CASE_FILE["truth"]["motive"]}
+{answer_block}
+"""
 
-RAW ANSWER FROM SUSPECT:
-\"\"\"{raw_text}\"\"\"
+    def _leak_label(self, suspect_id: str, text: str) -> str:
+        """Local leak verdict: "safe", "uncertain" or "unsafe" (always "uncertain" without the filter)."""
+        return self.case.leak_detector.classify(text, suspect_id).label if self.use_leak_filter else "uncertain"
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.critique_stats[stat] += 1
+
+    def _count_critique(self, needed: bool) -> bool:
+        self._count("calls" if needed else "skipped")
+        return needed
+
+    def _needs_critique(self, suspect_id: str, raw_text: str) -> bool:
+        """Run the local leak detector and count the critique call made or skipped."""
+        return self._count_critique(self._leak_label(suspect_id, raw_text) != "safe")
+
+    def _critique_fragment(self, turn: Span, suspect_id: str, prompt: str) -> str:
+        with self.telemetry.span("critique", parent=turn) as span:
+            return self._run_text(self.critique_agents[suspect_id], prompt, span)
+
+    def _speculative_answer(self, turn: Span, suspect_id: str, player_message: str) -> str:
+        """
+        Critique the suspect's answer while it is still being generated.
+
+        Sentences are screened as they stream in: safe ones are kept, flagged
+        ones are critiqued on worker threads while generation continues, and a
+        full redline stops generation so only that sentence is rewritten.
+        """
+        parts: List[Union[str, Future]] = []
+        kept = ""
+        with self.telemetry.span("suspect", parent=turn) as span:
+            raw_stream = stream_agent_text(
+                self.suspect_agents[suspect_id], self._suspect_prompt(suspect_id, player_message),
+                self.session_id, span,
+            )
+            try:
+                for sentence in iter_sentences(raw_stream):
+                    label = self._leak_label(suspect_id, sentence)
+                    if not self._count_critique(label != "safe"):
+                        parts.append(sentence)
+                        kept += sentence
+                        continue
+                    prompt = self._critique_prompt(player_message, sentence.strip(), kept.strip())
+                    parts.append(CRITIQUE_EXECUTOR.submit(self._critique_fragment, turn, suspect_id, prompt))
+                    if label == "unsafe":
+                        self._count("aborted")
+                        turn.attributes["aborted"] = True
+                        break
+            finally:
+                raw_stream.close()
+
+        turn.attributes["critique_skipped"] = all(isinstance(p, str) for p in parts)
+        turn.attributes["unreviewed"] = any(isinstance(p, str) for p in parts)
+        texts = [p if isinstance(p, str) else p.result() for p in parts]
+        return " ".join(t.strip() for t in texts if t.strip())
+
+    def _cached_answer(self, suspect_id: str, player_message: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (cache key, cached answer) for a question given this suspect's history so far."""
+        key, cached = None, None
+        if self.cache is not None:
+            key = cache_key(self.case.case_id, suspect_id, player_message, self.conversation_logs[suspect_id])
+            cached = self.cache.get(key, suspect_id)
+        # Opening questions can also be served by a near-duplicate that was already answered
+        if cached is None and self.semantic_cache is not None and not self.conversation_logs[suspect_id]:
+            cached = self.semantic_cache.lookup(suspect_id, player_message)
+        return key, cached
+
+    def _remember_answer(self, key: Optional[str], suspect_id: str, player_message: str, safe_text: str):
+        if not safe_text:
+            return
+        if self.cache is not None and key is not None:
+            self.cache.put(key, suspect_id, safe_text)
+        if self.semantic_cache is not None and not self.conversation_logs[suspect_id]:
+            self.semantic_cache.add(suspect_id, player_message, safe_text)
+
+    def _observe(self, suspect_id: str, question: str, answer: str, number: int):
+        """Read a logged answer's claims into the timeline (number: 1-based in the suspect's log)."""
+        contradictions, clues = self.timeline.add(suspect_id, question, answer, number)
+        self.state.contradictions_found.extend(c.text for c in contradictions)
+        self.state.key_clues_discovered.extend(clues)
+
+    def _log_exchange(self, suspect_id: str, player_message: str, safe_text: str):
+        position = self.transcript.append(suspect_id, player_message, safe_text)
+        self.memories[suspect_id].update(self.conversation_logs[suspect_id])
+        with self._lock:
+            self._observe(suspect_id, player_message, safe_text, position + 1)
+            self.state.add_turn(suspect_id)
+            self._save_exchange(suspect_id, player_message, safe_text)
+
+    def _turn_span(self, suspect_id: str, streamed: bool = False):
+        return self.telemetry.span("turn", session_id=self.session_id, suspect_id=suspect_id,
+                                   turn=self.state.total_turns + 1, streamed=streamed)
+
+    def _finish_turn(self, turn: Span, key: Optional[str], suspect_id: str, player_message: str,
+                     safe_text: str, remember: bool = True):
+        """Cache and log a completed exchange."""
+        with self.telemetry.span("log", parent=turn):
+            # The leak detector can miss leaks, so only answers the critique
+            # reviewed in full are replayed to other games
+            if remember and not turn.attributes.get("unreviewed"):
+                self._remember_answer(key, suspect_id, player_message, safe_text)
+            self._log_exchange(suspect_id, player_message, safe_text)
 
-Now output ONLY the final, safe, in-character answer to show the player, after applying your rules.
-"""
-        crit_resp = self.critique_agent.run(critique_prompt)
-        safe_text = crit_resp.content if hasattr(crit_resp, "content") else str(crit_resp)
+    def interrogate(self, player_message: str) -> str:
+        """Process a player question and return the suspect's response."""
+        return self.interrogate_suspect(self.current_suspect_id, player_message)
+
+    def interrogate_many(self, player_message: str, suspect_ids: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Ask several suspects (default: all) the same question at once.
+
+        Each suspect's turn (suspect and critique calls) runs concurrently, so
+        the wall-clock time is about one turn. Every answer counts as a turn.
+        """
+        answers = dict(self.interrogate_each(player_message, suspect_ids))
+        return {sid: answers[sid] for sid in self._fanout_ids(suspect_ids)}
+
+    def interrogate_each(self, player_message: str,
+                         suspect_ids: Optional[List[str]] = None) -> Iterator[Tuple[str, str]]:
+        """Like interrogate_many(), but yield (suspect_id, answer) pairs as each suspect finishes."""
+        futures = {
+            FANOUT_EXECUTOR.submit(self.interrogate_suspect, sid, player_message): sid
+            for sid in self._fanout_ids(suspect_ids)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def _fanout_ids(self, suspect_ids: Optional[List[str]]) -> List[str]:
+        ids = list(self.case.suspects) if suspect_ids is None else list(dict.fromkeys(suspect_ids))
+        unknown = [sid for sid in ids if sid not in self.case.suspects]
+        if unknown:
+            raise ValueError(f"Unknown suspect id(s): {', '.join(unknown)}")
+        return ids
+
+    def interrogate_suspect(self, suspect_id: str, player_message: str) -> str:
+        """interrogate() for a given suspect, regardless of the current one (thread-safe per suspect)."""
+        suspect_agent = self.suspect_agents[suspect_id]
+
+        with self._turn_span(suspect_id) as turn:
+            key, cached = self._cached_answer(suspect_id, player_message)
+            turn.attributes["cached"] = cached is not None
+            if cached is not None:
+                self._finish_turn(turn, key, suspect_id, player_message, cached, remember=False)
+                return cached
+
+            if self.speculative_critique:
+                safe_text = self._speculative_answer(turn, suspect_id, player_message)
+                self._finish_turn(turn, key, suspect_id, player_message, safe_text)
+                return safe_text
+
+            # Get raw response from suspect
+            with self.telemetry.span("suspect", parent=turn) as span:
+                raw_text = self._run_text(suspect_agent, self._suspect_prompt(suspect_id, player_message), span)
+
+            # Critique and revise (only if the local pre-filter flags the answer)
+            needs_critique = self._needs_critique(suspect_id, raw_text)
+            turn.attributes["critique_skipped"] = turn.attributes["unreviewed"] = not needs_critique
+            if needs_critique:
+                with self.telemetry.span("critique", parent=turn) as span:
+                    safe_text = self._run_text(
+                        self.critique_agents[suspect_id], self._critique_prompt(player_message, raw_text), span
+                    )
+            else:
+                safe_text = raw_text
 
-        # Log the conversation
-        self.conversation_logs[self.current_suspect_id].append((player_message, safe_text.strip()))
-        self.state.add_turn(self.current_suspect_id)
+            # Log the conversation
+            self._finish_turn(turn, key, suspect_id, player_message, safe_text.strip())
 
         return safe_text.strip()
 
-    def make_accusation(self, suspect_id: str, weapon: str, motive: str) -> Tuple[bool, int, str]:
-        """Evaluate the player's accusation."""
-        truth = CASE_FILE["truth"]
+    def interrogate_stream(self, player_message: str) -> Iterator[str]:
+        """
+        Streaming variant of interrogate().
+
+        The suspect's answer is streamed and cut into sentences; each sentence is
+        critiqued as soon as it is complete and the critique output is streamed
+        back, so the player sees text after roughly one round-trip instead of two.
+        Sentences the local leak detector considers safe are passed through as-is.
+        The exchange is logged (and the turn counted) once the stream finishes.
+
+        The suspect and critique spans hold the time spent waiting on each model
+        (summed over sentences), not the time the player spends reading.
+
+        With speculative critique, a sentence matching a full redline also stops
+        the suspect's generation: it is rewritten and the answer ends there.
+        """
+        suspect_id = self.current_suspect_id
+        suspect_agent = self.suspect_agents[suspect_id]
+
+        with self._turn_span(suspect_id, streamed=True) as turn:
+            key, cached = self._cached_answer(suspect_id, player_message)
+            turn.attributes["cached"] = cached is not None
+            if cached is not None:
+                self._finish_turn(turn, key, suspect_id, player_message, cached, remember=False)
+                yield cached
+                return
+
+            suspect_span = self.telemetry.start_span("suspect", parent=turn)
+            # Started at the first sentence that needs critique, so a turn
+            # without one leaves no span behind
+            critique_span: Optional[Span] = None
+            shown = ""
+            completed = False
+            unreviewed = False
+            raw_stream = stream_agent_text(
+                suspect_agent, self._suspect_prompt(suspect_id, player_message), self.session_id, suspect_span
+            )
+            try:
+                for sentence in iter_sentences(timed(raw_stream, suspect_span)):
+                    if shown and not shown[-1].isspace():
+                        # Keep a space between critiqued sentences.
+                        shown += " "
+                        yield " "
+                    label = self._leak_label(suspect_id, sentence)
+                    abort = self.speculative_critique and label == "unsafe"
+                    if self._count_critique(label != "safe"):
+                        if critique_span is None:
+                            critique_span = self.telemetry.start_span("critique", parent=turn, sentences=0)
+                        critique_span.attributes["sentences"] += 1
+                        prompt = self._critique_prompt(player_message, sentence.strip(), shown.strip())
+                        deltas = timed(
+                            stream_agent_text(self.critique_agents[suspect_id], prompt, self.session_id,
+                                              critique_span),
+                            critique_span,
+                        )
+                    else:
+                        unreviewed = True
+                        deltas = iter([sentence])
+                    for delta in deltas:
+                        if not shown.strip():
+                            delta = delta.lstrip()
+                        shown += delta
+                        yield delta
+                    if abort:
+                        self._count("aborted")
+                        turn.attributes["aborted"] = True
+                        break
+                completed = True
+            finally:
+                raw_stream.close()
+                turn.attributes["critique_skipped"] = critique_span is None
+                turn.attributes["unreviewed"] = unreviewed
+                self.telemetry.end_span(suspect_span)
+                if critique_span is not None:
+                    self.telemetry.end_span(critique_span)
+                if shown.strip():
+                    self._finish_turn(turn, key, suspect_id, player_message, shown.strip(), remember=completed)
+
+    def _check_accusation(self, suspect_id: str, weapon: str, motive: str) -> Tuple[bool, bool, bool]:
+        truth = self.case.case_file["truth"]
 
         correct_suspect = (suspect_id == truth["culprit_id"])
         correct_weapon = (weapon.lower().strip() == truth["method"].lower().strip())
         correct_motive = (motive.lower().strip() == truth["motive"].lower().strip())
+        return correct_suspect, correct_weapon, correct_motive
+
+    def _accusation_prompt(self, suspect_id: str, weapon: str, motive: str,
+                           correct_suspect: bool, correct_weapon: bool, correct_motive: bool,
+                           state: GameState, logs: Dict[str, List[Exchange]],
+                           span: Optional[Span] = None) -> str:
+        """Build the prompt for the accusation judge from the game as it was when accused."""
+        suspects = self.case.suspects
+        truth = self.case.case_file["truth"]
+
+        # The most telling exchanges of the whole game, within the judge's token budget
+        board = EvidenceBoard.from_case(self.case.case_file, suspects, self.case.weapons, self.case.motives)
+        board.update(logs)
+        packed = pack_transcript(logs, {sid: p.name for sid, p in suspects.items()}, board,
+                                 self.judge_transcript_tokens)
+        if span is not None:
+            span.attributes.update(transcript_tokens=packed.tokens, exchanges_shown=packed.shown,
+                                   exchanges_total=packed.total)
+        def findings(items: List[str], limit: int = 8) -> str:
+            # The first ones found; the prompt stays bounded like the transcript
+            lines = [f"- {item}" for item in items[:limit]]
+            if len(items) > limit:
+                lines.append(f"- ... and {len(items) - limit} more")
+            return "\n".join(lines) or "- None"
+
+        profiles = "\n".join(
+            f"- {sid}: {p.name} ({p.role.upper()}) - {p.summary or p.public_info}" for sid, p in suspects.items()
+        )
 
-        # Build transcript summary
-        all_transcripts = []
-        for sid, logs in self.conversation_logs.items():
-            if logs:
-                name = SUSPECTS[sid].name
-                all_transcripts.append(f"\n--- Interrogation of {name} ({len(logs)} exchanges) ---")
-                for i, (q, a) in enumerate(logs[-5:], 1):
-                    all_transcripts.append(f"Q{i}: {q}")
-                    all_transcripts.append(f"A{i}: {a[:200]}...")
-
-        transcript_text = "\n".join(all_transcripts) if all_transcripts else "No interrogations conducted."
-
-        eval_prompt = f"""
+        return f"""
 PLAYER'S ACCUSATION:
-- Suspect: {suspect_id} ({SUSPECTS[suspect_id].name if suspect_id in SUSPECTS else 'Unknown'})
+- Suspect: {suspect_id} ({suspects[suspect_id].name if suspect_id in suspects else 'Unknown'})
 - Weapon: {weapon}
 - Motive: {motive}
 
 THE TRUTH:
-- Culprit: {truth["culprit_id"]} ({SUSPECTS[truth["culprit_id"]].name})
+- Culprit: {truth["culprit_id"]} ({suspects[truth["culprit_id"]].name})
 - Weapon: {truth["method"]}
 - Motive: {truth["motive"]}
 - Timeline: {chr(10).join(truth["timeline"])}
@@ -462,77 +1103,351 @@ CORRECTNESS CHECK:
 - Motive correct: {correct_motive}
 
 GAME STATISTICS:
-- Total turns used: {self.state.total_turns}
-- Suspects interviewed: {len(self.state.suspects_interviewed)}/3
+- Total turns used: {state.total_turns}
+- Suspects interviewed: {len(state.suspects_interviewed)}/{len(suspects)}
+
+CONTRADICTIONS FOUND:
+{findings(state.contradictions_found)}
+
+KEY CLUES DISCOVERED:
+{findings(state.key_clues_discovered)}
 
 INTERROGATION HIGHLIGHTS:
-{transcript_text}
+{packed.text}
 
 SUSPECT PROFILES (for context):
-- s1: Lydia Blackwood (KILLER) - Elegant heiress, claims she was reading in bedroom
-- s2: Dr. Marcus Vale (ACCOMPLICE) - Helped hide the weapon, claims he left at 22:45
-- s3: Eleanor Wright (INNOCENT) - Saw Lydia rushing from library at 23:20, too scared to say
+{profiles}
 
-Now provide the full CASE RESOLUTION evaluation.
+Now write the CASE SUMMARY.
 """
-        resp = self.accusation_agent.run(eval_prompt)
-        eval_text = resp.content if hasattr(resp, "content") else str(resp)
-
-        # Calculate score
-        score = 0
-        if correct_suspect:
-            score += 40
-        if correct_weapon:
-            score += 30
-        if correct_motive:
-            score += 30
-        if correct_suspect and correct_weapon and correct_motive:
-            score += 10
-
-        if self.state.total_turns <= 10:
-            score += 10
-        elif self.state.total_turns <= 15:
-            score += 5
-        elif self.state.total_turns > 20:
-            score -= min(20, (self.state.total_turns - 20) * 2)
 
-        score = max(0, min(100, score))
+    def _record_accusation(self, correct_suspect: bool, correct_weapon: bool, correct_motive: bool) -> int:
+        """Compute the score and close the game state."""
+        parts = score_parts(correct_suspect, correct_weapon, correct_motive, self.state.total_turns)
+        score = max(0, min(100, sum(parts.values())))
 
         self.state.accusation_made = True
         self.state.game_won = correct_suspect
         self.state.final_score = score
 
-        return correct_suspect, score, eval_text
+        return score
+
+    def _resolution_report(self, suspect_id: str, weapon: str, motive: str,
+                           correct_suspect: bool, correct_weapon: bool, correct_motive: bool, score: int) -> str:
+        """The verdict and score breakdown, worked out locally (the judge only writes the case summary)."""
+        suspects = self.case.suspects
+        truth = self.case.case_file["truth"]
+        accused = suspects[suspect_id].name if suspect_id in suspects else "Unknown"
+        culprit = suspects[truth["culprit_id"]].name
+
+        def mark(correct: bool) -> str:
+            return "✅ correct" if correct else "❌ wrong"
+
+        if correct_suspect and correct_weapon and correct_motive:
+            verdict = f"Case solved. {culprit} killed the victim with the {truth['method']}."
+        elif correct_suspect:
+            verdict = f"Right culprit: {culprit} did it, but the full story is not quite right."
+        else:
+            verdict = f"Wrong suspect. The killer was {culprit}."
+
+        parts = score_parts(correct_suspect, correct_weapon, correct_motive, self.state.total_turns)
+        breakdown = "\n".join(f"- {label}: {points:+d}" for label, points in parts.items() if points)
+
+        return f"""**ACCUSATION ANALYSIS:**
+- Suspect: {accused} ({mark(correct_suspect)})
+- Weapon: {weapon} ({mark(correct_weapon)})
+- Motive: {motive} ({mark(correct_motive)})
+
+**VERDICT:** {verdict}
+
+**SCORE:** {score}/100 ({self.state.total_turns} turns)
+{breakdown or "- No points"}
+
+**DETECTIVE RATING:** {detective_rating(score)}"""
+
+    def _accuse(self, suspect_id: str, weapon: str, motive: str,
+                span: Span) -> Tuple[bool, int, str, Callable[..., str]]:
+        """
+        Score an accusation and save it; returns (won, score, report, judge prompt
+        builder). Packing the transcript for the judge is left to the builder, so
+        it runs with the summary in the background, off the verdict's path.
+        """
+        checks = self._check_accusation(suspect_id, weapon, motive)
+        span.attributes["correct"] = checks[0]
+        # As accused: the game may be reset while the judge is still writing
+        state = self.state.snapshot()
+        logs = {sid: list(log) for sid, log in self.conversation_logs.items()}
+        score = self._record_accusation(*checks)
+        report = self._resolution_report(suspect_id, weapon, motive, *checks, score)
+        self._save_accusation(suspect_id, weapon, motive, checks[0], score, report)
+        build_prompt = functools.partial(self._accusation_prompt, suspect_id, weapon, motive, *checks, state, logs)
+        return checks[0], score, report, build_prompt
+
+    def _save_narrative(self, session_id: str, narrative: Narrative):
+        # By session id: the game may have been reset while the judge was writing
+        if self.store is not None and narrative.error is None:
+            self.store.append(session_id, "narrative", {"text": narrative.text})
+
+    def make_accusation(self, suspect_id: str, weapon: str, motive: str,
+                        narrate: bool = True) -> Tuple[bool, int, str]:
+        """
+        Score the player's accusation; returns (won, score, report) at once.
+
+        The verdict and score need no model call. With `narrate`, the judge's
+        case summary is written in the background into self.narrative.
+        """
+        with self.telemetry.span("accusation", session_id=self.session_id, suspect_id=suspect_id) as span:
+            won, score, report, build_prompt = self._accuse(suspect_id, weapon, motive, span)
+        if narrate:
+            self.narrative = Narrative()
+            NARRATIVE_EXECUTOR.submit(self._narrate, self.narrative, build_prompt, self.session_id, span)
+        return won, score, report
+
+    def _narrate(self, narrative: Narrative, build_prompt: Callable[..., str], session_id: str, parent: Span):
+        error = None
+        try:
+            with self.telemetry.span("judge", parent=parent) as judge:
+                prompt = build_prompt(span=judge)
+                for delta in stream_agent_text(self.accusation_agent, prompt, session_id, judge):
+                    narrative.append(delta)
+        except Exception as e:
+            error = e
+        narrative.finish(error)
+        self._save_narrative(session_id, narrative)
 
     def reset(self):
         """Reset the game for a new playthrough."""
         self.state.reset()
-        self.conversation_logs = {sid: [] for sid in SUSPECTS.keys()}
-        self.current_suspect_id = "s1"
-        # Rebuild agents to clear memory
-        self.suspect_agents = {
-            sid: build_suspect_agent(profile) for sid, profile in SUSPECTS.items()
-        }
+        self.session_id = uuid.uuid4().hex
+        self.transcript = Transcript(self.case.suspects)
+        self.conversation_logs = self.transcript.logs
+        self.memories = self._new_memories()
+        self.current_suspect_id = next(iter(self.case.suspects))
+        self.timeline = Timeline.from_case(self.case)
+        self.critique_stats = {"calls": 0, "skipped": 0, "aborted": 0}
+        self.notes = {}
+        self._session_saved = False
+        self._saved_memory = {}
+        self.narrative = None
+
+
+# ============================================================
+# ASYNC ENGINE
+# ============================================================
+
+class ConcurrencyLimiter:
+    """
+    Async context manager capping in-flight LLM requests across all sessions.
+
+    One semaphore is kept per event loop, so a limiter can be shared at module
+    level even when several loops (e.g. one per worker thread) use it.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def __aenter__(self):
+        await self._semaphore().acquire()
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.in_flight -= 1
+        self._semaphore().release()
+        return False
+
+
+GROQ_LIMITER = ConcurrencyLimiter(GROQ_MAX_CONCURRENCY)
+
+
+class AsyncMurderMysteryGame(MurderMysteryGame):
+    """
+    asyncio-native game engine.
+
+    Uses the agents' async run path so that many game sessions can share one
+    event loop; every model call goes through a shared ConcurrencyLimiter.
+    """
+
+    def __init__(self, use_leak_filter: bool = True, factory: AgentFactory = AGENT_FACTORY,
+                 cache: Optional[ResponseCache] = RESPONSE_CACHE,
+                 semantic_cache: Optional[SemanticQuestionCache] = SEMANTIC_CACHE,
+                 telemetry: Telemetry = TELEMETRY,
+                 memory_policy: Union[MemoryPolicy, Dict[str, MemoryPolicy]] = MEMORY_POLICY,
+                 speculative_critique: bool = SPECULATIVE_CRITIQUE,
+                 store: Optional[SessionStore] = SESSION_STORE,
+                 case_id: Optional[str] = None, catalog: CaseCatalog = CASE_CATALOG,
+                 limiter: ConcurrencyLimiter = GROQ_LIMITER):
+        super().__init__(use_leak_filter=use_leak_filter, factory=factory, cache=cache,
+                         semantic_cache=semantic_cache, telemetry=telemetry, memory_policy=memory_policy,
+                         speculative_critique=speculative_critique, store=store, case_id=case_id,
+                         catalog=catalog)
+        self.limiter = limiter
+        self.narrative_task: Optional["asyncio.Task"] = None
+
+    async def _arun_text(self, agent: Agent, prompt: Union[str, List[Message]],
+                         span: Optional[Span] = None) -> str:
+        start = time.perf_counter()
+        async with self.limiter:
+            if span is not None:
+                span.attributes["queue_ms"] = (time.perf_counter() - start) * 1000
+            resp = await agent.arun(prompt, session_id=self.session_id)
+        if span is not None:
+            span.add_usage(getattr(resp, "metrics", None))
+        return response_text(resp)
+
+    async def _acritique_fragment(self, turn: Span, suspect_id: str, prompt: str) -> str:
+        with self.telemetry.span("critique", parent=turn) as span:
+            return await self._arun_text(self.critique_agents[suspect_id], prompt, span)
+
+    async def _aspeculative_answer(self, turn: Span, suspect_id: str, player_message: str) -> str:
+        """Async variant of _speculative_answer(); flagged sentences are critiqued as concurrent tasks."""
+        parts: List[Union[str, asyncio.Task]] = []
+        kept = ""
+        with self.telemetry.span("suspect", parent=turn) as span:
+            async with self.limiter:
+                raw_stream = astream_agent_text(
+                    self.suspect_agents[suspect_id], self._suspect_prompt(suspect_id, player_message),
+                    self.session_id, span,
+                )
+                try:
+                    async for sentence in aiter_sentences(raw_stream):
+                        label = self._leak_label(suspect_id, sentence)
+                        if not self._count_critique(label != "safe"):
+                            parts.append(sentence)
+                            kept += sentence
+                            continue
+                        prompt = self._critique_prompt(player_message, sentence.strip(), kept.strip())
+                        parts.append(asyncio.create_task(self._acritique_fragment(turn, suspect_id, prompt)))
+                        if label == "unsafe":
+                            self._count("aborted")
+                            turn.attributes["aborted"] = True
+                            break
+                finally:
+                    await raw_stream.aclose()
+
+        turn.attributes["critique_skipped"] = all(isinstance(p, str) for p in parts)
+        turn.attributes["unreviewed"] = any(isinstance(p, str) for p in parts)
+        texts = [p if isinstance(p, str) else await p for p in parts]
+        return " ".join(t.strip() for t in texts if t.strip())
+
+    async def interrogate(self, player_message: str) -> str:
+        """Process a player question and return the suspect's response."""
+        # Capture the suspect up front: switch_suspect may run while we await.
+        return await self._ainterrogate_suspect(self.current_suspect_id, player_message)
+
+    async def interrogate_many(self, player_message: str,
+                               suspect_ids: Optional[List[str]] = None) -> Dict[str, str]:
+        """Ask several suspects (default: all) the same question concurrently."""
+        ids = self._fanout_ids(suspect_ids)
+        answers = await asyncio.gather(*[self._ainterrogate_suspect(sid, player_message) for sid in ids])
+        return dict(zip(ids, answers))
+
+    async def interrogate_each(self, player_message: str,
+                               suspect_ids: Optional[List[str]] = None) -> AsyncIterator[Tuple[str, str]]:
+        """Like interrogate_many(), but yield (suspect_id, answer) pairs as each suspect finishes."""
+
+        async def ask(sid: str) -> Tuple[str, str]:
+            return sid, await self._ainterrogate_suspect(sid, player_message)
+
+        for next_done in asyncio.as_completed([ask(sid) for sid in self._fanout_ids(suspect_ids)]):
+            yield await next_done
+
+    async def _ainterrogate_suspect(self, suspect_id: str, player_message: str) -> str:
+        with self._turn_span(suspect_id) as turn:
+            key, cached = self._cached_answer(suspect_id, player_message)
+            turn.attributes["cached"] = cached is not None
+            if cached is not None:
+                self._finish_turn(turn, key, suspect_id, player_message, cached, remember=False)
+                return cached
+
+            if self.speculative_critique:
+                safe_text = await self._aspeculative_answer(turn, suspect_id, player_message)
+                self._finish_turn(turn, key, suspect_id, player_message, safe_text)
+                return safe_text
+
+            with self.telemetry.span("suspect", parent=turn) as span:
+                raw_text = await self._arun_text(
+                    self.suspect_agents[suspect_id], self._suspect_prompt(suspect_id, player_message), span
+                )
+
+            needs_critique = self._needs_critique(suspect_id, raw_text)
+            turn.attributes["critique_skipped"] = turn.attributes["unreviewed"] = not needs_critique
+            if needs_critique:
+                with self.telemetry.span("critique", parent=turn) as span:
+                    safe_text = await self._arun_text(
+                        self.critique_agents[suspect_id], self._critique_prompt(player_message, raw_text), span
+                    )
+            else:
+                safe_text = raw_text
+
+            self._finish_turn(turn, key, suspect_id, player_message, safe_text.strip())
+        return safe_text.strip()
+
+    async def make_accusation(self, suspect_id: str, weapon: str, motive: str,
+                              narrate: bool = True) -> Tuple[bool, int, str]:
+        """
+        Score the player's accusation; returns (won, score, report) at once.
+
+        With `narrate`, the judge's case summary is written by a background
+        task (self.narrative_task) into self.narrative.
+        """
+        with self.telemetry.span("accusation", session_id=self.session_id, suspect_id=suspect_id) as span:
+            won, score, report, build_prompt = self._accuse(suspect_id, weapon, motive, span)
+        if narrate:
+            self.narrative = Narrative()
+            self.narrative_task = asyncio.create_task(
+                self._anarrate(self.narrative, build_prompt, self.session_id, span)
+            )
+        return won, score, report
+
+    async def _anarrate(self, narrative: Narrative, build_prompt: Callable[..., str], session_id: str,
+                        parent: Span):
+        error = None
+        try:
+            with self.telemetry.span("judge", parent=parent) as judge:
+                prompt = build_prompt(span=judge)
+                start = time.perf_counter()
+                async with self.limiter:
+                    judge.attributes["queue_ms"] = (time.perf_counter() - start) * 1000
+                    async for delta in astream_agent_text(self.accusation_agent, prompt, session_id, judge):
+                        narrative.append(delta)
+        except Exception as e:
+            error = e
+        narrative.finish(error)
+        self._save_narrative(session_id, narrative)
 
 
 # ============================================================
 # CLI INTERFACE (for testing)
 # ============================================================
 
-def run_cli():
-    """Run the game in command-line mode."""
-    if not os.environ.get("GROQ_API_KEY"):
+def run_cli(case_id: Optional[str] = None):
+    """Run the game in command-line mode (default case unless `case_id` is given)."""
+    if requires_groq_key() and not os.environ.get("GROQ_API_KEY"):
         print("Please set GROQ_API_KEY environment variable.")
         print("  export GROQ_API_KEY='your-key-here'")
+        print("Or run offline with LLM_BACKEND=fake.")
         return
 
-    game = MurderMysteryGame()
+    game = MurderMysteryGame(case_id=case_id)
+    case = game.case
 
     print("\n" + "=" * 60)
-    print("   AI MURDER MYSTERY: THE BLACKWOOD MANSION")
+    print(f"   AI MURDER MYSTERY: {case.title.upper()}")
     print("=" * 60)
 
-    v = CASE_FILE["victim"]
+    v = case.case_file["victim"]
     print(f"\nVICTIM: {v['name']}")
     print(f"TIME OF DEATH: {v['time_of_death']}")
     print(f"LOCATION: {v['location']}")
@@ -553,7 +1468,7 @@ def run_cli():
             break
 
         if user_input.lower() == "/suspects":
-            for sid, s in SUSPECTS.items():
+            for sid, s in case.suspects.items():
                 print(f"  {sid} - {s.name}")
             continue
 
@@ -565,15 +1480,15 @@ def run_cli():
         if user_input.startswith("/suspect "):
             new_id = user_input.split()[1]
             if game.switch_suspect(new_id):
-                print(f"Now interrogating: {SUSPECTS[new_id].name}")
+                print(f"Now interrogating: {case.suspects[new_id].name}")
             else:
                 print(f"Unknown suspect: {new_id}")
             continue
 
         if user_input.lower() == "/accuse":
             print("\nUsage: /accuse <suspect_id> <weapon> <motive>")
-            print("Weapons:", VALID_WEAPONS)
-            print("Motives:", VALID_MOTIVES)
+            print("Weapons:", case.weapons)
+            print("Motives:", case.motives)
             continue
 
         if user_input.lower().startswith("/accuse "):
@@ -582,9 +1497,12 @@ def run_cli():
                 print("Usage: /accuse <suspect_id> <weapon> <motive>")
                 continue
             accused, weapon, motive = parts[0], parts[1], parts[2]
-            won, score, text = game.make_accusation(accused, weapon, motive)
-            print(text)
-            print(f"\n{'CASE SOLVED!' if won else 'CASE UNSOLVED...'} Score: {score}/100")
+            won, score, report = game.make_accusation(accused, weapon, motive)
+            print(f"\n{'CASE SOLVED!' if won else 'CASE UNSOLVED...'} Score: {score}/100\n")
+            print(report + "\n")
+            for delta in game.narrative.stream():
+                print(delta, end="", flush=True)
+            print()
             break
 
         # Normal interrogation
@@ -597,4 +1515,4 @@ def run_cli():
 
 
 if __name__ == "__main__":
-    run_cli()
+    run_cli(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,206 @@
+"""
+Content-addressed cache of critiqued suspect answers.
+
+Many games open with the same canned questions (the suggested-question
+buttons and the AI agent's question list), so identical
+(case, suspect, question, prior conversation) requests are answered from this
+cache instead of the LLM. Entries live in an in-memory LRU with a TTL and can
+optionally be persisted to SQLite so the cache survives restarts and is shared
+between worker processes. Disk writes are batched by a background thread (as in
+session_store.py), so a turn only updates the in-memory LRU.
+
+Configuration (environment variables):
+    RESPONSE_CACHE_SIZE  in-memory entries (default 2048, 0 disables the cache)
+    RESPONSE_CACHE_TTL   seconds an entry stays valid (default 86400)
+    RESPONSE_CACHE_PATH  SQLite file for the on-disk tier (default: memory only)
+"""
+
+import hashlib
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_STOP = object()
+
+WHITESPACE_RE = re.compile(r"\s+")
+EDGE_PUNCT_RE = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and strip surrounding punctuation."""
+    text = WHITESPACE_RE.sub(" ", question.lower()).strip()
+    return EDGE_PUNCT_RE.sub("", text)
+
+
+def history_digest(history: Iterable[Tuple[str, str]]) -> str:
+    """Stable hash of the exchanges that precede a question."""
+    h = hashlib.sha256()
+    for question, answer in history:
+        h.update(question.encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(answer.encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def cache_key(case_id: str, suspect_id: str, question: str, history: Iterable[Tuple[str, str]]) -> str:
+    raw = "\x1f".join([case_id, suspect_id, normalize_question(question), history_digest(history)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 86400.0, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        self.failures = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, suspect_id TEXT, response TEXT, created REAL)"
+            )
+            self._db.commit()
+            self._writer = threading.Thread(target=self._write_loop, name="response-cache", daemon=True)
+            self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        max_entries = int(os.environ.get("RESPONSE_CACHE_SIZE", "2048"))
+        if max_entries <= 0:
+            return None
+        return cls(
+            max_entries=max_entries,
+            ttl=float(os.environ.get("RESPONSE_CACHE_TTL", "86400")),
+            path=os.environ.get("RESPONSE_CACHE_PATH") or None,
+        )
+
+    def _count(self, suspect_id: str, outcome: str):
+        counters = self._stats.setdefault(suspect_id, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def get(self, key: str, suspect_id: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+        # The disk tier is read without holding the cache lock
+        if entry is None and self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT created, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None and now - row[0] <= self.ttl:
+                entry = (row[0], row[1])
+
+        with self._lock:
+            if entry is None:
+                self._count(suspect_id, "misses")
+                return None
+            self._store(key, entry)
+            self._count(suspect_id, "hits")
+            return entry[1]
+
+    def put(self, key: str, suspect_id: str, response: str):
+        """Store an answer; it is written to the SQLite tier on the background thread."""
+        entry = (time.time(), response)
+        with self._lock:
+            self._store(key, entry)
+        if self._db is not None:
+            self._queue.put(("put", (key, suspect_id, response, entry[0])))
+
+    def _store(self, key: str, entry: Tuple[float, str]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters per suspect id."""
+        with self._lock:
+            return {sid: dict(counters) for sid, counters in self._stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+        if self._db is not None:
+            self._queue.put(("clear", None))
+            self.flush()
+
+    # ------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------
+
+    def _write_loop(self):
+        while True:
+            items = [self._queue.get()]
+            # Write everything that queued up meanwhile in the same transaction
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in items)
+            try:
+                self._write([item for item in items if item is not _STOP])
+            except sqlite3.Error:
+                # A lost cache write only costs a future LLM call
+                self.failures += 1
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, ops: List[Tuple[str, Optional[tuple]]]):
+        with self._db_lock:
+            rows: List[tuple] = []
+            for kind, values in ops:
+                if kind == "clear":
+                    # Puts queued before a clear() are dropped with it
+                    rows = []
+                    self._db.execute("DELETE FROM responses")
+                else:
+                    rows.append(values)
+            if rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO responses (key, suspect_id, response, created) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._db.execute("DELETE FROM responses WHERE created < ?", (rows[-1][3] - self.ttl,))
+            self._db.commit()
+
+    def flush(self):
+        """Block until every queued write has reached SQLite."""
+        if self._db is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._db is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            with self._db_lock:
+                self._db.close()
+
+
+RESPONSE_CACHE = ResponseCache.from_env()
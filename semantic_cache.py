@@ -0,0 +1,276 @@
+"""
+Semantic near-duplicate question cache.
+
+Players ask the same opening question in many ways ("where were you at
+23:15?", "what were you doing when Victor died?"). This module keeps, per
+suspect, a TF-IDF index over first-turn questions that already have a
+critiqued answer, so an equivalent question can reuse that answer without
+touching the LLM. Questions about different people, or asking different
+things, never share an answer: the suspects they name, who they ask about
+("you", "he", "she") and the kind of question ("why", "where", yes/no)
+must match exactly for a hit. Everything runs offline on CPU with NumPy.
+
+Configuration (environment variables):
+    SEMANTIC_CACHE_THRESHOLD  cosine similarity needed for a hit (default 0.6, 0 disables)
+    SEMANTIC_CACHE_SIZE       questions kept per suspect (default 512)
+"""
+
+import os
+import string
+import threading
+import time
+import zlib
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+# ============================================================
+# WORD-SET HELPERS
+# ============================================================
+
+STOPWORDS: Set[str] = {
+    "the", "a", "an", "at", "in", "on", "to", "of", "and", "is", "was", "were", "i", "you",
+    "he", "she", "it", "they", "we", "my", "your", "his", "her", "their", "that", "this",
+}
+
+PUNCT_TABLE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+# Same, but keeps ":" so times like 23:15 survive as one token
+FEATURE_PUNCT_TABLE = str.maketrans({c: " " for c in string.punctuation if c != ":"})
+
+# Question scaffolding that says nothing about what is being asked.
+QUESTION_WORDS: Set[str] = {
+    "did", "do", "does", "how", "what", "when", "can", "could", "would", "will", "anyone",
+    "anybody", "anything", "any", "have", "had", "with", "about", "time", "during", "happened",
+    "or", "there", "be", "been", "are", "am", "me", "tell", "please", "exactly", "around",
+    "who", "for",
+}
+
+# Words that ask about the same thing, mapped onto one concept token.
+SYNONYMS: Dict[str, str] = {
+    **dict.fromkeys(["murder", "murdered", "killed", "kill", "killing", "died", "death", "dead", "crime"], "murder"),
+    **dict.fromkeys(["where", "whereabouts", "doing", "location", "located"], "whereabouts"),
+    **dict.fromkeys(["know", "knew", "relationship", "related", "acquainted"], "relationship"),
+    **dict.fromkeys(["see", "saw", "seen", "hear", "heard", "notice", "noticed", "witness"], "observe"),
+    **dict.fromkeys(["verify", "confirm", "corroborate", "vouch", "alibi"], "alibi"),
+    **dict.fromkeys(["argue", "argued", "argument", "fight", "fought", "conflict", "conflicts",
+                     "disagreement", "disagreements", "quarrel"], "conflict"),
+    **dict.fromkeys(["night", "evening", "tonight"], "night"),
+}
+
+# What kind of answer a question asks for, by its first word; any other
+# question ("Did you kill Victor?") asks for a yes or no.
+INTERROGATIVES: Set[str] = {"why", "how", "when", "where", "who", "what", "which"}
+YES_NO = "yes/no"
+
+# Who a question is about; stopwords, so the TF-IDF features never see them.
+SUBJECTS: Dict[str, str] = {
+    **dict.fromkeys(["you", "your", "yours", "yourself"], "you"),
+    **dict.fromkeys(["he", "him", "his", "himself"], "he"),
+    **dict.fromkeys(["she", "her", "hers", "herself"], "she"),
+    **dict.fromkeys(["they", "them", "their", "theirs", "themselves"], "they"),
+}
+
+
+def normalize_to_set(text: str) -> Set[str]:
+    """Normalize text to a set of lowercase words without punctuation or stopwords."""
+    if not text:
+        return set()
+    words = [w.strip() for w in text.lower().translate(PUNCT_TABLE).split() if w.strip()]
+    return {w for w in words if w not in STOPWORDS}
+
+
+def jaccard_similarity(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    union = len(a | b)
+    return inter / union if union > 0 else 0.0
+
+
+# ============================================================
+# TF-IDF INDEX
+# ============================================================
+
+class _SuspectIndex:
+    """Hashed TF-IDF vectors for one suspect's answered first-turn questions."""
+
+    def __init__(self, dim: int, max_entries: int):
+        self.dim = dim
+        self.max_entries = max_entries
+        self.rows: List[np.ndarray] = []
+        self.answers: List[str] = []
+        # Who each question is about and what it asks (SemanticQuestionCache.guard)
+        self.guards: List[FrozenSet[str]] = []
+        self.df = np.zeros(dim, dtype=np.float32)
+        self._matrix: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+
+    def add(self, tf: np.ndarray, answer: str, guard: FrozenSet[str]):
+        if len(self.rows) >= self.max_entries:
+            self.df -= self.rows.pop(0) > 0
+            self.answers.pop(0)
+            self.guards.pop(0)
+        self.rows.append(tf)
+        self.answers.append(answer)
+        self.guards.append(guard)
+        self.df += tf > 0
+        self._matrix = None
+
+    def _compile(self):
+        n = len(self.rows)
+        self._idf = np.log((1.0 + n) / (1.0 + self.df)) + 1.0
+        matrix = np.vstack(self.rows) * self._idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+
+    def best_match(self, tf: np.ndarray, guard: FrozenSet[str]) -> Tuple[float, int]:
+        """Best-scoring question with the same guard; (0.0, -1) if there is none."""
+        if guard not in self.guards:
+            return 0.0, -1
+        if self._matrix is None:
+            self._compile()
+        query = tf * self._idf
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return 0.0, -1
+        scores = self._matrix @ (query / norm)
+        same = np.fromiter((g == guard for g in self.guards), dtype=bool, count=len(self.guards))
+        scores = np.where(same, scores, -1.0)
+        best = int(np.argmax(scores))
+        return float(scores[best]), best
+
+
+class SemanticQuestionCache:
+    """Per-suspect near-duplicate lookup of first-turn questions."""
+
+    def __init__(self, threshold: float = 0.6, max_entries: int = 512, dim: int = 2048,
+                 concepts: Optional[Dict[str, str]] = None, names: Optional[Dict[str, str]] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dim = dim
+        self.concepts = {**SYNONYMS, **(concepts or {})}
+        # Name word -> suspect id, for the suspects a question mentions
+        self.names: Dict[str, str] = {
+            word: sid for sid, name in (names or {}).items() for word in normalize_to_set(name)
+        }
+
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, _SuspectIndex] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_case(cls, case_file: Dict[str, Any], names: Optional[Dict[str, str]] = None,
+                  **kwargs) -> "SemanticQuestionCache":
+        """
+        Map case-specific words (victim name, time of death) onto shared concepts;
+        `names` maps suspect ids to the names questions may mention them by.
+        """
+        victim = case_file["victim"]
+        concepts = dict.fromkeys(normalize_to_set(victim["name"]), "victim")
+        concepts[victim["time_of_death"]] = "murder"
+        return cls(concepts=concepts, names=names, **kwargs)
+
+    @classmethod
+    def from_env(cls, case_file: Dict[str, Any],
+                 names: Optional[Dict[str, str]] = None) -> Optional["SemanticQuestionCache"]:
+        threshold = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.6"))
+        if threshold <= 0:
+            return None
+        return cls.from_case(
+            case_file,
+            names,
+            threshold=threshold,
+            max_entries=int(os.environ.get("SEMANTIC_CACHE_SIZE", "512")),
+        )
+
+    def features(self, question: str) -> List[str]:
+        text = question.lower().translate(FEATURE_PUNCT_TABLE)
+        words = [w.strip(":") for w in text.split()]
+        return [self.concepts.get(w, w) for w in words
+                if w and w not in STOPWORDS and w not in QUESTION_WORDS]
+
+    def subjects(self, question: str) -> FrozenSet[str]:
+        """
+        The suspects a question names and the pronouns it asks about; only
+        questions with the same subjects may share an answer.
+
+        >>> cache = SemanticQuestionCache(names={"s1": "Eleanor Vance"})
+        >>> sorted(cache.subjects("Where was Eleanor when Victor was killed?"))
+        ['s1']
+        >>> sorted(cache.subjects("Where were you when Victor was killed?"))
+        ['you']
+        """
+        words = question.lower().translate(PUNCT_TABLE).split()
+        return frozenset(self.names.get(w) or SUBJECTS.get(w) for w in words if w in self.names or w in SUBJECTS)
+
+    @staticmethod
+    def asks(question: str) -> str:
+        """
+        The kind of question: its interrogative, or yes/no.
+
+        >>> SemanticQuestionCache.asks("Why did you kill Victor?"), SemanticQuestionCache.asks("Did you kill Victor?")
+        ('why', 'yes/no')
+        """
+        first = next(iter(question.lower().translate(PUNCT_TABLE).split()), "")
+        return first if first in INTERROGATIVES else YES_NO
+
+    def guard(self, question: str) -> FrozenSet[str]:
+        """What must match exactly for two questions to share an answer: subjects() and asks()."""
+        return self.subjects(question) | {f"asks:{self.asks(question)}"}
+
+    def vectorize(self, question: str) -> np.ndarray:
+        tf = np.zeros(self.dim, dtype=np.float32)
+        tokens = self.features(question)
+        for token in tokens:
+            tf[zlib.crc32(token.encode("utf-8")) % self.dim] += 1.0
+        # Bigrams add a little word-order sensitivity without dominating recall
+        for a, b in zip(tokens, tokens[1:]):
+            tf[zlib.crc32(f"{a} {b}".encode("utf-8")) % self.dim] += 0.5
+        # Sublinear term frequency
+        return np.log1p(tf)
+
+    def add(self, suspect_id: str, question: str, answer: str):
+        tf = self.vectorize(question)
+        if not tf.any():
+            return
+        with self._lock:
+            index = self._indexes.get(suspect_id)
+            if index is None:
+                index = self._indexes[suspect_id] = _SuspectIndex(self.dim, self.max_entries)
+            index.add(tf, answer, self.guard(question))
+
+    def lookup(self, suspect_id: str, question: str) -> Optional[str]:
+        """Return a cached answer for a near-duplicate question, if any."""
+        start = time.perf_counter()
+        tf = self.vectorize(question)
+        guard = self.guard(question)
+        with self._lock:
+            index = self._indexes.get(suspect_id)
+            score, best = index.best_match(tf, guard) if index is not None else (0.0, -1)
+            answer = index.answers[best] if best >= 0 and score >= self.threshold else None
+
+            stats = self._stats.setdefault(
+                suspect_id, {"hits": 0, "misses": 0, "lookups": 0, "total_lookup_us": 0.0, "max_lookup_us": 0.0}
+            )
+            elapsed_us = (time.perf_counter() - start) * 1e6
+            stats["hits" if answer is not None else "misses"] += 1
+            stats["lookups"] += 1
+            stats["total_lookup_us"] += elapsed_us
+            stats["max_lookup_us"] = max(stats["max_lookup_us"], elapsed_us)
+        return answer
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss counters and lookup latency per suspect id."""
+        with self._lock:
+            report = {}
+            for sid, s in self._stats.items():
+                report[sid] = {
+                    "hits": s["hits"],
+                    "misses": s["misses"],
+                    "mean_lookup_us": s["total_lookup_us"] / s["lookups"] if s["lookups"] else 0.0,
+                    "max_lookup_us": s["max_lookup_us"],
+                    "indexed_questions": len(self._indexes[sid].rows) if sid in self._indexes else 0,
+                }
+            return report
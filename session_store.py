@@ -0,0 +1,171 @@
+"""
+Persistent game sessions.
+
+Every logged exchange, memory summary, notes edit, accusation and case
+summary is appended as one event row to a SQLite database in WAL mode. Rows
+are written by a single background thread that batches whatever has queued up
+into one transaction, so a turn only pays for putting an event on a queue. A
+session is resumed by reading its events back in order; no LLM call is replayed.
+
+Configuration (environment variables):
+    SESSION_STORE_PATH  SQLite file for saved sessions (default: sessions are not saved)
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+
+@dataclass
+class SessionRecord:
+    """Everything needed to rebuild a saved game."""
+    session_id: str
+    case_id: str = ""
+    # (suspect_id, question, answer) in the order they were logged
+    exchanges: List[Tuple[str, str, str]] = field(default_factory=list)
+    # suspect_id -> (summary, first exchange not folded into it)
+    memory: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    # "general" and suspect ids -> notes text
+    notes: Dict[str, str] = field(default_factory=dict)
+    accusation: Optional[Dict[str, Any]] = None
+    # The judge's case summary, saved once it has been written
+    narrative: str = ""
+
+
+class SessionStore:
+    """Append-only event log of game sessions in SQLite."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Durable across process crashes; only an OS crash can lose the last commits
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, case_id TEXT, created REAL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT, kind TEXT,"
+            " suspect_id TEXT, payload TEXT, created REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_session ON events (session_id, id)")
+        self._db.commit()
+
+        self.failures = 0
+        self._db_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="session-store", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionStore"]:
+        path = os.environ.get("SESSION_STORE_PATH")
+        return cls(path) if path else None
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    def start(self, session_id: str, case_id: str):
+        """Register a session (no-op if it already exists)."""
+        self._queue.put(("session", (session_id, case_id, time.time())))
+
+    def append(self, session_id: str, kind: str, payload: Dict[str, Any], suspect_id: Optional[str] = None):
+        """Queue one event; it is written on the background thread."""
+        self._queue.put(("event", (session_id, kind, suspect_id, json.dumps(payload), time.time())))
+
+    def _write_loop(self):
+        while True:
+            items = [self._queue.get()]
+            # Write everything that queued up meanwhile in the same transaction
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in items)
+            rows = [item for item in items if item is not _STOP]
+            try:
+                self._write(rows)
+            except sqlite3.Error:
+                # Losing a save must never break the game
+                self.failures += 1
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, rows: List[Tuple[str, tuple]]):
+        sessions = [values for kind, values in rows if kind == "session"]
+        events = [values for kind, values in rows if kind == "event"]
+        with self._db_lock:
+            if sessions:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO sessions (session_id, case_id, created) VALUES (?, ?, ?)", sessions
+                )
+            if events:
+                self._db.executemany(
+                    "INSERT INTO events (session_id, kind, suspect_id, payload, created) VALUES (?, ?, ?, ?, ?)",
+                    events,
+                )
+            self._db.commit()
+
+    def flush(self):
+        """Block until every queued event is written."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._db_lock:
+            self._db.close()
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def exists(self, session_id: str) -> bool:
+        self.flush()
+        with self._db_lock:
+            row = self._db.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row is not None
+
+    def load(self, session_id: str) -> Optional[SessionRecord]:
+        """Fold a session's events into a SessionRecord (None if the session is unknown)."""
+        self.flush()
+        with self._db_lock:
+            session = self._db.execute(
+                "SELECT case_id FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if session is None:
+                return None
+            events = self._db.execute(
+                "SELECT kind, suspect_id, payload FROM events WHERE session_id = ? ORDER BY id", (session_id,)
+            ).fetchall()
+
+        record = SessionRecord(session_id=session_id, case_id=session[0])
+        for kind, suspect_id, payload in events:
+            data = json.loads(payload)
+            if kind == "exchange":
+                record.exchanges.append((suspect_id, data["question"], data["answer"]))
+            elif kind == "memory":
+                record.memory[suspect_id] = (data["summary"], data["start"])
+            elif kind == "notes":
+                record.notes.update(data)
+            elif kind == "accusation":
+                record.accusation = data
+            elif kind == "narrative":
+                record.narrative = data["text"]
+        return record
+
+
+SESSION_STORE = SessionStore.from_env()
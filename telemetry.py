@@ -0,0 +1,257 @@
+"""
+Per-turn instrumentation.
+
+The game engine wraps each stage of a turn (suspect generation, critique,
+logging, accusation evaluation) in a Span carrying wall time, prompt and
+completion token counts from the agno run response, and flags such as
+cache hits or skipped critiques. Finished spans go to every configured sink:
+
+    memory  in-process ring buffer, aggregated for the Streamlit sidebar
+    jsonl   one JSON object per span appended to a file
+    otel    OpenTelemetry tracer (needs `opentelemetry-api`; configure the
+            SDK/exporter as usual, e.g. with OTEL_EXPORTER_OTLP_ENDPOINT)
+
+Configuration (environment variables):
+    TELEMETRY_SINKS       comma-separated sinks (default "memory", "" disables)
+    TELEMETRY_RING_SIZE   spans kept by the memory sink (default 4096)
+    TELEMETRY_JSONL_PATH  file for the jsonl sink (default "telemetry.jsonl")
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# ============================================================
+# SPANS
+# ============================================================
+
+@dataclass
+class Span:
+    """One timed stage of a turn."""
+
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    session_id: Optional[str] = None
+    suspect_id: Optional[str] = None
+    start_time: float = 0.0  # epoch seconds
+    duration_ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def add_usage(self, metrics: Any):
+        """Add token counts from an agno RunOutput.metrics (or None)."""
+        if metrics is None:
+            return
+        self.prompt_tokens += getattr(metrics, "input_tokens", 0) or 0
+        self.completion_tokens += getattr(metrics, "output_tokens", 0) or 0
+
+
+def timed(deltas: Iterator[str], span: Span) -> Iterator[str]:
+    """Pass a stream through, adding the time spent producing it to span.duration_ms."""
+    while True:
+        start = time.perf_counter()
+        try:
+            delta = next(deltas)
+        except StopIteration:
+            span.duration_ms += (time.perf_counter() - start) * 1000
+            return
+        span.duration_ms += (time.perf_counter() - start) * 1000
+        yield delta
+
+
+# ============================================================
+# SINKS
+# ============================================================
+
+class RingBufferSink:
+    """Keeps the most recent spans in memory and aggregates them per stage."""
+
+    def __init__(self, max_spans: int = 4096):
+        self._lock = threading.Lock()
+        self._spans: "deque[Span]" = deque(maxlen=max_spans)
+
+    def on_start(self, span: Span):
+        pass
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self, session_id: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Count, latency percentiles, tokens and flag counts per span name."""
+        groups: Dict[str, List[Span]] = {}
+        for span in self.spans():
+            if session_id is None or span.session_id == session_id:
+                groups.setdefault(span.name, []).append(span)
+
+        report = {}
+        for name, spans in groups.items():
+            durations = sorted(s.duration_ms for s in spans)
+            row = {
+                "count": len(spans),
+                "mean_ms": sum(durations) / len(durations),
+                "p50_ms": durations[len(durations) // 2],
+                "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                "prompt_tokens": sum(s.prompt_tokens for s in spans),
+                "completion_tokens": sum(s.completion_tokens for s in spans),
+            }
+            # Boolean attributes (cached, critique_skipped, ...) become counts
+            for span in spans:
+                for key, value in span.attributes.items():
+                    if isinstance(value, bool):
+                        row[key] = row.get(key, 0) + int(value)
+            report[name] = row
+        return report
+
+    def close(self):
+        pass
+
+
+class JsonlSink:
+    """Appends one JSON line per finished span."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def on_start(self, span: Span):
+        pass
+
+    def export(self, span: Span):
+        line = json.dumps(asdict(span), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class OTelSink:
+    """Mirrors spans onto an OpenTelemetry tracer, keeping the parent/child structure."""
+
+    def __init__(self, tracer_name: str = "murder_mystery"):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("The otel telemetry sink requires `opentelemetry-api`: "
+                              "pip install opentelemetry-api opentelemetry-sdk") from e
+        self._trace = trace
+        self._tracer = trace.get_tracer(tracer_name)
+        self._lock = threading.Lock()
+        self._open: Dict[str, Any] = {}
+
+    def on_start(self, span: Span):
+        with self._lock:
+            parent = self._open.get(span.parent_id)
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(span.name, context=context, start_time=int(span.start_time * 1e9))
+        with self._lock:
+            self._open[span.span_id] = otel_span
+
+    def export(self, span: Span):
+        with self._lock:
+            otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attribute("gen_ai.usage.input_tokens", span.prompt_tokens)
+        otel_span.set_attribute("gen_ai.usage.output_tokens", span.completion_tokens)
+        if span.session_id:
+            otel_span.set_attribute("game.session_id", span.session_id)
+        if span.suspect_id:
+            otel_span.set_attribute("game.suspect_id", span.suspect_id)
+        for key, value in span.attributes.items():
+            if isinstance(value, (bool, int, float, str)):
+                otel_span.set_attribute(f"game.{key}", value)
+        otel_span.end(end_time=int((span.start_time + span.duration_ms / 1000) * 1e9))
+
+    def close(self):
+        pass
+
+
+# ============================================================
+# TELEMETRY
+# ============================================================
+
+class Telemetry:
+    """Creates spans and fans finished ones out to the sinks."""
+
+    def __init__(self, sinks: Optional[List[Any]] = None):
+        self.sinks = list(sinks or [])
+        self.ring: Optional[RingBufferSink] = next(
+            (s for s in self.sinks if isinstance(s, RingBufferSink)), None
+        )
+
+    @classmethod
+    def from_env(cls) -> "Telemetry":
+        sinks = []
+        for name in os.environ.get("TELEMETRY_SINKS", "memory").split(","):
+            name = name.strip().lower()
+            if name == "memory":
+                sinks.append(RingBufferSink(int(os.environ.get("TELEMETRY_RING_SIZE", "4096"))))
+            elif name == "jsonl":
+                sinks.append(JsonlSink(os.environ.get("TELEMETRY_JSONL_PATH", "telemetry.jsonl")))
+            elif name == "otel":
+                sinks.append(OTelSink())
+            elif name:
+                raise ValueError(f"Unknown telemetry sink '{name}'. Expected memory, jsonl or otel")
+        return cls(sinks)
+
+    def start_span(self, name: str, parent: Optional[Span] = None, session_id: Optional[str] = None,
+                   suspect_id: Optional[str] = None, **attributes) -> Span:
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent is not None else None,
+            session_id=session_id or (parent.session_id if parent is not None else None),
+            suspect_id=suspect_id or (parent.suspect_id if parent is not None else None),
+            start_time=time.time(),
+            attributes=attributes,
+        )
+        for sink in self.sinks:
+            sink.on_start(span)
+        return span
+
+    def end_span(self, span: Span):
+        for sink in self.sinks:
+            sink.export(span)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **kwargs) -> Iterator[Span]:
+        """Time a block; the span is exported when the block exits, even on error."""
+        span = self.start_span(name, parent=parent, **kwargs)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            self.end_span(span)
+
+    def summary(self, session_id: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        return self.ring.summary(session_id) if self.ring is not None else {}
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+TELEMETRY = Telemetry.from_env()
@@ -0,0 +1,341 @@
+"""
+Claims, timeline and contradictions over what the suspects said.
+
+Every logged answer is read sentence by sentence for claims: a person (the
+speaker, or a suspect they name) put in a place (a room, or away from the
+premises) at a time (a clock time, or "at the time of the murder"), plus the
+objects (weapons) mentioned. Claims are kept per person and per place, so the
+timeline of anyone can be read back in order, and a new claim is only checked
+against claims putting the same person somewhere else: a turn costs
+O(new claims) however long the game gets.
+
+Two claims putting one person in two places at overlapping times are a
+contradiction: one suspect's alibi against another's sighting, or a suspect
+changing their own story. Sentences that put someone at the scene around the
+time of death, or mention a weapon or motive, are key clues.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from cases import Case
+from evidence import MOTIVE_TERMS, NEAR_DEATH_MINUTES, name_tokens, negated
+from leak_detector import TIME_RE, split_sentences, stem, tokenize
+
+# Rooms a claim can put someone in; a case's crime scene is added to these
+ROOMS: List[str] = [
+    "library", "study", "bedroom", "basement", "kitchen", "garden", "laundry room", "dining room",
+    "drawing room", "wine cellar", "conservatory", "gallery", "billiard room", "attic", "ballroom",
+    "boathouse", "sauna", "trophy room", "chapel", "crypt", "bell tower", "scriptorium", "refectory",
+    "penthouse", "cloakroom", "rooftop terrace", "engine room", "chart room", "dining car", "lounge car",
+    "baggage car", "observation car", "captain's cabin", "promenade deck", "greenhouse", "stables",
+]
+# Words of a room name that do not tell rooms apart; a room is known by its
+# last other word ("laundry room" is "laundry", "wine cellar" is "cellar")
+GENERIC_ROOM_WORDS = {"room", "car", "deck"}
+
+# Where someone is after they "left": not on the premises at all
+AWAY = "away"
+
+# Phrases meaning "when the murder happened"
+MURDER_TIME_RE = re.compile(
+    r"\b(when (the murder|it) (occurred|happened)|during the (incident|murder)|at the time"
+    r"|time of (the )?(murder|death)|all evening|that night)\b",
+    re.IGNORECASE,
+)
+
+# Clause boundaries within a sentence: ", and", ", but", ";" and " and I"
+CLAUSE_SPLIT_RE = re.compile(r",\s*(?:and|but|while|when|then)\b|;|\s+and\s+(?=I\b)", re.IGNORECASE)
+
+SIGHTING_VERBS = {stem(t) for t in ("saw", "seen", "see", "spotted", "noticed", "watched", "heard")}
+
+# Minutes either side of a stated clock time ("around 23:20")
+TIME_TOLERANCE = 10
+# Two claims only conflict if their windows share more than this many minutes,
+# i.e. two clock times less than TIME_TOLERANCE apart
+MIN_OVERLAP = TIME_TOLERANCE
+# How long "I left at 22:45" keeps someone away
+AWAY_MINUTES = 4 * 60
+
+
+def _minutes(clock: str) -> int:
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+@dataclass(frozen=True)
+class Claim:
+    """`speaker` says `subject` was at `place` between minutes `start` and `end`."""
+    speaker: str
+    subject: str
+    place: str
+    start: int
+    end: int
+    when: str  # "23:20", "the time of the murder"
+    objects: Tuple[str, ...]
+    sentence: str
+    exchange: int  # the speaker's exchange number, 1-based
+
+    def overlaps(self, other: "Claim") -> bool:
+        """
+        True if both claims cover the same moment, beyond the slack of "around".
+
+        >>> study = Claim("s1", "s1", "study", 22 * 60 + 50, 23 * 60 + 10, "23:00", (), "", 1)
+        >>> library = Claim("s3", "s1", "library", 23 * 60 + 10, 23 * 60 + 30, "23:20", (), "", 1)
+        >>> study.overlaps(library)
+        False
+        >>> library.overlaps(Claim("s1", "s1", "bedroom", 23 * 60 + 5, 23 * 60 + 25, "23:15", (), "", 2))
+        True
+        """
+        return min(self.end, other.end) - max(self.start, other.start) > MIN_OVERLAP
+
+
+@dataclass
+class Contradiction:
+    subject: str
+    first: Claim
+    second: Claim
+    text: str
+    # What to ask the subject about it
+    question: str
+
+
+@dataclass
+class TimelineVocabulary:
+    """A case's names, rooms, weapons and motives as stemmed tokens; built once per case."""
+    names: Dict[str, str]
+    scene: str
+    setting: str
+    time_of_death: int
+    name_tokens: Dict[str, str]
+    # Distinctive stemmed word -> room name
+    rooms: Dict[str, str]
+    weapon_tokens: Dict[str, str]
+    motive_tokens: Set[str]
+
+    @classmethod
+    def build(cls, suspect_names: Dict[str, str], weapons: Iterable[str], motives: Iterable[str],
+              scene: str, setting: str, time_of_death: str, rooms: Iterable[str] = ROOMS) -> "TimelineVocabulary":
+        room_tokens: Dict[str, str] = {}
+        for room in [scene.lower(), *rooms]:
+            words = [t for t in tokenize(room) if t not in GENERIC_ROOM_WORDS]
+            if words:
+                room_tokens.setdefault(words[-1], room)
+        return cls(
+            names=dict(suspect_names),
+            scene=scene.lower(),
+            setting=setting,
+            time_of_death=_minutes(time_of_death),
+            name_tokens=name_tokens(suspect_names, [scene, setting]),
+            rooms=room_tokens,
+            weapon_tokens={tokenize(w)[-1]: w for w in weapons if tokenize(w)},
+            motive_tokens={stem(term) for m in motives for term in MOTIVE_TERMS.get(m, [m])},
+        )
+
+    @classmethod
+    def from_case(cls, case: Case) -> "TimelineVocabulary":
+        victim = case.case_file["victim"]
+        return cls.build(
+            suspect_names={sid: profile.name for sid, profile in case.suspects.items()},
+            weapons=case.weapons,
+            motives=case.motives,
+            # "Library of Blackwood Mansion" -> "Library"
+            scene=victim["location"].split(" of ")[0],
+            setting=case.setting,
+            time_of_death=victim["time_of_death"],
+        )
+
+
+LEFT_TOKEN = stem("left")
+
+
+class Timeline:
+    """Incremental claim extraction, per-person timelines and contradiction detection for one game."""
+
+    def __init__(self, vocabulary: TimelineVocabulary):
+        # Shared, read-only tables of the case
+        self.vocabulary = vocabulary
+        self.names = vocabulary.names
+        self.scene = vocabulary.scene
+        self.setting = vocabulary.setting
+        self.time_of_death = vocabulary.time_of_death
+        self.name_tokens = vocabulary.name_tokens
+        self.rooms = vocabulary.rooms
+        self.weapon_tokens = vocabulary.weapon_tokens
+        self.motive_tokens = vocabulary.motive_tokens
+
+        # subject -> place -> claims; every claim appears once
+        self.claims: Dict[str, Dict[str, List[Claim]]] = {}
+        self._claim_keys: Set[Tuple[str, str, str, int, int]] = set()
+        self.contradictions: List[Contradiction] = []
+        self._contradiction_keys: Set[Tuple[str, frozenset]] = set()
+        self.clues: List[str] = []
+        self._clue_keys: Set[str] = set()
+
+    @classmethod
+    def from_case(cls, case: Case) -> "Timeline":
+        """An empty timeline for a game of `case`; the case's token tables are built on first use only."""
+        return cls(case.artifact("timeline_vocabulary", lambda: TimelineVocabulary.from_case(case)))
+
+    # ------------------------------------------------------------
+    # Extraction
+    # ------------------------------------------------------------
+
+    def _window(self, text: str) -> Optional[Tuple[int, int, str]]:
+        """(start, end, label) of the time a text talks about, or None."""
+        times = TIME_RE.findall(text)
+        if times:
+            minutes = _minutes(times[0])
+            return minutes - TIME_TOLERANCE, minutes + TIME_TOLERANCE, times[0]
+        if MURDER_TIME_RE.search(text):
+            return (self.time_of_death - NEAR_DEATH_MINUTES, self.time_of_death + NEAR_DEATH_MINUTES,
+                    "the time of the murder")
+        return None
+
+    def _denied(self, words: List[str]) -> bool:
+        """Whether a negation comes before the place or time ("I was not in the library at 23:15")."""
+        return negated(words, lambda w: w in self.rooms or ":" in w or w == LEFT_TOKEN)
+
+    def _place(self, words: List[str]) -> Optional[str]:
+        """The first room mentioned; "left" without a room means away from the premises."""
+        room = next((self.rooms[w] for w in words if w in self.rooms), None)
+        if room is None and LEFT_TOKEN in words:
+            return AWAY
+        return room
+
+    def extract(self, speaker: str, question: str, answer: str, exchange: int = 0) -> List[Claim]:
+        """
+        The claims of one answer, clause by clause, so "I was in the basement,
+        and I heard a scream from the library" keeps the speaker's own alibi. A
+        clause without a time of its own takes its sentence's, then the
+        question's ("Where were you at the time of the murder?").
+
+        >>> vocabulary = TimelineVocabulary.build({"s1": "Lydia Blackwood", "s3": "Eleanor Wright"}, [], [],
+        ...                                       "Library", "Blackwood Mansion", "23:15")
+        >>> answer = "I was in the basement doing laundry, and I heard a scream from the library at 23:15."
+        >>> [(c.subject, c.place, c.when) for c in Timeline(vocabulary).extract("s3", "", answer)]
+        [('s3', 'basement', '23:15')]
+        """
+        claims = []
+        question_window = self._window(question)
+        for sentence in split_sentences(answer):
+            sentence_window = self._window(sentence) or question_window
+            for clause in CLAUSE_SPLIT_RE.split(sentence):
+                words = tokenize(clause)
+                tokens = set(words)
+                if self._denied(words):
+                    continue
+                place = self._place(words)
+                window = self._window(clause) or sentence_window
+                if place is None or window is None:
+                    continue
+                start, end, when = window
+                if place == AWAY:
+                    start, end = start + TIME_TOLERANCE, start + TIME_TOLERANCE + AWAY_MINUTES
+                subjects = {self.name_tokens[t] for t in tokens if t in self.name_tokens} - {speaker}
+                # "I saw Lydia in the library" places Lydia, not the speaker
+                if "i" in tokens and not tokens & SIGHTING_VERBS:
+                    subjects.add(speaker)
+                objects = tuple(sorted({self.weapon_tokens[t] for t in tokens if t in self.weapon_tokens}))
+                for subject in sorted(subjects):
+                    claims.append(Claim(speaker, subject, place, start, end, when, objects, sentence.strip(),
+                                        exchange))
+        return claims
+
+    # ------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------
+
+    def add(self, speaker: str, question: str, answer: str,
+            exchange: int = 0) -> Tuple[List[Contradiction], List[str]]:
+        """Ingest one logged answer; returns the contradictions and key clues it revealed."""
+        contradictions: List[Contradiction] = []
+        for claim in self.extract(speaker, question, answer, exchange):
+            key = (claim.speaker, claim.subject, claim.place, claim.start, claim.end)
+            if key in self._claim_keys:
+                continue
+            self._claim_keys.add(key)
+            places = self.claims.setdefault(claim.subject, {})
+            for place, others in places.items():
+                if place == claim.place:
+                    continue
+                for other in others:
+                    if other.overlaps(claim):
+                        contradiction = self._contradiction(other, claim)
+                        if contradiction is not None:
+                            contradictions.append(contradiction)
+            places.setdefault(claim.place, []).append(claim)
+
+        clues = [clue for clue in self._clues(speaker, answer) if clue not in self._clue_keys]
+        self._clue_keys.update(clues)
+        self.contradictions.extend(contradictions)
+        self.clues.extend(clues)
+        return contradictions, clues
+
+    def _clues(self, speaker: str, answer: str) -> List[str]:
+        """
+        The sentences of an answer that are key clues; denying being at the
+        scene is not one.
+
+        >>> vocabulary = TimelineVocabulary.build({"s1": "Lydia Blackwood", "s3": "Eleanor Wright"}, [], [],
+        ...                                       "Library", "Blackwood Mansion", "23:15")
+        >>> timeline = Timeline(vocabulary)
+        >>> timeline._clues("s3", "I was not in the library at 23:15.")
+        []
+        >>> timeline._clues("s3", "I was in the library at 23:15.")
+        ['Eleanor Wright: "I was in the library at 23:15."']
+        """
+        clues = []
+        for sentence in split_sentences(answer):
+            words = tokenize(sentence)
+            tokens = set(words)
+            window = self._window(sentence)
+            at_scene = (self._place(words) == self.scene and window is not None and not self._denied(words)
+                        and window[0] <= self.time_of_death + NEAR_DEATH_MINUTES
+                        and self.time_of_death - NEAR_DEATH_MINUTES <= window[1])
+            if at_scene or tokens & self.weapon_tokens.keys() or tokens & self.motive_tokens:
+                clues.append(f'{self.names[speaker]}: "{sentence.strip()}"')
+        return clues
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def events(self, subject: str) -> List[Claim]:
+        """Everything claimed about where `subject` was, in time order."""
+        return sorted((c for claims in self.claims.get(subject, {}).values() for c in claims),
+                      key=lambda c: (c.start, c.exchange))
+
+    def _where(self, claim: Claim) -> str:
+        if claim.place == AWAY:
+            return f"away from {self.setting} from {claim.when}"
+        return f"in the {claim.place} at {claim.when}"
+
+    def _contradiction(self, earlier: Claim, later: Claim) -> Optional[Contradiction]:
+        subject = later.subject
+        key = (subject, frozenset({(earlier.speaker, earlier.place), (later.speaker, later.place)}))
+        if key in self._contradiction_keys:
+            return None
+        self._contradiction_keys.add(key)
+
+        name = self.names[subject]
+        if earlier.speaker == later.speaker == subject:
+            text = (f"{name}'s story changed: they said they were {self._where(earlier)}, "
+                    f"but also {self._where(later)}.")
+            question = (f"You told me you were {self._where(earlier)}, but also {self._where(later)}. "
+                        f"Which is true?")
+        elif subject in (earlier.speaker, later.speaker):
+            own, other = (earlier, later) if earlier.speaker == subject else (later, earlier)
+            witness = self.names[other.speaker]
+            text = (f"{name} says they were {self._where(own)}, but {witness} places {name} "
+                    f"{self._where(other)}.")
+            question = (f"{witness} places you {self._where(other)}, yet you say you were "
+                        f"{self._where(own)}. How do you explain that?")
+        else:
+            first, second = self.names[earlier.speaker], self.names[later.speaker]
+            text = (f"{first} places {name} {self._where(earlier)}, but {second} places {name} "
+                    f"{self._where(later)}.")
+            question = (f"{first} places you {self._where(earlier)}, but {second} places you "
+                        f"{self._where(later)}. Where were you really?")
+        return Contradiction(subject, earlier, later, text, question)
@@ -0,0 +1,209 @@
+"""
+A game's interrogation transcript.
+
+The Transcript is the only copy of the exchanges in a game: the per-suspect
+logs the engine replays and caches on, the UI's chat history and the
+accusation prompt are all read straight from it. Each exchange is stored once
+as an (question, answer) tuple, with questions and indexed words interned so
+the canned questions asked in every game share one string.
+
+Every exchange is indexed as it is appended: its answer's words go into an
+inverted index (word -> exchanges mentioning it), and its question into a
+MinHash/LSH index of asked questions. Looking up keywords from the other
+suspects, the exchanges that mention a word, or questions similar to a new
+one therefore costs the same however long the transcripts get, instead of
+re-normalizing every message and comparing every pair of questions.
+
+Near-duplicates are questions whose word sets (semantic_cache.normalize_to_set)
+have a Jaccard similarity at or above the threshold. LSH narrows the
+comparison down to a handful of candidates, which are then checked exactly.
+"""
+
+import sys
+import threading
+import zlib
+from typing import Callable, Dict, Generic, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, TypeVar
+
+import numpy as np
+
+from semantic_cache import jaccard_similarity, normalize_to_set
+
+K = TypeVar("K", bound=Hashable)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class Exchange(NamedTuple):
+    question: str
+    answer: str
+
+
+# ============================================================
+# MINHASH / LSH
+# ============================================================
+
+class MinHashLSH(Generic[K]):
+    """
+    Near-duplicate lookup of word sets by Jaccard similarity.
+
+    With `words_of`, stored sets are not kept: candidates are re-derived from
+    their key when a query needs to verify them.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 32, bands: int = 16, seed: int = 1,
+                 words_of: Optional[Callable[[K], Set[str]]] = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._words_of = words_of
+        self._sets: Dict[K, Set[str]] = {}
+        self._size = 0
+        # hash(band, band signature) -> keys. A collision only adds a candidate,
+        # which the exact check then rejects.
+        self._buckets: Dict[int, List[K]] = {}
+
+    def _band_keys(self, words: Set[str]) -> List[int]:
+        hashes = np.array([zlib.crc32(w.encode("utf-8")) for w in words], dtype=np.uint64)
+        signature = ((self._a * hashes + self._b) % _MERSENNE_PRIME).min(axis=1).tolist()
+        return [hash((i, *signature[i * self.rows:(i + 1) * self.rows])) for i in range(self.bands)]
+
+    def _similar(self, words: Set[str], band_keys: List[int]) -> List[K]:
+        candidates: Dict[K, None] = {}
+        for band_key in band_keys:
+            candidates.update(dict.fromkeys(self._buckets.get(band_key, ())))
+        words_of = self._words_of or self._sets.__getitem__
+        return [k for k in candidates if jaccard_similarity(words, words_of(k)) >= self.threshold]
+
+    def _insert(self, key: K, words: Set[str], band_keys: List[int]):
+        if self._words_of is None:
+            self._sets[key] = words
+        self._size += 1
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def add(self, key: K, words: Set[str]):
+        if not words:
+            return
+        band_keys = self._band_keys(words)
+        with self._lock:
+            self._insert(key, words, band_keys)
+
+    def query(self, words: Set[str]) -> List[K]:
+        """Keys of the stored sets at least `threshold` similar to `words`."""
+        if not words:
+            return []
+        band_keys = self._band_keys(words)
+        with self._lock:
+            return self._similar(words, band_keys)
+
+    def add_if_new(self, key: K, words: Set[str]) -> bool:
+        """Store `words` unless a similar set is already stored; True if stored (empty sets always pass)."""
+        if not words:
+            return True
+        band_keys = self._band_keys(words)
+        with self._lock:
+            if self._similar(words, band_keys):
+                return False
+            self._insert(key, words, band_keys)
+            return True
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# ============================================================
+# TRANSCRIPT
+# ============================================================
+
+class Transcript:
+    """Per-suspect exchange logs plus the word and question indexes over them."""
+
+    def __init__(self, suspect_ids: Iterable[str], question_threshold: float = 0.7):
+        self._lock = threading.Lock()
+        # suspect id -> exchanges in the order they were logged
+        self.logs: Dict[str, List[Exchange]] = {sid: [] for sid in suspect_ids}
+        # Every exchange as (suspect id, position in its log); indexes refer to
+        # exchanges by their number in this list.
+        self.order: List[Tuple[str, int]] = []
+        self.postings: Dict[str, List[int]] = {}
+        # Distinct answer words per suspect, in the order they first came up
+        self.keywords: Dict[str, List[str]] = {sid: [] for sid in self.logs}
+        self.seen_words: Dict[str, Set[str]] = {sid: set() for sid in self.logs}
+        self.questions: MinHashLSH[int] = MinHashLSH(question_threshold, words_of=self._question_words)
+
+    def _question_words(self, number: int) -> Set[str]:
+        sid, position = self.order[number]
+        return normalize_to_set(self.logs[sid][position].question)
+
+    def append(self, suspect_id: str, question: str, answer: str) -> int:
+        """Log and index one exchange; costs O(words in the exchange). Returns its position in the log."""
+        question = sys.intern(question)
+        words = [sys.intern(w) for w in sorted(normalize_to_set(answer))]
+        with self._lock:
+            log = self.logs[suspect_id]
+            log.append(Exchange(question, answer))
+            position = len(log) - 1
+            number = len(self.order)
+            self.order.append((suspect_id, position))
+            keywords, seen = self.keywords[suspect_id], self.seen_words[suspect_id]
+            for word in words:
+                if word not in seen:
+                    seen.add(word)
+                    keywords.append(word)
+                self.postings.setdefault(word, []).append(number)
+        self.questions.add(number, normalize_to_set(question))
+        return position
+
+    def messages(self, suspect_id: str) -> Iterator[Tuple[str, str]]:
+        """(role, content) chat messages for one suspect, read straight from the log."""
+        for question, answer in self.logs[suspect_id]:
+            yield "user", question
+            yield "assistant", answer
+
+    def search(self, word: str) -> List[Tuple[str, str, str]]:
+        """(suspect_id, question, answer) of the exchanges whose answer mentions `word`."""
+        word = word.strip().lower()
+        with self._lock:
+            refs = [self.order[n] for n in self.postings.get(word, ())]
+            return [(sid, *self.logs[sid][position]) for sid, position in refs]
+
+    def other_keywords(self, suspect_id: str, cursor: Dict[str, int], limit: int,
+                       min_length: int = 3) -> List[str]:
+        """
+        Up to `limit` words other suspects used in their answers that the caller has not seen yet.
+
+        `cursor` (suspect id -> words consumed) is advanced, so repeated calls
+        only look at words added since the previous one.
+        """
+        found: List[str] = []
+        with self._lock:
+            for sid, keywords in self.keywords.items():
+                if sid == suspect_id:
+                    continue
+                start = cursor.get(sid, 0)
+                for position in range(start, len(keywords)):
+                    if len(found) >= limit:
+                        return found
+                    cursor[sid] = position + 1
+                    word = keywords[position]
+                    if len(word) >= min_length and word not in found:
+                        found.append(word)
+        return found
+
+    def similar_questions(self, question: str) -> List[Tuple[str, str]]:
+        """(suspect_id, question) of asked questions that are near-duplicates of `question`."""
+        numbers = self.questions.query(normalize_to_set(question))
+        with self._lock:
+            refs = [self.order[n] for n in numbers]
+            return [(sid, self.logs[sid][position].question) for sid, position in refs]
+
+    def __len__(self) -> int:
+        return len(self.order)
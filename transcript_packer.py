@@ -0,0 +1,168 @@
+"""
+Token-budgeted interrogation transcript for the accusation judge.
+
+Instead of the last few exchanges per suspect, the judge sees the exchanges
+that carry the most evidence, wherever they happened in the game. Every
+answer is cut down to its sentences with evidence value (times, places,
+weapons, motives, other suspects, contradicted alibis; see
+EvidenceBoard.evidence_value), and a suspect repeating themselves costs
+nothing, so small talk takes up no tokens. Exchanges are then packed into a
+token budget: first the best exchange of every suspect interviewed, then the
+rest by evidence per token. The judge's prompt, and so its latency, stays
+bounded however long the game ran.
+
+Configuration (environment variables):
+    JUDGE_TRANSCRIPT_TOKENS  token budget of the transcript section (default 1200)
+    TRANSCRIPT_TOKENIZER     how tokens are counted: "auto" (tiktoken, a requirement;
+                             an estimate if its encoding cannot be loaded),
+                             "tiktoken[:encoding]", "hf:<tokenizer name>" (Hugging
+                             Face tokenizers) or "estimate"; resolved on first use,
+                             not at import
+"""
+
+import functools
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from backends import estimate_tokens
+from evidence import EvidenceBoard
+from leak_detector import split_sentences
+
+TokenCounter = Callable[[str], int]
+
+JUDGE_TRANSCRIPT_TOKENS = int(os.environ.get("JUDGE_TRANSCRIPT_TOKENS", "1200"))
+
+# cl100k_base is close enough to the Llama 3 tokenizer for budgeting
+DEFAULT_TIKTOKEN_ENCODING = "cl100k_base"
+
+
+# ============================================================
+# TOKEN COUNTING
+# ============================================================
+
+@functools.lru_cache(maxsize=None)
+def token_counter(spec: str = "auto") -> TokenCounter:
+    """A function counting the tokens of a text with the tokenizer named by `spec` (loaded once per spec)."""
+    kind, _, name = spec.partition(":")
+    if kind == "estimate":
+        return estimate_tokens
+    if kind == "tiktoken":
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ImportError("TRANSCRIPT_TOKENIZER=tiktoken requires tiktoken: pip install tiktoken") from e
+        encoding = tiktoken.get_encoding(name or DEFAULT_TIKTOKEN_ENCODING)
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    if kind == "hf":
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("TRANSCRIPT_TOKENIZER=hf:<name> requires tokenizers: pip install tokenizers") from e
+        tokenizer = Tokenizer.from_pretrained(name)
+        return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+    if kind == "auto":
+        try:
+            return token_counter("tiktoken")
+        except Exception:
+            # Its encoding could not be downloaded (or a bare install lacks it)
+            return estimate_tokens
+    raise ValueError(f"Unknown TRANSCRIPT_TOKENIZER '{spec}'. Expected auto, tiktoken, hf:<name> or estimate")
+
+
+def default_token_counter() -> TokenCounter:
+    """The TRANSCRIPT_TOKENIZER counter; loading it may download an encoding, so not at import."""
+    return token_counter(os.environ.get("TRANSCRIPT_TOKENIZER", "auto"))
+
+
+# ============================================================
+# PACKING
+# ============================================================
+
+@dataclass
+class _Candidate:
+    suspect_id: str
+    number: int  # 1-based position in the suspect's log
+    value: float
+    tokens: int
+    text: str
+
+
+@dataclass
+class PackedTranscript:
+    """The transcript section of the judge's prompt; shown of total exchanges made it in."""
+    text: str
+    tokens: int
+    shown: int
+    total: int
+
+
+def _candidate(board: EvidenceBoard, suspect_id: str, number: int, question: str, answer: str,
+               seen: Set[str], count_tokens: TokenCounter) -> Optional[_Candidate]:
+    """An exchange cut down to its telling sentences the suspect has not said before (None if nothing is left)."""
+    sentences = [sentence.strip() for sentence in split_sentences(answer)]
+    new = [sentence for sentence in sentences if sentence.lower() not in seen]
+    seen.update(sentence.lower() for sentence in new)
+    values = [board.evidence_value(suspect_id, sentence) for sentence in new]
+    kept = [sentence for sentence, value in zip(new, values) if value] or new[:1]
+    if not kept:
+        return None
+    trimmed = " [...]" if len(kept) < len(sentences) else ""
+    text = f"Q{number}: {question}\nA{number}: {' '.join(kept)}{trimmed}"
+    # +1 for the line break joining it to the rest of the transcript
+    return _Candidate(suspect_id, number, sum(values), count_tokens(text) + 1, text)
+
+
+def _omitted_note(count: int) -> str:
+    return f"({count} more exchanges omitted)"
+
+
+def pack_transcript(conversation_logs: Dict[str, List[Tuple[str, str]]], names: Dict[str, str],
+                    board: EvidenceBoard, budget: int = JUDGE_TRANSCRIPT_TOKENS,
+                    count_tokens: Optional[TokenCounter] = None) -> PackedTranscript:
+    """
+    The most telling exchanges of the logs that fit in `budget` tokens, grouped
+    by suspect in the order they were asked. `board` must have ingested the logs;
+    tokens are counted with `count_tokens` (default_token_counter() if None).
+    """
+    count_tokens = count_tokens or default_token_counter()
+    headers = {
+        sid: f"\n--- Interrogation of {names[sid]} ({len(log)} exchanges) ---"
+        for sid, log in conversation_logs.items() if log
+    }
+    total = sum(len(log) for log in conversation_logs.values())
+    if not headers:
+        return PackedTranscript("No interrogations conducted.", 0, 0, 0)
+
+    by_suspect: Dict[str, List[_Candidate]] = {}
+    for sid, log in conversation_logs.items():
+        if log:
+            seen: Set[str] = set()
+            candidates = (_candidate(board, sid, n, q, a, seen, count_tokens) for n, (q, a) in enumerate(log, 1))
+            by_suspect[sid] = [c for c in candidates if c is not None]
+    # Headers and "omitted" notes are always shown, so they come off the budget first
+    note_tokens = count_tokens(_omitted_note(total))
+    remaining = budget - sum(count_tokens(header) + note_tokens + 2 for header in headers.values())
+
+    # Every suspect's best exchange first, then the rest by evidence per token
+    firsts = [max(cands, key=lambda c: (c.value, c.number)) for cands in by_suspect.values() if cands]
+    rest = sorted(
+        (c for cands in by_suspect.values() for c in cands if c not in firsts),
+        key=lambda c: (c.value / max(1, c.tokens), c.value, c.number),
+        reverse=True,
+    )
+    chosen: List[_Candidate] = []
+    for candidate in firsts + rest:
+        if candidate.tokens <= remaining:
+            chosen.append(candidate)
+            remaining -= candidate.tokens
+
+    lines = []
+    for sid, header in headers.items():
+        picked = sorted((c for c in chosen if c.suspect_id == sid), key=lambda c: c.number)
+        lines.append(header)
+        lines.extend(c.text for c in picked)
+        if len(picked) < len(conversation_logs[sid]):
+            lines.append(_omitted_note(len(conversation_logs[sid]) - len(picked)))
+    text = "\n".join(lines)
+    return PackedTranscript(text, count_tokens(text), len(chosen), total)